@@ -0,0 +1,83 @@
+"""
+Mede tempo e pico de memória (RSS) do diff entre duas execuções grandes.
+
+Gera duas saídas csv sintéticas da aba 'VPC Network' (por padrão 1 milhão de
+linhas cada, com --changed/--added/--removed linhas diferentes) e roda o
+scan_core.diff sobre elas num subprocesso, para medir só o pico do diff.
+
+Uso (a partir de python/scan-account):
+    python benchmarks/bench_diff.py --rows 1000000 --workdir /tmp/bench_diff
+"""
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_records import REGIONS, RESOURCE_TYPES, peak_rss_mb  # noqa: E402
+from scan_core.diff import CHANGES_LAYOUT, diff_reports  # noqa: E402
+from scan_core.reports import REPORTS  # noqa: E402
+from scan_core.sinks import open_sink  # noqa: E402
+
+COLUMNS = REPORTS['ips'].sheets['VPC Network']
+
+
+def network_row(i, details='primary network interface'):
+    subnet = i // 50
+    vpc = subnet // 6
+    values = {'Region': REGIONS[vpc % len(REGIONS)], 'VPC ID': f"vpc-{vpc:017x}", 'VPC Name': f"vpc-app-{vpc}",
+              'Subnet ID': f"subnet-{subnet:017x}", 'Subnet Name': f"app-{vpc}-private-{subnet % 6}",
+              'Resource Type': RESOURCE_TYPES[i % len(RESOURCE_TYPES)], 'Resource ID': f"eni-{i:017x}",
+              'Private IP': f"10.{vpc % 256}.{(i // 256) % 256}.{i % 256}", 'Public IP': '-', 'Details': details}
+    return [values[c] for c in COLUMNS]
+
+
+def write_run(path, rows, changed=0, added=0, removed=0):
+    """Execução 'nova' = a antiga sem as `removed` primeiras, com `changed` alteradas e `added` no fim."""
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, 'VPC_Network.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(removed, rows + added):
+            writer.writerow(network_row(i, 'changed' if removed <= i < removed + changed else
+                                        'primary network interface'))
+
+
+def run_child(old, new, output):
+    base = peak_rss_mb()
+    start = time.perf_counter()
+    with open_sink('csv', output, CHANGES_LAYOUT) as sink:
+        summary = diff_reports(old, new, sink)
+    print(json.dumps({'seconds': round(time.perf_counter() - start, 2), 'summary': summary,
+                      'peak_rss_mb': round(peak_rss_mb(), 1), 'diff_rss_mb': round(peak_rss_mb() - base, 1)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--changed', type=int, default=1000)
+    parser.add_argument('--added', type=int, default=1000)
+    parser.add_argument('--removed', type=int, default=1000)
+    parser.add_argument('--workdir', default='bench_diff')
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return run_child(*args.child)
+
+    old, new = os.path.join(args.workdir, 'old'), os.path.join(args.workdir, 'new')
+    write_run(old, args.rows)
+    write_run(new, args.rows, args.changed, args.added, args.removed)
+    out = subprocess.run([sys.executable, __file__, '--child', old, new, os.path.join(args.workdir, 'changes')],
+                         check=True, capture_output=True, text=True).stdout
+    result = json.loads(out)
+    result['rows'] = args.rows
+    result['rows_per_second'] = round(2 * args.rows / result['seconds']) if result['seconds'] else None
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
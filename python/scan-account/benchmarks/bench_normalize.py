@@ -0,0 +1,101 @@
+"""
+Mede o pós-processamento das ENIs: laço por ENI vs normalização vetorizada (pandas).
+
+Gera uma região sintética (por padrão 100k ENIs, com IPs secundários e públicos,
+InterfaceType/RequesterId variados) e monta as abas 'VPC Hierarchy' e
+'VPC Network' pelos dois caminhos de scan_core.reports.vpc_hierarchy_rows,
+conferindo que as linhas saem iguais.
+
+Uso (a partir de python/scan-account):
+    python benchmarks/bench_normalize.py --enis 100000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scan_core import normalize  # noqa: E402
+from scan_core.reports import REPORTS, vpc_hierarchy_rows  # noqa: E402
+
+# (Description, InterfaceType, RequesterId) das ENIs sintéticas
+KINDS = [
+    ('Primary network interface', 'interface', None),
+    ('ELB app/web/50dc6c495c0c9188', 'interface', 'amazon-elb'),
+    ('ELB net/api/8f1f2d2c4a7e2b11', 'network_load_balancer', 'amazon-elb'),
+    ('RDSNetworkInterface', 'interface', 'amazon-rds'),
+    ('Interface for NAT Gateway nat-0a1b2c3d4e5f60718', 'nat_gateway', None),
+    ('AWS Lambda VPC ENI-orders-3f9e', 'lambda', None),
+    ('VPC Endpoint Interface vpce-0a1b2c3d4e5f60718', 'vpc_endpoint', None),
+    ('EFS mount target for fs-0a1b2c3d (fsmt-0a1b2c3d)', 'efs', None),
+]
+
+
+class SyntheticDataset(dict):
+    region = 'us-east-1'
+
+
+def synthetic_dataset(count, subnets_per_vpc=6, enis_per_subnet=50):
+    """Resposta bruta de uma região: ENIs espalhadas por subnets/VPCs, mais uma VPC e uma subnet vazias."""
+    subnet_count = count // enis_per_subnet + 1
+    vpc_count = subnet_count // subnets_per_vpc + 1
+    vpcs = [{'VpcId': f"vpc-{v:017x}", 'Tags': [{'Key': 'Name', 'Value': f"vpc-app-{v}"}]}
+            for v in range(vpc_count + 1)]
+    subnets = [{'SubnetId': f"subnet-{s:017x}", 'VpcId': f"vpc-{s // subnets_per_vpc:017x}",
+                'Tags': [{'Key': 'Name', 'Value': f"app-private-{s}"}]} for s in range(subnet_count + 1)]
+    enis = []
+    for i in range(count):
+        description, interface_type, requester = KINDS[i % len(KINDS)]
+        eni = {'NetworkInterfaceId': f"eni-{i:017x}", 'SubnetId': f"subnet-{i // enis_per_subnet:017x}",
+               'Description': description, 'InterfaceType': interface_type,
+               'PrivateIpAddresses': [{'PrivateIpAddress': f"10.{(i // 65536) % 256}.{(i // 256) % 256}.{i % 256}",
+                                       'Primary': True}]}
+        if requester:
+            eni['RequesterId'] = requester
+        if i % len(KINDS) == 0:
+            eni['Attachment'] = {'InstanceId': f"i-{i:017x}"}
+        if i % 11 == 0:
+            eni['PrivateIpAddresses'][0]['Association'] = {'PublicIp': f"54.{(i // 256) % 256}.{i % 256}.1"}
+        if i % 13 == 0:
+            eni['PrivateIpAddresses'].append({'PrivateIpAddress': f"10.255.{(i // 256) % 256}.{i % 256}"})
+        enis.append(eni)
+    return SyntheticDataset({'ec2.vpcs': vpcs, 'ec2.subnets': subnets, 'ec2.network_interfaces': enis})
+
+
+def measure(dataset, with_ips, columns, vectorized):
+    """(segundos, valores das linhas) de um caminho, incluindo a leitura das linhas como fazem os sinks."""
+    normalize.VECTORIZE_MIN_ENIS = 0 if vectorized else float('inf')
+    start = time.perf_counter()
+    rows = vpc_hierarchy_rows(dataset, with_ips)
+    iter_values = getattr(rows, 'iter_values', None)
+    values = list(iter_values(columns) if iter_values else ([row.get(c) for c in columns] for row in rows))
+    return time.perf_counter() - start, values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--enis', type=int, default=100000)
+    args = parser.parse_args()
+
+    import pandas  # noqa: F401  (a importação do pandas fica fora da medida)
+
+    dataset = synthetic_dataset(args.enis)
+    results = {'enis': args.enis}
+    for report, sheet, with_ips in (('inventory', 'VPC Hierarchy', False), ('ips', 'VPC Network', True)):
+        columns = REPORTS[report].sheets[sheet]
+        loop_seconds, loop_rows = measure(dataset, with_ips, columns, vectorized=False)
+        frame_seconds, frame_rows = measure(dataset, with_ips, columns, vectorized=True)
+        results[sheet] = {
+            'rows': len(frame_rows),
+            'loop_seconds': round(loop_seconds, 3),
+            'vectorized_seconds': round(frame_seconds, 3),
+            'speedup': round(loop_seconds / frame_seconds, 1) if frame_seconds else None,
+            'same_rows': loop_rows == frame_rows,
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
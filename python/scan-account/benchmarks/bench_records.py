@@ -0,0 +1,85 @@
+"""
+Mede o pico de memória (RSS) das linhas de rede em dicts vs registros compactos.
+
+Simula uma conta grande (por padrão 100k ENIs) e monta as linhas da aba
+'VPC Network' nos dois formatos, cada um num subprocesso separado para que o
+pico de RSS de um não contamine o outro.
+
+Uso (a partir de python/scan-account):
+    python benchmarks/bench_records.py --enis 100000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scan_core.records import VpcRow  # noqa: E402
+
+REGIONS = ['us-east-1', 'us-east-2', 'eu-west-1', 'sa-east-1']
+RESOURCE_TYPES = ['EC2 Instance', 'Lambda Interface', 'Load Balancer', 'RDS Database', 'NAT Gateway']
+
+
+def synthetic_enis(count, subnets_per_vpc=6, enis_per_subnet=50):
+    """Gera ENIs sintéticas; o json.loads cria strings novas a cada linha, como a resposta da API."""
+    for i in range(count):
+        subnet = i // enis_per_subnet
+        vpc = subnet // subnets_per_vpc
+        yield json.loads(json.dumps({
+            'region': REGIONS[vpc % len(REGIONS)],
+            'vpc_id': f"vpc-{vpc:017x}",
+            'vpc_name': f"vpc-app-{vpc}",
+            'subnet_id': f"subnet-{subnet:017x}",
+            'subnet_name': f"app-{vpc}-private-{subnet % subnets_per_vpc}",
+            'resource_type': RESOURCE_TYPES[i % len(RESOURCE_TYPES)],
+            'resource_id': f"eni-{i:017x}",
+            'private_ip': f"10.{vpc % 256}.{(i // 256) % 256}.{i % 256}",
+            'public_ip': '-',
+            'details': 'primary network interface',
+        }))
+
+
+def build(mode, count):
+    if mode == 'dict':
+        return [{column: values[attr] for column, attr in VpcRow.COLUMNS.items()}
+                for values in synthetic_enis(count)]
+    return [VpcRow(**values) for values in synthetic_enis(count)]
+
+
+def peak_rss_mb():
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_child(mode, count):
+    base = peak_rss_mb()
+    rows = build(mode, count)
+    print(json.dumps({'mode': mode, 'rows': len(rows), 'peak_rss_mb': round(peak_rss_mb(), 1),
+                      'rows_rss_mb': round(peak_rss_mb() - base, 1)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--enis', type=int, default=100000)
+    parser.add_argument('--child', choices=['dict', 'record'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return run_child(args.child, args.enis)
+
+    results = {}
+    for mode in ('dict', 'record'):
+        out = subprocess.run([sys.executable, __file__, '--child', mode, '--enis', str(args.enis)],
+                             check=True, capture_output=True, text=True).stdout
+        results[mode] = json.loads(out)
+    saved = results['dict']['rows_rss_mb'] - results['record']['rows_rss_mb']
+    ratio = saved / results['dict']['rows_rss_mb'] if results['dict']['rows_rss_mb'] else 0
+    results['reduction_pct'] = round(100 * ratio, 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+"""
+Benchmark offline dos scripts de varredura sobre uma conta sintética (moto).
+
+Monta uma conta falsa com o tamanho pedido (regiões, VPCs, subnets, ENIs,
+instâncias e Lambdas) e roda cada script contra ela, um subprocesso por
+script (o pico de RSS de um não contamina o outro). Para cada execução
+registra em JSON: tempo total, chamadas de API por operação, pico de memória,
+tempo de escrita do relatório e as estatísticas da fábrica de clientes.
+
+Também mede o custo fixo: a partida do CLI (scan.py --help e --dry-run, ao
+lado de um `python -c pass`) e o custo por região vazia (--empty-regions
+regiões sem nenhuma VPC entram na varredura: chamadas, clientes e segundos
+gastos em cada uma).
+
+Com --compare, falha (código 1) se alguma execução fizer mais chamadas de API
+(no total ou por região vazia) ou usar mais memória que o resultado anterior
+(além da tolerância).
+
+Uso (a partir de python/scan-account; requer `pip install moto`):
+    python benchmarks/bench_scan.py --regions 2 --vpcs 3 --enis 200 --output bench.json
+    python benchmarks/bench_scan.py --regions 2 --vpcs 3 --enis 200 --compare bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from collections import Counter
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SCRIPTS = ['Infraestructure_scan_aws_account.py', 'aws_architec_audit.py', 'aws_architec_audit_v2.py']
+REGIONS = ['us-east-1', 'us-east-2', 'us-west-2', 'eu-west-1', 'eu-central-1', 'sa-east-1',
+           'ap-southeast-1', 'ap-northeast-1']
+MEMORY_TOLERANCE = 0.10
+STARTUP_RUNS = 3
+
+
+def peak_rss_mb():
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def empty_region(ec2):
+    """Remove a VPC default (e suas subnets/IGWs) que o moto cria em toda região."""
+    for vpc in ec2.describe_vpcs()['Vpcs']:
+        vpc_filter = [{'Name': 'vpc-id', 'Values': [vpc['VpcId']]}]
+        for subnet in ec2.describe_subnets(Filters=vpc_filter)['Subnets']:
+            ec2.delete_subnet(SubnetId=subnet['SubnetId'])
+        igws = ec2.describe_internet_gateways(Filters=[{'Name': 'attachment.vpc-id', 'Values': [vpc['VpcId']]}])
+        for igw in igws['InternetGateways']:
+            ec2.detach_internet_gateway(InternetGatewayId=igw['InternetGatewayId'], VpcId=vpc['VpcId'])
+            ec2.delete_internet_gateway(InternetGatewayId=igw['InternetGatewayId'])
+        ec2.delete_vpc(VpcId=vpc['VpcId'])
+
+
+def build_account(sizes):
+    """Cria a conta sintética no moto (já dentro de mock_aws). Contagens por região."""
+    import boto3
+    iam = boto3.client('iam', region_name='us-east-1')
+    role = iam.create_role(RoleName='bench-lambda', AssumeRolePolicyDocument='{}')['Role']['Arn']
+    boto3.client('s3', region_name='us-east-1').create_bucket(Bucket='bench-bucket')
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as z:
+        z.writestr('handler.py', 'def handler(event, context): pass')
+    code = buf.getvalue()
+
+    for region in empty_regions(sizes):
+        empty_region(boto3.client('ec2', region_name=region))
+
+    for region in REGIONS[:sizes['regions']]:
+        ec2 = boto3.client('ec2', region_name=region)
+        subnets = []
+        for v in range(sizes['vpcs']):
+            vpc_id = ec2.create_vpc(CidrBlock=f"10.{v}.0.0/16")['Vpc']['VpcId']
+            ec2.create_tags(Resources=[vpc_id], Tags=[{'Key': 'Name', 'Value': f"bench-{v}"}])
+            for s in range(sizes['subnets']):
+                subnet = ec2.create_subnet(VpcId=vpc_id, CidrBlock=f"10.{v}.{s}.0/24")['Subnet']['SubnetId']
+                subnets.append(subnet)
+        if not subnets:
+            continue
+        # ENIs, instâncias e Lambdas distribuídas entre as subnets da região
+        for i in range(sizes['enis']):
+            ec2.create_network_interface(SubnetId=subnets[i % len(subnets)], Description=f"bench eni {i}")
+        for i in range(sizes['instances']):
+            ec2.run_instances(ImageId='ami-12c6146b', MinCount=1, MaxCount=1, InstanceType='t3.micro',
+                              SubnetId=subnets[i % len(subnets)])
+        aws_lambda = boto3.client('lambda', region_name=region)
+        for i in range(sizes['lambdas']):
+            aws_lambda.create_function(FunctionName=f"bench-{i}", Runtime='python3.11', Role=role,
+                                       Handler='handler.handler', Code={'ZipFile': code},
+                                       VpcConfig={'SubnetIds': [subnets[i % len(subnets)]], 'SecurityGroupIds': []})
+
+
+def empty_regions(sizes):
+    return REGIONS[sizes['regions']:sizes['regions'] + sizes['empty_regions']]
+
+
+def measure_startup():
+    """Melhor de STARTUP_RUNS execuções (s) da partida do CLI, sem nenhuma chamada à AWS."""
+    commands = {
+        'python_seconds': [sys.executable, '-c', 'pass'],
+        'help_seconds': [sys.executable, 'scan.py', '--help'],
+        'dry_run_seconds': [sys.executable, 'scan.py', 'all', '--dry-run'],
+    }
+    startup = {}
+    for key, cmd in commands.items():
+        times = []
+        for _ in range(STARTUP_RUNS):
+            start = time.perf_counter()
+            subprocess.run(cmd, check=True, capture_output=True, cwd=ROOT)
+            times.append(time.perf_counter() - start)
+        startup[key] = round(min(times), 3)
+    return startup
+
+
+def run_child(script, sizes, workers):
+    """Executa um script contra a conta sintética e imprime o resultado (JSON) na última linha."""
+    from moto import mock_aws
+
+    from scan_core import runner
+    from scan_core.session import get_factory
+
+    sinks = []
+
+    def open_sink(*args):
+        sink = runner_open_sink(*args)
+        sinks.append(sink)
+        return sink
+
+    runner_open_sink = runner.open_sink
+    with mock_aws():
+        build_account(sizes)
+        base_rss = peak_rss_mb()
+        empty = empty_regions(sizes)
+        regions = REGIONS[:sizes['regions']] + empty
+        out_dir = tempfile.mkdtemp(prefix='bench_scan_')
+        argv = [script, '--no-cache', '--workers', str(workers), '--output', os.path.join(out_dir, 'report.xlsx')]
+        log = io.StringIO()
+        # O moto responde a todas as regiões da AWS; a conta sintética só usa as primeiras N
+        with mock.patch.object(runner, 'get_active_regions', lambda dataset: regions), \
+                mock.patch.object(runner, 'open_sink', open_sink), \
+                mock.patch.object(sys, 'argv', argv), contextlib.redirect_stdout(log):
+            start = time.perf_counter()
+            runpy.run_path(os.path.join(ROOT, script), run_name='__main__')
+            wall = time.perf_counter() - start
+
+    scheduler = get_factory().scheduler
+    per_operation = Counter()
+    for (service, _, op), n in scheduler.calls.items():
+        per_operation[f"{service}.{op}"] += n
+    # Custo médio de uma região sem VPC (idealmente só a sonda e os serviços fora de VPC)
+    n_empty = max(1, len(empty))
+    empty_calls = sum(n for (_, region, _), n in scheduler.calls.items() if region in empty)
+    empty_clients = sum(1 for (_, region) in get_factory()._clients if region in empty)
+    empty_seconds = sum(s.seconds for (_, region, _), s in get_factory().metrics.operations.items() if region in empty)
+    print(json.dumps({
+        'script': script,
+        'wall_seconds': round(wall, 3),
+        'write_seconds': round(sum(s.write_seconds for s in sinks), 3),
+        'rows_written': sum(sum(s.rows_written.values()) for s in sinks),
+        'api_calls_total': sum(scheduler.calls.values()),
+        'api_calls': dict(sorted(per_operation.items())),
+        'retries': sum(scheduler.retries.values()),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'scan_rss_mb': round(peak_rss_mb() - base_rss, 1),
+        'clients': {k: round(v, 3) for k, v in get_factory().stats.items()},
+        'empty_region': {'regions': len(empty), 'api_calls': round(empty_calls / n_empty, 1),
+                         'clients': round(empty_clients / n_empty, 1),
+                         'api_seconds': round(empty_seconds / n_empty, 3)},
+    }))
+
+
+def compare(results, baseline_path):
+    """Lista as regressões de chamadas de API e memória em relação a um resultado anterior."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {r['script']: r for r in json.load(f)['runs']}
+    problems = []
+    for run in results['runs']:
+        old = baseline.get(run['script'])
+        if old is None:
+            continue
+        if run['api_calls_total'] > old['api_calls_total']:
+            ops = [op for op, n in run['api_calls'].items() if n > old['api_calls'].get(op, 0)]
+            problems.append(f"{run['script']}: {old['api_calls_total']} -> {run['api_calls_total']} "
+                            f"chamadas de API ({', '.join(ops)})")
+        old_empty = old.get('empty_region', {}).get('api_calls')
+        if old_empty is not None and run['empty_region']['api_calls'] > old_empty:
+            problems.append(f"{run['script']}: {old_empty} -> {run['empty_region']['api_calls']} "
+                            f"chamadas por região vazia")
+        if run['scan_rss_mb'] > old['scan_rss_mb'] * (1 + MEMORY_TOLERANCE) + 1:
+            problems.append(f"{run['script']}: memória {old['scan_rss_mb']} -> {run['scan_rss_mb']} MB")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--regions', type=int, default=2, help=f"regiões com recursos (máx. {len(REGIONS)})")
+    parser.add_argument('--vpcs', type=int, default=2, help="VPCs por região")
+    parser.add_argument('--subnets', type=int, default=3, help="subnets por VPC")
+    parser.add_argument('--enis', type=int, default=50, help="ENIs avulsas por região")
+    parser.add_argument('--instances', type=int, default=10, help="instâncias EC2 por região")
+    parser.add_argument('--lambdas', type=int, default=5, help="Lambdas em VPC por região")
+    parser.add_argument('--empty-regions', type=int, default=1, help="regiões extras sem nenhuma VPC")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--scripts', default=','.join(SCRIPTS), help="scripts a medir, separados por vírgula")
+    parser.add_argument('--output', help="grava o resultado em JSON neste arquivo")
+    parser.add_argument('--compare', help="JSON de uma execução anterior; sai com código 1 se houver regressão")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    sizes = {k: getattr(args, k) for k in ('regions', 'vpcs', 'subnets', 'enis', 'instances', 'lambdas',
+                                           'empty_regions')}
+    sizes['regions'] = min(sizes['regions'], len(REGIONS))
+    sizes['empty_regions'] = min(sizes['empty_regions'], len(REGIONS) - sizes['regions'])
+    if args.child:
+        return run_child(args.child, sizes, args.workers)
+
+    results = {'sizes': sizes, 'workers': args.workers, 'startup': measure_startup(), 'runs': []}
+    print(f"partida: --help {results['startup']['help_seconds']}s, --dry-run {results['startup']['dry_run_seconds']}s "
+          f"(python puro {results['startup']['python_seconds']}s)", file=sys.stderr)
+    for script in [s.strip() for s in args.scripts.split(',') if s.strip()]:
+        cmd = [sys.executable, __file__, '--child', script, '--workers', str(args.workers)]
+        for key, value in sizes.items():
+            cmd += [f"--{key.replace('_', '-')}", str(value)]
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True, cwd=ROOT).stdout
+        run = json.loads(out.strip().splitlines()[-1])
+        results['runs'].append(run)
+        print(f"{script}: {run['wall_seconds']}s, {run['api_calls_total']} chamadas, "
+              f"{run['scan_rss_mb']} MB, escrita {run['write_seconds']}s, "
+              f"região vazia {run['empty_region']['api_calls']} chamadas", file=sys.stderr)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.compare:
+        problems = compare(results, args.compare)
+        for problem in problems:
+            print(f"[REGRESSÃO] {problem}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
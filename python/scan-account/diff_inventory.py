@@ -0,0 +1,35 @@
+import argparse
+import sys
+import time
+
+from scan_core.diff import CHANGES_LAYOUT, DEFAULT_CHANGES_FILE, diff_reports
+from scan_core.sinks import FORMATS, open_sink, output_path
+
+# O que mudou entre duas execuções do mesmo relatório (aba 'Changes'):
+#   python diff_inventory.py Relatorio_AWS_MultiRegion_jan.xlsx Relatorio_AWS_MultiRegion.xlsx
+#   python diff_inventory.py antigo/ novo/ --format csv      -> diretórios csv/jsonl/parquet
+#   python diff_inventory.py Inventario_jan.db Inventario_AWS.db
+
+
+# --- EXECUÇÃO ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Diferenças (adicionados/removidos/alterados) entre duas execuções.")
+    parser.add_argument('old', help="execução anterior (.xlsx, .db ou diretório csv/jsonl/parquet)")
+    parser.add_argument('new', help="execução atual (mesmos formatos)")
+    parser.add_argument('--format', choices=FORMATS, default='xlsx', help="formato da saída (padrão: xlsx)")
+    parser.add_argument('--output', help=f"arquivo/diretório de saída (padrão: {DEFAULT_CHANGES_FILE})")
+    args = parser.parse_args()
+
+    path = output_path(DEFAULT_CHANGES_FILE, args.format, args.output)
+    start = time.perf_counter()
+    try:
+        with open_sink(args.format, path, CHANGES_LAYOUT) as sink:
+            summary = diff_reports(args.old, args.new, sink)
+    except Exception as e:
+        sys.exit(f"[ERRO] Não foi possível comparar {args.old} e {args.new}: {e}")
+    elapsed = time.perf_counter() - start
+
+    for sheet, counts in summary.items():
+        print(f"   {sheet}: +{counts['added']} -{counts['removed']} ~{counts['changed']} "
+              f"(={counts['unchanged']})")
+    print(f"\n[OK] {path} ({sink.rows_written.get('Changes', 0)} mudança(s), {elapsed:.1f}s)")
@@ -0,0 +1,57 @@
+import argparse
+import sys
+import time
+
+from scan_core.inventory_db import (DEFAULT_DB_FILE, connect, find_ip, find_ips_in_cidr, find_resource,
+                                    find_subnets_containing, find_tag)
+
+# Consultas no banco gerado com --db (ex.: python aws_architec_audit.py --db):
+#   python query_inventory.py ip 10.4.7.12         -> ENI/recurso dono do IP e subnets que o contêm
+#   python query_inventory.py cidr 10.4.0.0/16     -> IPs em uso na faixa
+#   python query_inventory.py resource i-0abc...   -> ENIs, IPs e tags de um recurso
+#   python query_inventory.py tag Environment=prod -> recursos com a tag
+
+
+def print_rows(title, rows):
+    print(f"\n--- {title} ({len(rows)}) ---")
+    if not rows:
+        return
+    columns = list(rows[0])
+    widths = [max(len(c), *(len(str(r[c])) for r in rows)) for c in columns]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(w) for c, w in zip(columns, widths)))
+
+
+# --- EXECUÇÃO ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consultas no banco SQLite do inventário de rede.")
+    parser.add_argument('--db', default=DEFAULT_DB_FILE, help=f"arquivo do banco (padrão: {DEFAULT_DB_FILE})")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('ip', help="quem usa o IP e quais subnets o contêm").add_argument('ip')
+    sub.add_parser('cidr', help="IPs em uso dentro de uma faixa CIDR").add_argument('cidr')
+    sub.add_parser('resource', help="ENIs, IPs e tags de um recurso").add_argument('resource_id')
+    sub.add_parser('tag', help="recursos com a tag CHAVE ou CHAVE=VALOR").add_argument('tag')
+    args = parser.parse_args()
+
+    try:
+        db = connect(args.db)
+        start = time.perf_counter()
+        if args.command == 'ip':
+            results = {'IP': find_ip(db, args.ip), 'Subnets que contêm o IP': find_subnets_containing(db, args.ip)}
+        elif args.command == 'cidr':
+            results = {f'IPs em {args.cidr}': find_ips_in_cidr(db, args.cidr)}
+        elif args.command == 'resource':
+            results = find_resource(db, args.resource_id)
+        else:
+            key, _, value = args.tag.partition('=')
+            results = {'Tags': find_tag(db, key, value if '=' in args.tag else None)}
+        elapsed = time.perf_counter() - start
+    except ValueError as e:
+        sys.exit(f"[ERRO] Endereço/faixa inválida: {e}")
+    except Exception as e:
+        sys.exit(f"[ERRO] Não foi possível consultar {args.db}: {e}")
+
+    for title, rows in results.items():
+        print_rows(title, rows)
+    print(f"\n({elapsed * 1000:.1f} ms)")
@@ -0,0 +1,14 @@
+from scan_core.runner import run_cli
+
+# Ponto de entrada único dos modos de varredura (os scripts antigos continuam valendo):
+#   python scan.py inventory      -> Relatorio_AWS_MultiRegion.xlsx (= Infraestructure_scan_aws_account.py)
+#   python scan.py ips            -> Relatorio_AWS_IPs_Detalhados.xlsx (= aws_architec_audit.py)
+#   python scan.py architecture   -> Relatorio_AWS_Arquitetura_v2.xlsx (= aws_architec_audit_v2.py)
+#   python scan.py s3             -> Relatorio_AWS_S3.xlsx (detalhes e exposição pública dos buckets)
+#   python scan.py iam            -> Relatorio_AWS_IAM.xlsx (usuários, roles, grupos e policies em lote)
+#   python scan.py all            -> os três primeiros numa única passada (= scan_all_reports.py)
+# --list-regions e --dry-run respondem na hora, sem varrer a conta.
+
+# --- EXECUÇÃO ---
+if __name__ == "__main__":
+    run_cli("Varredura da conta AWS: inventário, IPs detalhados, arquitetura, buckets S3 e/ou IAM.")
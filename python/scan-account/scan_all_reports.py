@@ -0,0 +1,11 @@
+from scan_core.runner import run_reports
+
+# Gera os três relatórios (inventário, IPs detalhados e arquitetura) numa única
+# passada pela conta: cada API é chamada uma vez e os três arquivos são
+# projeções sobre os mesmos dados. Use --reports para escolher um subconjunto.
+
+# --- EXECUÇÃO ---
+if __name__ == "__main__":
+    run_reports(['inventory', 'ips', 'architecture'],
+                "Gera os relatórios de inventário, IPs e arquitetura numa única varredura.",
+                banner="Iniciando Scan completo (todos os relatórios)...")
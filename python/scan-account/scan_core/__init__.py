@@ -0,0 +1 @@
+"""Núcleo compartilhado dos scripts de varredura de conta AWS (scan-account)."""
@@ -0,0 +1,240 @@
+"""
+Cache local (em disco) dos resultados brutos dos coletores.
+
+Cada coletor grava os itens da API em
+`<cache_dir>/<conta>[/<escopo>]/<região>/<serviço>.<nome>.v<N>.json` (uma lista
+JSON, gravada página a página enquanto o coletor pagina; N muda quando o
+formato dos dados de algum coletor muda). Numa nova execução, se o arquivo
+ainda estiver dentro do TTL do serviço, os dados são lidos do disco e nenhuma
+chamada é feita. `--refresh` ignora o cache (mas regrava os arquivos com os
+dados novos).
+
+Checkpoint: cada unidade (região/coletor) concluída é anotada em
+`<cache_dir>/<conta>[/<escopo>]/checkpoint.log` logo depois de gravada. Com
+`--resume`, as unidades anotadas na última varredura são reaproveitadas mesmo
+fora do TTL e só as que faltam (ou falharam) são buscadas de novo; o relatório
+é então reemitido a partir do disco.
+
+Os arquivos do cache são também o snapshot do inventário que a atualização
+incremental (--events, scan_core.incremental) corrige a partir dos eventos
+do CloudTrail.
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_CACHE_DIR = '.scan_cache'
+DEFAULT_TTL = 60 * 60
+CACHE_FORMAT = 3
+CHECKPOINT_FILE = 'checkpoint.log'
+# Datas da API gravadas como {'$datetime': ISO 8601}: voltam como datetime na leitura
+DATETIME_KEY = '$datetime'
+
+# TTL (segundos) por serviço: dados que quase nunca mudam ficam mais tempo.
+SERVICE_TTLS = {
+    'route53': 24 * 60 * 60,
+    'cloudfront': 24 * 60 * 60,
+    'iam': 6 * 60 * 60,
+    's3': 6 * 60 * 60,
+    'ec2': 30 * 60,
+    'lambda': 60 * 60,
+}
+
+
+def _encode(value):
+    """Tipos que o JSON não tem: datetime vira {'$datetime': ISO}; o resto, texto."""
+    if isinstance(value, datetime):
+        return {DATETIME_KEY: value.isoformat()}
+    return str(value)
+
+
+def _decode(obj):
+    """Mesmo tipo de uma busca na API: o relatório não muda conforme o estado do cache."""
+    if len(obj) == 1 and DATETIME_KEY in obj:
+        return datetime.fromisoformat(obj[DATETIME_KEY])
+    return obj
+
+
+class Checkpoint:
+    """
+    Log append-only das unidades concluídas de uma varredura (uma por linha).
+    Uma linha cortada por uma queda do processo é simplesmente ignorada.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.done = set()       # unidades anotadas (desta varredura ou da retomada)
+        self.resumable = set()  # unidades da varredura anterior, lidas com --resume
+        self.finished = False
+        self._lock = threading.Lock()
+        if resume:
+            self._load()
+            self.resumable = set(self.done)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not resume or not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'started': time.time()}) + '\n')
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                text = f.read()
+        except OSError:
+            return
+        for line in text.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if 'unit' in entry:
+                self.done.add(entry['unit'])
+            self.finished = entry.get('finished', self.finished)
+        if text and not text.endswith('\n'):
+            # Fecha a linha cortada para não colar nela a próxima anotação
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n')
+
+    def _append(self, entry):
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+
+    def mark(self, unit):
+        if unit not in self.done:
+            self.done.add(unit)
+            self._append({'unit': unit})
+
+    def finish(self):
+        self.finished = True
+        self._append({'finished': True})
+
+
+class InventoryCache:
+    def __init__(self, root=DEFAULT_CACHE_DIR, account='default', refresh=False, ttls=None, enabled=True,
+                 resume=False, scope=None):
+        self.root = root
+        self.account = account
+        # Varreduras com escopo (scan_core.scope) têm um subdiretório próprio
+        self.base = os.path.join(root, account, scope) if scope else os.path.join(root, account)
+        self.refresh = refresh
+        self.enabled = enabled
+        self.ttls = dict(SERVICE_TTLS, **(ttls or {}))
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'resumed': 0}
+        self.checkpoint = None
+        if enabled:
+            self.checkpoint = Checkpoint(os.path.join(self.base, CHECKPOINT_FILE), resume=resume)
+            if resume:
+                state = "concluída" if self.checkpoint.finished else "interrompida"
+                print(f"    -> Retomando a última varredura ({state}): "
+                      f"{len(self.checkpoint.resumable)} unidade(s) já coletada(s)")
+
+    def path(self, region, service, name):
+        return os.path.join(self.base, region, f"{service}.{name}.v{CACHE_FORMAT}.json")
+
+    def fetch(self, region, service, name, loader):
+        """Retorna a lista do cache se ainda válida; senão consome loader() (iterável) e grava."""
+        if not self.enabled:
+            return list(loader())
+        path = self.path(region, service, name)
+        unit = f"{region}/{service}.{name}"
+        if unit in self.checkpoint.resumable:
+            # Unidade da varredura sendo retomada: vale mesmo fora do TTL
+            data = self._load(path)
+            if data is not None:
+                self._count('resumed')
+                return data
+        ttl = self.ttls.get(service, DEFAULT_TTL)
+        data = None
+        try:
+            if not self.refresh and time.time() - os.path.getmtime(path) < ttl:
+                data = self._load(path)
+        except OSError:
+            pass  # Sem cache: busca na API
+        if data is not None:
+            self._count('hits')
+        else:
+            self._count('misses')
+            data = self._store(path, loader())
+        self.checkpoint.mark(unit)
+        return data
+
+    def snapshot(self, region, service, name):
+        """(itens, mtime) do último snapshot gravado da unidade, ou (None, None)."""
+        path = self.path(region, service, name)
+        data = self._load(path) if self.enabled else None
+        return (data, os.path.getmtime(path)) if data is not None else (None, None)
+
+    def replace(self, region, service, name, items):
+        """Regrava a unidade com os itens já atualizados (atualização incremental)."""
+        data = self._store(self.path(region, service, name), items)
+        self.checkpoint.mark(f"{region}/{service}.{name}")
+        return data
+
+    def _load(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f, object_hook=_decode)
+        except (OSError, ValueError):
+            return None  # Sem arquivo (ou corrompido): busca na API
+
+    def finish(self):
+        """Marca a varredura como concluída (relatórios gravados)."""
+        if self.checkpoint:
+            self.checkpoint.finish()
+
+    def _store(self, path, items):
+        """Grava cada item assim que a página chega (sem serializar a lista inteira de uma vez)."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        data = []
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write('[')
+                for item in items:
+                    if data:
+                        f.write(',\n')
+                    json.dump(item, f, default=_encode)
+                    data.append(item)
+                f.write(']')
+            os.replace(tmp, path)  # Escrita atômica: nunca deixa um JSON pela metade
+        except BaseException:
+            # Falha no meio da paginação: descarta o parcial (o cache antigo, se houver, fica)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return data
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def summary(self):
+        if not self.enabled:
+            return "desativado"
+        hits, misses = self.stats['hits'], self.stats['misses']
+        total = hits + misses
+        rate = (100.0 * hits / total) if total else 0.0
+        resumed = f", {self.stats['resumed']} retomadas do checkpoint" if self.stats['resumed'] else ""
+        return f"{hits} hits, {misses} misses ({rate:.0f}% do cache){resumed} em {self.base}"
+
+
+# Sem configuração explícita o cache fica desligado (comportamento antigo)
+_cache = InventoryCache(enabled=False)
+
+
+def configure(**kwargs):
+    global _cache
+    _cache = InventoryCache(**kwargs)
+    return _cache
+
+
+def get_cache():
+    return _cache
+
+
+def cached(region, service, name, loader):
+    """Atalho: get_cache().fetch(...)."""
+    return _cache.fetch(region, service, name, loader)
@@ -0,0 +1,361 @@
+"""
+Registro de coletores da AWS.
+
+Cada coletor busca UMA API (ex.: 'ec2.network_interfaces') para uma região e
+gera os itens brutos página a página (paginadores do boto3, tamanho de página
+em indexes.PAGE_SIZES): nenhuma listagem fica truncada na primeira página.
+O Dataset de uma região chama cada coletor no máximo uma vez por execução
+(passando pelo cache local), e todos os relatórios são projeções sobre esse
+mesmo Dataset. Gerar os três relatórios juntos custa,
+portanto, uma única passada de API pela conta.
+
+O escopo (scan_core.scope) entra aqui: serviços fora de --services não são
+chamados, e os coletores de rede recebem `Filters` de região/VPC/tag.
+
+Regiões vazias: o DescribeVpcs da região ('ec2.vpcs', que os relatórios usam
+de qualquer forma) serve de sonda. Sem nenhuma VPC, os coletores marcados com
+network=True (tudo que só existe dentro de uma VPC) não são chamados e seus
+clientes nem chegam a ser criados.
+
+Enriquecimento: um coletor com `requires` recebe os itens dos coletores de que
+depende (ex.: 'ec2.volumes' resolve, em lote, os volumes EBS das instâncias já
+listadas pelo 'ec2.instances') em vez de consultar recurso por recurso.
+APIs que só existem por recurso (detalhes de cada bucket S3) rodam num pool
+de threads limitado, com o cliente da região de cada recurso.
+"""
+import csv
+import io
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+from botocore.exceptions import ClientError
+
+from .cache import cached
+from .indexes import PAGE_SIZES, iter_pages, list_instances, list_network_interfaces
+from .scope import chunks, get_scope
+from .session import get_client
+
+GLOBAL = 'global'
+BUCKET_WORKERS = 16  # chamadas de detalhe de buckets S3 em paralelo
+
+# Detalhe do bucket: (campo, operação, extração da resposta)
+BUCKET_CALLS = (
+    ('PublicAccessBlock', 'get_public_access_block', lambda r: r['PublicAccessBlockConfiguration']),
+    ('PolicyIsPublic', 'get_bucket_policy_status', lambda r: r['PolicyStatus']['IsPublic']),
+    ('Encryption', 'get_bucket_encryption', lambda r: ', '.join(
+        rule['ApplyServerSideEncryptionByDefault']['SSEAlgorithm']
+        for rule in r['ServerSideEncryptionConfiguration']['Rules'] if 'ApplyServerSideEncryptionByDefault' in rule)),
+    ('Versioning', 'get_bucket_versioning', lambda r: r.get('Status', 'Disabled')),
+)
+# IAM em lote: o relatório de credenciais é gerado de forma assíncrona
+CREDENTIAL_REPORT_POLLS = 30
+CREDENTIAL_REPORT_WAIT = 2
+# GetAccountAuthorizationDetails: lista da resposta -> tipo do item (policies da AWS ficam de fora)
+AUTHORIZATION_LISTS = (('UserDetailList', 'User'), ('GroupDetailList', 'Group'), ('RoleDetailList', 'Role'),
+                       ('Policies', 'Policy'))
+AUTHORIZATION_FILTER = ['User', 'Group', 'Role', 'LocalManagedPolicy']
+INLINE_POLICY_LISTS = ('UserPolicyList', 'GroupPolicyList', 'RolePolicyList')
+
+# Configuração ausente (não é erro): o campo fica None
+MISSING_CONFIG_CODES = {'NoSuchPublicAccessBlockConfiguration', 'NoSuchBucketPolicy',
+                        'ServerSideEncryptionConfigurationNotFoundError'}
+
+Collector = namedtuple('Collector', ['key', 'service', 'name', 'scope', 'fetch', 'network', 'requires'],
+                       defaults=[()])
+
+COLLECTORS = {}
+
+
+def collector(service, name, scope='regional', network=False, requires=()):
+    """
+    Decorator: registra fetch(region) como o coletor '<service>.<name>'.
+    network=True: recursos que só existem dentro de uma VPC.
+    requires: coletores cujos itens são passados a fetch(region, *itens).
+    """
+    def register(fetch):
+        key = f"{service}.{name}"
+        COLLECTORS[key] = Collector(key, service, name, scope, fetch, network, requires)
+        return fetch
+    return register
+
+
+class Dataset:
+    """
+    Dados brutos de uma região (ou GLOBAL), buscados sob demanda e memorizados.
+    Falhas também são memorizadas: um relatório não repete a chamada que já
+    falhou para outro.
+    """
+
+    def __init__(self, region):
+        self.region = region
+        self._results = {}
+        self._derived = {}
+        self.skipped = []  # Coletores de rede pulados (região sem VPC)
+
+    def get(self, key):
+        if key not in self._results:
+            c = COLLECTORS[key]
+            if key != 'ec2.regions' and not get_scope().allows(c.service):
+                self._results[key] = ([], None)  # Serviço fora do escopo: nenhuma chamada
+            elif c.network and self.without_vpcs():
+                self.skipped.append(key)
+                self._results[key] = ([], None)
+            else:
+                try:
+                    self._results[key] = (cached(self.region, c.service, c.name, lambda: c.fetch(
+                        self.region, *[self.get(k) for k in c.requires])), None)
+                except Exception as e:
+                    self._results[key] = (None, e)
+        data, error = self._results[key]
+        if error is not None:
+            raise error
+        return data
+
+    __getitem__ = get
+
+    def derived(self, name, build):
+        """Estrutura montada sobre os dados brutos (ex.: grafo de roteamento), uma vez por região."""
+        if name not in self._derived:
+            self._derived[name] = build(self)
+        return self._derived[name]
+
+    def without_vpcs(self):
+        """True se a sonda (DescribeVpcs) não achou nenhuma VPC na região."""
+        if self.region == GLOBAL or not get_scope().allows('ec2'):
+            return False
+        try:
+            return not self.get('ec2.vpcs')
+        except Exception:
+            return False  # Sonda falhou: os coletores tentam (e registram o erro) normalmente
+
+    def fetched(self):
+        """Chaves dos coletores já executados (com sucesso ou não)."""
+        return list(self._results)
+
+
+# --- GLOBAIS ---
+@collector('ec2', 'regions', scope=GLOBAL)
+def ec2_regions(region):
+    # Usamos us-east-1 como ponto de entrada padrão para descoberta
+    scope = get_scope()
+    regions = get_client('ec2', 'us-east-1').describe_regions(Filters=scope.region_filters())['Regions']
+    return [r for r in regions if not scope.regions or r['RegionName'] in scope.regions]
+
+
+@collector('iam', 'users', scope=GLOBAL)
+def iam_users(region):
+    return iter_pages(get_client('iam'), 'list_users', 'Users')  # Endpoint global padrão
+
+
+@collector('iam', 'credential_report', scope=GLOBAL)
+def iam_credential_report(region):
+    """
+    Relatório de credenciais da conta (senha, MFA e chaves de todos os usuários num
+    único CSV): gerado se preciso e lido linha a linha.
+    """
+    iam = get_client('iam')
+    for _ in range(CREDENTIAL_REPORT_POLLS):
+        if iam.generate_credential_report()['State'] == 'COMPLETE':
+            break
+        time.sleep(CREDENTIAL_REPORT_WAIT)
+    else:
+        # Sem COMPLETE, o GetCredentialReport só devolveria ReportInProgress/ReportNotPresent
+        raise RuntimeError(f"relatório de credenciais não ficou pronto em "
+                           f"{CREDENTIAL_REPORT_POLLS * CREDENTIAL_REPORT_WAIT}s; rode de novo em instantes")
+    content = iam.get_credential_report()['Content']
+    return csv.DictReader(io.StringIO(content.decode('utf-8')))
+
+
+@collector('iam', 'authorization_details', scope=GLOBAL)
+def iam_authorization_details(region):
+    """
+    Usuários, grupos, roles e policies gerenciadas pelo cliente com associações,
+    numa única listagem paginada (GetAccountAuthorizationDetails). Cada item
+    ganha 'Type'; documentos de policies inline e versões antigas ficam de fora.
+    """
+    page_size = PAGE_SIZES.get('get_account_authorization_details')
+    pages = get_client('iam').get_paginator('get_account_authorization_details').paginate(
+        Filter=AUTHORIZATION_FILTER, PaginationConfig={'PageSize': page_size} if page_size else {})
+    for page in pages:
+        for key, kind in AUTHORIZATION_LISTS:
+            for item in page.get(key, []):
+                item = dict(item, Type=kind)
+                for inline in INLINE_POLICY_LISTS:
+                    if inline in item:
+                        item[inline] = [{'PolicyName': p['PolicyName']} for p in item[inline]]
+                item.pop('PolicyVersionList', None)
+                yield item
+
+
+@collector('s3', 'buckets', scope=GLOBAL)
+def s3_buckets(region):
+    return iter_pages(get_client('s3'), 'list_buckets', 'Buckets')
+
+
+def bucket_region(name):
+    """Região do bucket pelo GetBucketLocation (None = us-east-1, 'EU' = eu-west-1)."""
+    location = get_client('s3').get_bucket_location(Bucket=name).get('LocationConstraint')
+    return {None: 'us-east-1', '': 'us-east-1', 'EU': 'eu-west-1'}.get(location, location)
+
+
+def bucket_detail(bucket):
+    """
+    Detalhes de um bucket no cliente da região dele. Uma chamada negada (ex.:
+    AccessDenied) não derruba as demais: o código vai para 'Errors' e o campo fica de fora.
+    """
+    name = bucket['Name']
+    detail = {'Name': name, 'CreationDate': bucket.get('CreationDate'), 'Errors': {}}
+    try:
+        detail['Region'] = bucket.get('BucketRegion') or bucket_region(name)
+    except ClientError as e:
+        detail['Errors']['Region'] = e.response['Error']['Code']
+        detail['Region'] = None  # Segue pelo endpoint global (o S3 redireciona)
+    s3 = get_client('s3', detail['Region'])
+    for field, operation, extract in BUCKET_CALLS:
+        try:
+            detail[field] = extract(getattr(s3, operation)(Bucket=name))
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code in MISSING_CONFIG_CODES:
+                detail[field] = None
+            else:
+                detail['Errors'][field] = code
+    return detail
+
+
+@collector('s3', 'bucket_details', scope=GLOBAL, requires=('s3.buckets',))
+def s3_bucket_details(region, buckets):
+    """Localização, public access block, policy status, criptografia e versionamento, BUCKET_WORKERS por vez."""
+    if not buckets:
+        return []
+    with ThreadPoolExecutor(max_workers=min(BUCKET_WORKERS, len(buckets)), thread_name_prefix='s3') as pool:
+        return list(pool.map(bucket_detail, buckets))
+
+
+@collector('cloudfront', 'distributions', scope=GLOBAL)
+def cloudfront_distributions(region):
+    return iter_pages(get_client('cloudfront'), 'list_distributions', 'DistributionList.Items')
+
+
+@collector('route53', 'hosted_zones', scope=GLOBAL)
+def route53_hosted_zones(region):
+    return iter_pages(get_client('route53'), 'list_hosted_zones', 'HostedZones')
+
+
+# --- REGIONAIS ---
+def scoped_vpc_ids(region):
+    """VPC IDs do escopo na região (None = sem escopo de rede, todas as VPCs)."""
+    if not get_scope().network_scoped:
+        return None
+    # Mesma entrada de cache do coletor 'ec2.vpcs', memorizada no escopo
+    vpcs = get_scope().vpcs(region, lambda: cached(region, 'ec2', 'vpcs', lambda: ec2_vpcs(region)))
+    return [vpc['VpcId'] for vpc in vpcs]
+
+
+def by_vpc(region, list_fn):
+    """
+    Executa list_fn(Filters) com o filtro vpc-id do escopo (em blocos de até
+    200 IDs). Região sem VPC no escopo: nenhuma chamada.
+    """
+    vpc_ids = scoped_vpc_ids(region)
+    if vpc_ids is None:
+        return list_fn([])
+    return chain.from_iterable(list_fn([{'Name': 'vpc-id', 'Values': ids}]) for ids in chunks(vpc_ids))
+
+
+@collector('ec2', 'vpcs')
+def ec2_vpcs(region):
+    scope = get_scope()
+    return scope.vpcs(region, lambda: iter_pages(get_client('ec2', region), 'describe_vpcs', 'Vpcs',
+                                                 Filters=scope.vpc_filters()))
+
+
+@collector('ec2', 'subnets', network=True)
+def ec2_subnets(region):
+    return by_vpc(region, lambda filters: iter_pages(get_client('ec2', region), 'describe_subnets', 'Subnets',
+                                                     Filters=filters))
+
+
+@collector('ec2', 'network_interfaces', network=True)
+def ec2_network_interfaces(region):
+    return by_vpc(region, lambda filters: list_network_interfaces(get_client('ec2', region), Filters=filters))
+
+
+@collector('ec2', 'instances', network=True)
+def ec2_instances(region):
+    return by_vpc(region, lambda filters: list_instances(get_client('ec2', region), Filters=filters))
+
+
+@collector('ec2', 'volumes', network=True, requires=('ec2.instances',))
+def ec2_volumes(region, instances):
+    """Volumes EBS das instâncias: IDs em blocos de 200 no filtro volume-id, DescribeVolumes paginado."""
+    volume_ids = sorted({m['Ebs']['VolumeId'] for instance in instances
+                         for m in instance.get('BlockDeviceMappings', []) if 'Ebs' in m})
+    return chain.from_iterable(iter_pages(get_client('ec2', region), 'describe_volumes', 'Volumes',
+                                          Filters=[{'Name': 'volume-id', 'Values': ids}])
+                               for ids in chunks(volume_ids))
+
+
+@collector('ec2', 'route_tables', network=True)
+def ec2_route_tables(region):
+    return by_vpc(region, lambda filters: iter_pages(get_client('ec2', region), 'describe_route_tables',
+                                                     'RouteTables', Filters=filters))
+
+
+@collector('ec2', 'nat_gateways', network=True)
+def ec2_nat_gateways(region):
+    # DescribeNatGateways recebe 'Filter' (no singular)
+    return by_vpc(region, lambda filters: iter_pages(get_client('ec2', region), 'describe_nat_gateways',
+                                                     'NatGateways', Filter=filters))
+
+
+@collector('ec2', 'transit_gateway_attachments', network=True)
+def ec2_transit_gateway_attachments(region):
+    def list_attachments(filters):
+        # Attachments de VPC: o VPC ID vem no filtro 'resource-id'
+        filters = [{'Name': 'resource-id', 'Values': f['Values']} for f in filters]
+        return iter_pages(get_client('ec2', region), 'describe_transit_gateway_attachments',
+                          'TransitGatewayAttachments',
+                          Filters=filters + [{'Name': 'resource-type', 'Values': ['vpc']}])
+    return by_vpc(region, list_attachments)
+
+
+@collector('lambda', 'functions')
+def lambda_functions(region):
+    functions = iter_pages(get_client('lambda', region), 'list_functions', 'Functions')
+    vpc_ids = scoped_vpc_ids(region)
+    if vpc_ids is None:
+        return functions
+    # Só --tag: funções fora de VPC entram pela própria tag (ListFunctions não traz tags)
+    tagged = set()
+    if get_scope().tags and not get_scope().vpc_ids:
+        tagged = {r['ResourceARN'] for r in iter_pages(
+            get_client('resourcegroupstaggingapi', region), 'get_resources', 'ResourceTagMappingList',
+            ResourceTypeFilters=['lambda:function'], TagFilters=get_scope().tag_filters())}
+
+    def in_scope(function):
+        vpc_id = (function.get('VpcConfig') or {}).get('VpcId')
+        return vpc_id in vpc_ids if vpc_id else function['FunctionArn'] in tagged
+    # A API não filtra por VPC: o filtro é aplicado página a página, ainda no coletor
+    return (f for f in functions if in_scope(f))
+
+
+@collector('dynamodb', 'tables')
+def dynamodb_tables(region):
+    return iter_pages(get_client('dynamodb', region), 'list_tables', 'TableNames')
+
+
+@collector('eks', 'clusters', network=True)
+def eks_clusters(region):
+    return iter_pages(get_client('eks', region), 'list_clusters', 'clusters')
+
+
+@collector('rds', 'db_instances', network=True)
+def rds_db_instances(region):
+    instances = iter_pages(get_client('rds', region), 'describe_db_instances', 'DBInstances')
+    vpc_ids = scoped_vpc_ids(region)
+    if vpc_ids is None:
+        return instances
+    return (db for db in instances if (db.get('DBSubnetGroup') or {}).get('VpcId') in vpc_ids)
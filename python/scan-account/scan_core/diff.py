@@ -0,0 +1,299 @@
+"""
+Diferenças entre duas execuções dos relatórios (aba 'Changes').
+
+Compara duas saídas dos scripts sem carregar nenhuma delas inteira na memória:
+xlsx (lido em modo read-only), diretórios csv/jsonl/parquet ou o banco SQLite
+(--db / --format sqlite). Cada linha vira uma impressão digital:
+
+- chave:    hash (16 bytes) das colunas que identificam o recurso na aba (DIFF_KEYS)
+- conteúdo: hash (8 bytes) de todas as colunas presentes nas duas execuções
+
+Três passadas lineares, todas em streaming:
+1. execução antiga -> {chave: conteúdo} por aba (só os hashes ficam na memória);
+2. execução nova   -> cada chave é retirada do índice: ausente = Added,
+                      conteúdo diferente = Changed (guarda só a linha nova), igual = nada;
+3. execução antiga de novo, só para as chaves que sobraram (Removed) ou mudaram
+   (Changed, com as colunas alteradas e os valores antigos/novos).
+
+Colunas que só existem numa das execuções (ex.: colunas novas de uma versão
+mais recente dos scripts) não entram no hash e aparecem no resumo.
+"""
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+
+from .records import ChangeRow, ChangeSummaryRow
+from .sinks import sql_name
+
+CHANGES_LAYOUT = {'Summary': list(ChangeSummaryRow.COLUMNS), 'Changes': list(ChangeRow.COLUMNS)}
+DEFAULT_CHANGES_FILE = "Mudancas_AWS.xlsx"
+
+SERVICE_KEY = ('Region', 'Category', 'Service', 'Name/ID')
+# Aba (nome normalizado) -> colunas que identificam a linha (mais 'Account', se houver);
+# sem entrada, a linha inteira é a chave
+DIFF_KEYS = {
+    'global_resources': SERVICE_KEY,
+    'global': SERVICE_KEY,
+    'regional_services': SERVICE_KEY,
+    'services': SERVICE_KEY,
+    'vpc_hierarchy': ('Region', 'VPC ID', 'Subnet ID', 'Resource Type', 'Resource ID'),
+    'vpc_network': ('Region', 'VPC ID', 'Subnet ID', 'Resource ID', 'Private IP'),
+    'vpc_network_architecture': ('Region', 'Subnet ID'),
+    'ec2_inventory': ('Region', 'EC2 Instance ID'),
+    'ebs_volumes': ('Region', 'EC2 Instance ID', 'Volume ID'),
+    'lambda_inventory': ('Region', 'Lambda Function Name', 'Subnet ID'),
+    's3_buckets': ('Bucket Name',),
+    'iam_users': ('User Name',),
+    'iam_roles': ('Role Name',),
+    'iam_groups': ('Group Name',),
+    'iam_policies': ('ARN',),
+    # Banco do inventário (--db)
+    'subnets': ('Account', 'Region', 'Subnet ID'),
+    'network_interfaces': ('Account', 'Region', 'ENI ID'),
+    'ip_addresses': ('Account', 'Region', 'IP', 'ENI ID'),
+    'tags': ('Account', 'Region', 'Resource ID', 'Key'),
+}
+# Abas que mudam a cada execução por natureza
+SKIPPED_SHEETS = {'scan_metrics'}
+
+
+# --- LEITURA EM STREAMING ---
+def iter_sheets(path):
+    """(aba, colunas, linhas) de uma saída: .xlsx, banco SQLite ou diretório (csv/jsonl/parquet)."""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            sheet, ext = os.path.splitext(name)
+            reader = DIR_READERS.get(ext)
+            if reader:
+                yield (sheet,) + reader(os.path.join(path, name))
+    elif path.endswith(('.db', '.sqlite')):
+        yield from _sqlite_sheets(path)
+    else:
+        yield from _xlsx_sheets(path)
+
+
+def _xlsx_sheets(path):
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True)
+    try:
+        for ws in workbook.worksheets:
+            rows = ws.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header:
+                yield ws.title, [c for c in header], rows
+    finally:
+        workbook.close()
+
+
+def _sqlite_sheets(path):
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        query = "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        tables = [row[0] for row in db.execute(query)]
+        for table in tables:
+            cursor = db.execute(f'SELECT * FROM "{table}"')
+            yield table, [c[0] for c in cursor.description], cursor
+    finally:
+        db.close()
+
+
+def _csv_file(path):
+    f = open(path, newline='', encoding='utf-8')
+    reader = csv.reader(f)
+    return next(reader, []), _closing(f, reader)
+
+
+def _jsonl_file(path):
+    f = open(path, encoding='utf-8')
+    first = f.readline()
+    columns = list(json.loads(first)) if first.strip() else []
+
+    def rows():
+        if first.strip():
+            yield [json.loads(first).get(c) for c in columns]
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield [record.get(c) for c in columns]
+    return columns, _closing(f, rows())
+
+
+def _parquet_file(path):
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Ler parquet requer o pacote pyarrow (pip install pyarrow).")
+    parquet = pyarrow.parquet.ParquetFile(path)
+    columns = parquet.schema_arrow.names
+
+    def rows():
+        for batch in parquet.iter_batches():
+            for record in batch.to_pylist():
+                yield [record.get(c) for c in columns]
+    return columns, rows()
+
+
+def _closing(f, rows):
+    with f:
+        yield from rows
+
+
+DIR_READERS = {'.csv': _csv_file, '.jsonl': _jsonl_file, '.parquet': _parquet_file}
+
+
+def read_headers(path):
+    """{aba normalizada: colunas} sem ler as linhas."""
+    headers = {}
+    for sheet, columns, rows in iter_sheets(path):
+        headers[sql_name(sheet)] = columns
+        close = getattr(rows, 'close', None)
+        if close:
+            close()
+    return headers
+
+
+# --- IMPRESSÕES DIGITAIS ---
+def _text(value):
+    return '' if value is None else str(value)
+
+
+def _digest(text, size):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=size).digest()
+
+
+class SheetFingerprint:
+    """Como uma aba vira (chave, conteúdo): colunas comuns às duas execuções, em ordem de nome."""
+
+    def __init__(self, sheet, old_columns, new_columns):
+        self.sheet = sheet
+        old_names = {sql_name(c): c for c in old_columns or []}
+        new_names = {sql_name(c): c for c in new_columns or []}
+        both = old_names if new_columns is None else new_names if old_columns is None else \
+            {n: c for n, c in new_names.items() if n in old_names}
+        self.common = sorted(both)
+        self.labels = [both[n] for n in self.common]
+        keys = [sql_name(c) for c in DIFF_KEYS.get(sql_name(sheet), ())]
+        if keys and 'account' in both:
+            keys.append('account')  # relatórios consolidados do scan_organization.py
+        if keys and set(keys) <= set(both):
+            self.key = [self.common.index(n) for n in keys]
+        else:
+            self.key = list(range(len(self.common)))
+        if old_columns is None or new_columns is None:
+            self.column_changes = "(aba nova)" if old_columns is None else "(aba removida)"
+        else:
+            self.column_changes = ', '.join([f"+{c}" for n, c in new_names.items() if n not in old_names] +
+                                            [f"-{c}" for n, c in old_names.items() if n not in new_names])
+        self.dups = {}  # chave -> nº de ocorrências (só chaves repetidas na execução antiga)
+
+    def project(self, columns, rows):
+        """Valores (texto) das colunas comuns, na ordem de self.common."""
+        positions = {sql_name(c): i for i, c in enumerate(columns)}
+        index = [positions[n] for n in self.common]
+        for row in rows:
+            yield [_text(row[i]) if i < len(row) else '' for i in index]
+
+    def key_text(self, values):
+        return ' | '.join(f"{self.labels[i]}={values[i]}" for i in self.key)
+
+    def fingerprint(self, values):
+        return _digest('\x1f'.join([values[i] for i in self.key]), 16), _digest('\x1f'.join(values), 8)
+
+    def occurrence(self, key, counters):
+        """Chave da n-ésima ocorrência de uma chave repetida (mesma numeração nas três passadas)."""
+        if key not in self.dups:
+            return key
+        n = counters.get(key, 0)
+        counters[key] = n + 1
+        return key if n == 0 else _digest(f"{key.hex()}#{n}", 16)
+
+    def describe(self, values, only=None):
+        return '; '.join(f"{self.labels[i]}={v}" for i, v in enumerate(values)
+                         if (only is None and i not in self.key and v) or (only is not None and i in only))
+
+
+# --- COMPARAÇÃO ---
+def diff_reports(old_path, new_path, sink):
+    """Escreve as linhas de 'Changes' e 'Summary' no sink; devolve {aba: resumo}."""
+    old_headers = read_headers(old_path)
+    new_headers = read_headers(new_path)
+    sheets = {}
+    for name in list(old_headers) + [n for n in new_headers if n not in old_headers]:
+        if name not in SKIPPED_SHEETS:
+            sheets[name] = SheetFingerprint(name, old_headers.get(name), new_headers.get(name))
+    summary = {name: {'added': 0, 'removed': 0, 'changed': 0, 'unchanged': 0} for name in sheets}
+
+    # 1. Execução antiga: só os hashes
+    index = {name: {} for name in sheets}
+    for sheet, columns, rows in iter_sheets(old_path):
+        fp = sheets.get(sql_name(sheet))
+        if fp is None:
+            continue
+        fp.sheet = sheet
+        sheet_index = index[sql_name(sheet)]
+        for values in fp.project(columns, rows):
+            key, content = fp.fingerprint(values)
+            if key in sheet_index:
+                n = fp.dups.get(key, 1)
+                fp.dups[key] = n + 1
+                key = _digest(f"{key.hex()}#{n}", 16)
+            sheet_index[key] = content
+
+    # 2. Execução nova: Added na hora; Changed guarda só a linha nova
+    changed = {name: {} for name in sheets}
+    for sheet, columns, rows in iter_sheets(new_path):
+        name = sql_name(sheet)
+        fp = sheets.get(name)
+        if fp is None:
+            continue
+        fp.sheet = sheet
+        counters = {}
+        added = []
+        for values in fp.project(columns, rows):
+            key, content = fp.fingerprint(values)
+            key = fp.occurrence(key, counters)
+            old = index[name].pop(key, None)
+            if old is None:
+                summary[name]['added'] += 1
+                added.append(ChangeRow(change='Added', sheet=sheet, key=fp.key_text(values), changed_columns='-',
+                                       old_values='-', new_values=fp.describe(values)))
+                if len(added) >= 1000:
+                    sink.write('Changes', added)
+                    added = []
+            elif old != content:
+                changed[name][key] = values
+            else:
+                summary[name]['unchanged'] += 1
+        sink.write('Changes', added)
+
+    # 3. Execução antiga de novo, só para Removed/Changed
+    for sheet, columns, rows in iter_sheets(old_path):
+        name = sql_name(sheet)
+        fp = sheets.get(name)
+        if fp is None or not (index[name] or changed[name]):
+            continue
+        counters = {}
+        out = []
+        for values in fp.project(columns, rows):
+            key = fp.occurrence(fp.fingerprint(values)[0], counters)
+            if key in index[name]:
+                summary[name]['removed'] += 1
+                out.append(ChangeRow(change='Removed', sheet=fp.sheet, key=fp.key_text(values), changed_columns='-',
+                                     old_values=fp.describe(values), new_values='-'))
+            elif key in changed[name]:
+                new_values = changed[name].pop(key)
+                diff = {i for i, (a, b) in enumerate(zip(values, new_values)) if a != b}
+                summary[name]['changed'] += 1
+                out.append(ChangeRow(change='Changed', sheet=fp.sheet, key=fp.key_text(values),
+                                     changed_columns=', '.join(fp.labels[i] for i in sorted(diff)),
+                                     old_values=fp.describe(values, diff), new_values=fp.describe(new_values, diff)))
+            if len(out) >= 1000:
+                sink.write('Changes', out)
+                out = []
+        sink.write('Changes', out)
+
+    sink.write('Summary', [ChangeSummaryRow(sheet=fp.sheet, columns=fp.column_changes or '-', **summary[name])
+                           for name, fp in sheets.items()])
+    return {sheets[name].sheet: counts for name, counts in summary.items()}
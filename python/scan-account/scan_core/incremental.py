@@ -0,0 +1,320 @@
+"""
+Atualização incremental do inventário a partir de eventos do CloudTrail.
+
+Parte do último snapshot (os arquivos do cache local gravados pela última
+varredura) e lê os eventos de escrita registrados desde então:
+
+- de um diretório com arquivos JSON: entregas do CloudTrail (`{"Records": [...]}`,
+  com ou sem gzip) ou eventos do EventBridge (um por arquivo ou um por linha);
+- de um prefixo S3 (`s3://bucket/prefixo`), no mesmo formato das entregas do trail.
+
+Cada evento relevante (criar/apagar/modificar VPC, subnet, ENI, instância,
+volume EBS, route table, NAT gateway, attachment de TGW ou Lambda) vira uma
+lista de IDs por unidade (região/coletor) e só esses recursos são consultados
+de novo, com filtro por ID; os que sumiram saem do snapshot. Evento sem ID
+reconhecível (ex.: DisassociateRouteTable só traz o associationId) faz a
+unidade inteira ser buscada de novo, mas só ela. Eventos mais antigos que o
+snapshot da unidade já estão nele e são ignorados.
+"""
+import gzip
+import json
+import os
+import re
+from collections import defaultdict
+from datetime import datetime
+
+from .cache import get_cache
+from .collectors import COLLECTORS, scoped_vpc_ids
+from .indexes import iter_pages, list_instances, list_network_interfaces
+from .scope import chunks, get_scope
+from .session import get_client
+
+# Eventos até esta margem (s) antes do snapshot ainda são aplicados (consistência eventual)
+SNAPSHOT_MARGIN = 300
+EVENT_FILES = ('.json', '.jsonl', '.gz')
+
+ID_PATTERN = re.compile(r'^(vpc|subnet|eni|i|vol|rtb|nat|tgw-attach)-[0-9a-f]{8,17}$')
+
+# Eventos de escrita -> coletores afetados
+COLLECTOR_EVENTS = {
+    'ec2.vpcs': ('CreateVpc', 'DeleteVpc', 'ModifyVpcAttribute', 'AssociateVpcCidrBlock',
+                 'DisassociateVpcCidrBlock'),
+    'ec2.subnets': ('CreateSubnet', 'DeleteSubnet', 'ModifySubnetAttribute', 'AssociateSubnetCidrBlock',
+                    'DisassociateSubnetCidrBlock'),
+    'ec2.network_interfaces': ('CreateNetworkInterface', 'DeleteNetworkInterface', 'AttachNetworkInterface',
+                               'DetachNetworkInterface', 'ModifyNetworkInterfaceAttribute',
+                               'AssignPrivateIpAddresses', 'UnassignPrivateIpAddresses', 'AssignIpv6Addresses',
+                               'UnassignIpv6Addresses', 'AssociateAddress', 'DisassociateAddress',
+                               'RunInstances', 'TerminateInstances'),
+    'ec2.instances': ('RunInstances', 'TerminateInstances', 'StartInstances', 'StopInstances',
+                      'ModifyInstanceAttribute', 'AttachNetworkInterface', 'DetachNetworkInterface',
+                      'AssociateAddress', 'DisassociateAddress', 'AttachVolume', 'DetachVolume'),
+    'ec2.volumes': ('RunInstances', 'TerminateInstances', 'AttachVolume', 'DetachVolume', 'ModifyVolume',
+                    'DeleteVolume'),
+    'ec2.route_tables': ('CreateVpc', 'DeleteVpc', 'CreateRouteTable', 'DeleteRouteTable', 'CreateRoute',
+                         'DeleteRoute', 'ReplaceRoute', 'AssociateRouteTable', 'DisassociateRouteTable',
+                         'ReplaceRouteTableAssociation'),
+    'ec2.nat_gateways': ('CreateNatGateway', 'DeleteNatGateway'),
+    'ec2.transit_gateway_attachments': ('CreateTransitGatewayVpcAttachment', 'DeleteTransitGatewayVpcAttachment',
+                                        'ModifyTransitGatewayVpcAttachment', 'AcceptTransitGatewayVpcAttachment'),
+    'lambda.functions': ('CreateFunction', 'DeleteFunction', 'UpdateFunctionConfiguration', 'UpdateFunctionCode'),
+}
+EVENTS = {name: [key for key, names in COLLECTOR_EVENTS.items() if name in names]
+          for name in set().union(*COLLECTOR_EVENTS.values())}
+
+# Tags: a unidade afetada vem do prefixo de cada recurso
+TAG_EVENTS = {'CreateTags', 'DeleteTags'}
+TAG_COLLECTORS = {'vpc': 'ec2.vpcs', 'subnet': 'ec2.subnets', 'eni': 'ec2.network_interfaces',
+                  'i': 'ec2.instances', 'vol': 'ec2.volumes', 'rtb': 'ec2.route_tables', 'nat': 'ec2.nat_gateways',
+                  'tgw-attach': 'ec2.transit_gateway_attachments'}
+
+# Coletor -> {prefixo do ID: filtro da API usado para reconsultar}
+ID_FILTERS = {
+    'ec2.vpcs': {'vpc': 'vpc-id'},
+    'ec2.subnets': {'subnet': 'subnet-id'},
+    'ec2.network_interfaces': {'eni': 'network-interface-id', 'i': 'attachment.instance-id'},
+    'ec2.instances': {'i': 'instance-id'},
+    'ec2.volumes': {'vol': 'volume-id', 'i': 'attachment.instance-id'},
+    'ec2.route_tables': {'rtb': 'route-table-id', 'vpc': 'vpc-id'},
+    'ec2.nat_gateways': {'nat': 'nat-gateway-id'},
+    'ec2.transit_gateway_attachments': {'tgw-attach': 'transit-gateway-attachment-id'},
+}
+
+# Filtro -> valor correspondente num item do snapshot
+MATCHERS = {
+    'vpc-id': lambda item: item.get('VpcId'),
+    'subnet-id': lambda item: item.get('SubnetId'),
+    'network-interface-id': lambda item: item.get('NetworkInterfaceId'),
+    'attachment.instance-id': lambda item: (item.get('Attachment') or (item.get('Attachments') or [{}])[0]).get(
+        'InstanceId'),  # ENI: 'Attachment'; volume: 'Attachments'
+    'instance-id': lambda item: item.get('InstanceId'),
+    'volume-id': lambda item: item.get('VolumeId'),
+    'route-table-id': lambda item: item.get('RouteTableId'),
+    'nat-gateway-id': lambda item: item.get('NatGatewayId'),
+    'transit-gateway-attachment-id': lambda item: item.get('TransitGatewayAttachmentId'),
+    'function-name': lambda item: item.get('FunctionName'),
+}
+
+ITEM_IDS = {'ec2.vpcs': 'VpcId', 'ec2.subnets': 'SubnetId', 'ec2.network_interfaces': 'NetworkInterfaceId',
+            'ec2.instances': 'InstanceId', 'ec2.volumes': 'VolumeId', 'ec2.route_tables': 'RouteTableId', 'ec2.nat_gateways': 'NatGatewayId',
+            'ec2.transit_gateway_attachments': 'TransitGatewayAttachmentId', 'lambda.functions': 'FunctionName'}
+
+DESCRIBE = {
+    'ec2.vpcs': lambda ec2, filters: iter_pages(ec2, 'describe_vpcs', 'Vpcs', Filters=filters),
+    'ec2.subnets': lambda ec2, filters: iter_pages(ec2, 'describe_subnets', 'Subnets', Filters=filters),
+    'ec2.network_interfaces': lambda ec2, filters: list_network_interfaces(ec2, Filters=filters),
+    'ec2.instances': lambda ec2, filters: list_instances(ec2, Filters=filters),
+    # DescribeVolumes não filtra por VPC: o escopo já vem das instâncias
+    'ec2.volumes': lambda ec2, filters: iter_pages(ec2, 'describe_volumes', 'Volumes',
+                                                   Filters=[f for f in filters if f['Name'] != 'vpc-id']),
+    'ec2.route_tables': lambda ec2, filters: iter_pages(ec2, 'describe_route_tables', 'RouteTables',
+                                                        Filters=filters),
+    'ec2.nat_gateways': lambda ec2, filters: iter_pages(ec2, 'describe_nat_gateways', 'NatGateways', Filter=filters),
+    # Attachments de VPC: o filtro de escopo 'vpc-id' vira 'resource-id'
+    'ec2.transit_gateway_attachments': lambda ec2, filters: iter_pages(
+        ec2, 'describe_transit_gateway_attachments', 'TransitGatewayAttachments',
+        Filters=[dict(f, Name='resource-id') if f['Name'] == 'vpc-id' else f for f in filters]),
+}
+
+
+# --- LEITURA DOS EVENTOS ---
+def read_events(source):
+    """Registros do CloudTrail de um diretório local ou de um prefixo s3://bucket/prefixo."""
+    if source.startswith('s3://'):
+        bucket, _, prefix = source[len('s3://'):].partition('/')
+        s3 = get_client('s3')
+        for obj in iter_pages(s3, 'list_objects_v2', 'Contents', Bucket=bucket, Prefix=prefix):
+            if obj['Key'].endswith(EVENT_FILES):
+                yield from _records(obj['Key'], s3.get_object(Bucket=bucket, Key=obj['Key'])['Body'].read())
+        return
+    for root, _, files in sorted(os.walk(source)):
+        for name in sorted(files):
+            if name.endswith(EVENT_FILES):
+                with open(os.path.join(root, name), 'rb') as f:
+                    yield from _records(name, f.read())
+
+
+def _records(name, data):
+    try:
+        text = (gzip.decompress(data) if name.endswith('.gz') else data).decode('utf-8')
+        try:
+            docs = [json.loads(text)]
+        except ValueError:
+            docs = [json.loads(line) for line in text.splitlines() if line.strip()]  # Um evento por linha
+    except (OSError, ValueError) as e:
+        print(f"   [Erro Eventos {name}]: {e}")
+        return
+    for doc in docs:
+        for item in doc if isinstance(doc, list) else [doc]:
+            if 'Records' in item:
+                yield from item['Records']  # Entrega do CloudTrail
+            elif 'detail' in item:
+                yield item['detail']  # Evento do EventBridge ("AWS API Call via CloudTrail")
+            else:
+                yield item
+
+
+# --- EVENTOS -> UNIDADES AFETADAS ---
+def _find_ids(value, found):
+    if isinstance(value, dict):
+        for v in value.values():
+            _find_ids(v, found)
+    elif isinstance(value, list):
+        for v in value:
+            _find_ids(v, found)
+    elif isinstance(value, str):
+        match = ID_PATTERN.match(value)
+        if match:
+            found[match.group(1)].add(value)
+
+
+def _event_time(record):
+    try:
+        return datetime.fromisoformat(record['eventTime'].replace('Z', '+00:00')).timestamp()
+    except (KeyError, ValueError):
+        return float('inf')  # Sem horário: sempre aplicado
+
+
+def _function_name(record):
+    params = record.get('requestParameters') or {}
+    name = params.get('functionName') or (record.get('responseElements') or {}).get('functionName')
+    if name and name.startswith('arn:'):
+        name = name.split(':')[6]  # arn:aws:lambda:região:conta:function:nome[:versão]
+    return name
+
+
+def affected_units(records, account=None):
+    """
+    {(região, coletor): [(horário, {filtro: IDs} ou None = unidade inteira), ...]}
+    só para eventos de escrita bem-sucedidos, da conta e do escopo da varredura.
+    """
+    scope = get_scope()
+    units = defaultdict(list)
+    for record in records:
+        if record.get('errorCode') or not record.get('awsRegion'):
+            continue  # Chamada que falhou não mudou nada
+        if account not in (None, 'default') and record.get('recipientAccountId', account) != account:
+            continue
+        region = record['awsRegion']
+        if scope.regions and region not in scope.regions:
+            continue
+        source = record.get('eventSource', '')
+        name = re.sub(r'\d{8}(v\d+)?$', '', record.get('eventName', ''))  # CreateFunction20150331
+        if source == 'lambda.amazonaws.com' and name in EVENTS:
+            function = _function_name(record)
+            changes = {'lambda.functions': {'function-name': {function}} if function else None}
+        elif source == 'ec2.amazonaws.com' and (name in EVENTS or name in TAG_EVENTS):
+            found = defaultdict(set)
+            _find_ids(record.get('requestParameters'), found)
+            _find_ids(record.get('responseElements'), found)
+            if name in TAG_EVENTS:
+                keys = [TAG_COLLECTORS[prefix] for prefix in found if prefix in TAG_COLLECTORS]
+            else:
+                keys = EVENTS[name]
+            changes = {}
+            for key in keys:
+                filters = {f: found[prefix] for prefix, f in ID_FILTERS[key].items() if found.get(prefix)}
+                changes[key] = filters or None
+        else:
+            continue
+        for key, filters in changes.items():
+            if scope.allows(COLLECTORS[key].service):
+                units[(region, key)].append((_event_time(record), filters))
+    return units
+
+
+# --- RECONSULTA E CORREÇÃO DO SNAPSHOT ---
+def _describe(region, key, filters):
+    """Versões atuais dos recursos filtrados ({filtro: IDs}), respeitando o escopo."""
+    scope = get_scope()
+    if key == 'lambda.functions':
+        yield from _lambda_functions(region, filters['function-name'])
+        return
+    extra = scope.vpc_filters() if key == 'ec2.vpcs' else []
+    vpc_ids = scoped_vpc_ids(region) if key != 'ec2.vpcs' else None
+    if vpc_ids is not None:
+        if not vpc_ids:
+            return
+        extra = [{'Name': 'vpc-id', 'Values': vpc_ids}]
+    ec2 = get_client('ec2', region)
+    for name, ids in filters.items():
+        for chunk in chunks(sorted(ids)):
+            yield from DESCRIBE[key](ec2, [{'Name': name, 'Values': chunk}] + extra)
+
+
+def _lambda_functions(region, names):
+    client = get_client('lambda', region)
+    vpc_ids = scoped_vpc_ids(region)
+    for name in sorted(names):
+        try:
+            config = client.get_function_configuration(FunctionName=name)
+        except client.exceptions.ResourceNotFoundException:
+            continue  # Apagada: sai do snapshot
+        config.pop('ResponseMetadata', None)
+        if vpc_ids is None or (config.get('VpcConfig') or {}).get('VpcId') in vpc_ids:
+            yield config
+
+
+def patch(items, key, filters, fresh):
+    """
+    Troca no snapshot os itens reconsultados pelas versões atuais (na mesma
+    posição), remove os que não voltaram (apagados) e acrescenta os novos.
+    """
+    id_field = ITEM_IDS[key]
+    fresh = {item[id_field]: item for item in fresh}
+    patched = []
+    for item in items:
+        if item.get(id_field) in fresh:
+            patched.append(fresh.pop(item[id_field]))
+        elif not any(MATCHERS[f](item) in ids for f, ids in filters.items()):
+            patched.append(item)
+    return patched + list(fresh.values())
+
+
+def apply_events(source):
+    """
+    Aplica os eventos de `source` ao snapshot do cache (get_cache()). Os
+    relatórios gerados em seguida (com --resume) saem do snapshot corrigido.
+    """
+    cache = get_cache()
+    stats = defaultdict(int)
+
+    def counted(records):
+        for record in records:
+            stats['events'] += 1
+            yield record
+
+    units = affected_units(counted(read_events(source)), cache.account)
+    order = list(COLLECTORS)
+    for region, key in sorted(units, key=lambda unit: (unit[0], order.index(unit[1]))):
+        c = COLLECTORS[key]
+        items, snapshot_time = cache.snapshot(region, c.service, c.name)
+        if items is None:
+            stats['no_snapshot'] += 1  # Unidade nunca coletada: a varredura busca inteira se precisar
+            continue
+        events = [filters for when, filters in units[(region, key)] if when > snapshot_time - SNAPSHOT_MARGIN]
+        stats['already_applied'] += len(units[(region, key)]) - len(events)
+        if not events:
+            continue
+        try:
+            if any(filters is None for filters in events):
+                inputs = [cache.snapshot(region, COLLECTORS[k].service, COLLECTORS[k].name)[0] or []
+                          for k in c.requires]  # Já corrigidos (ordem de COLLECTORS)
+                cache.replace(region, c.service, c.name, c.fetch(region, *inputs))
+                stats['full_units'] += 1
+            else:
+                merged = defaultdict(set)
+                for filters in events:
+                    for name, ids in filters.items():
+                        merged[name] |= ids
+                fresh = list(_describe(region, key, merged))
+                cache.replace(region, c.service, c.name, patch(items, key, merged, fresh))
+                stats['resources'] += sum(len(ids) for ids in merged.values())
+            stats['units'] += 1
+        except Exception as e:
+            print(f"   [Erro Incremental {region}/{key}]: {e}")
+    print(f"    Eventos: {stats['events']} lidos, {sum(len(v) for v in units.values())} aplicáveis "
+          f"({stats['already_applied']} já no snapshot)")
+    print(f"    Snapshot: {stats['units']} unidade(s) atualizada(s), {stats['resources']} recurso(s) reconsultado(s), "
+          f"{stats['full_units']} unidade(s) inteira(s), {stats['no_snapshot']} sem snapshot")
+    return dict(stats)
@@ -0,0 +1,98 @@
+"""Paginação e índices em memória montados com chamadas em lote (uma por região)."""
+from collections import defaultdict
+
+
+# Itens por página de cada operação paginada (máximos aceitos pela API).
+# Páginas maiores = menos chamadas; menores = menos memória/latência por chamada.
+PAGE_SIZES = {
+    'describe_vpcs': 1000,
+    'describe_subnets': 1000,
+    'describe_network_interfaces': 1000,
+    'describe_instances': 1000,
+    'describe_route_tables': 100,
+    'describe_volumes': 500,
+    'describe_nat_gateways': 1000,
+    'describe_transit_gateway_attachments': 1000,
+    'list_functions': 50,
+    'get_resources': 100,
+    'list_users': 1000,
+    'get_account_authorization_details': 1000,
+    'list_buckets': 1000,
+    'list_distributions': 100,
+    'list_hosted_zones': 100,
+    'list_tables': 100,
+    'list_clusters': 100,
+    'describe_db_instances': 100,
+    'list_accounts': 20,
+}
+
+
+def set_page_sizes(overrides):
+    """Ajusta PAGE_SIZES a partir de {'operação': tamanho} (0 = padrão da API)."""
+    for operation, size in overrides.items():
+        if size:
+            PAGE_SIZES[operation] = size
+        else:
+            PAGE_SIZES.pop(operation, None)
+
+
+def iter_pages(client, operation, result_key, **kwargs):
+    """
+    Gera os itens de uma operação página a página, sem montar a lista inteira.
+    `result_key` aceita caminho com ponto (ex.: 'DistributionList.Items').
+    Operações sem paginador (em versões antigas do botocore) viram uma única chamada.
+    """
+    if client.can_paginate(operation):
+        page_size = PAGE_SIZES.get(operation)
+        config = {'PageSize': page_size} if page_size else {}
+        pages = client.get_paginator(operation).paginate(PaginationConfig=config, **kwargs)
+    else:
+        pages = [getattr(client, operation)(**kwargs)]
+    for page in pages:
+        for key in result_key.split('.'):
+            page = (page or {}).get(key)
+        yield from page or []
+
+
+def paginate_all(client, operation, result_key, **kwargs):
+    """Lista completa de uma operação paginada (ex.: describe_subnets -> 'Subnets')."""
+    return list(iter_pages(client, operation, result_key, **kwargs))
+
+
+def group_by(items, key):
+    """Agrupa uma lista de dicts da API pelo campo `key` (ex.: 'VpcId')."""
+    index = defaultdict(list)
+    for item in items:
+        index[item.get(key)].append(item)
+    return index
+
+
+def list_network_interfaces(ec2_cli, **kwargs):
+    """Todas as ENIs da região com um único DescribeNetworkInterfaces paginado."""
+    return iter_pages(ec2_cli, 'describe_network_interfaces', 'NetworkInterfaces', **kwargs)
+
+
+def build_eni_index(enis):
+    """Agrupa em memória as ENIs da região: subnet-id -> [ENIs]."""
+    return group_by(enis, 'SubnetId')
+
+
+def list_instances(ec2_cli, **kwargs):
+    """Todas as instâncias da região com um único DescribeInstances paginado."""
+    return (instance
+            for reservation in iter_pages(ec2_cli, 'describe_instances', 'Reservations', **kwargs)
+            for instance in reservation['Instances'])
+
+
+def build_instance_index(instances):
+    """Índice subnet-id -> [instâncias] (dicts completos, sem lazy-load de atributos)."""
+    return group_by(instances, 'SubnetId')
+
+
+def build_lambda_index(functions):
+    """Índice subnet-id -> [funções Lambda] a partir da lista já carregada da região."""
+    index = defaultdict(list)
+    for function in functions:
+        for subnet_id in (function.get('VpcConfig') or {}).get('SubnetIds', []):
+            index[subnet_id].append(function)
+    return index
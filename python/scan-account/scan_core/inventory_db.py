@@ -0,0 +1,117 @@
+"""
+Banco local (SQLite) do inventário de rede, com índices para consultas rápidas.
+
+Gerado pelo relatório 'database' (`--db` em qualquer script). Tabelas:
+
+- subnets:            CIDR IPv4 de cada subnet também como intervalo de inteiros (range_start/range_end;
+                      subnets só IPv6 ficam de fora)
+- network_interfaces: ENI -> recurso dono (instância, Lambda, ELB...)
+- ip_addresses:       um IP por linha (privado/público, IPv4 com ip_int para busca por faixa)
+- tags:               chave/valor de VPCs, subnets, ENIs e instâncias
+- scan_metrics:       métricas das chamadas de API da varredura
+
+As consultas abaixo são as usadas pelo query_inventory.py.
+"""
+import ipaddress
+import sqlite3
+
+from .records import InterfaceRow, IpRow, SubnetRangeRow, TagRow
+from .sinks import SqliteSink
+
+DEFAULT_DB_FILE = "Inventario_AWS.db"
+
+DB_TABLES = {
+    'Subnets': list(SubnetRangeRow.COLUMNS),
+    'Network Interfaces': list(InterfaceRow.COLUMNS),
+    'IP Addresses': list(IpRow.COLUMNS),
+    'Tags': list(TagRow.COLUMNS),
+}
+
+
+class InventoryDbSink(SqliteSink):
+    INDEXES = {
+        'ip_addresses': [('ip_int',), ('ip',), ('eni_id',), ('resource_id',)],
+        'subnets': [('range_start', 'range_end'), ('subnet_id',)],
+        'network_interfaces': [('eni_id',), ('resource_id',)],
+        'tags': [('key', 'value'), ('resource_id',)],
+    }
+
+
+def ip_to_int(ip):
+    """Inteiro do IPv4 (None para IPv6, que não cabe num INTEGER do SQLite)."""
+    address = ipaddress.ip_address(ip)
+    return int(address) if address.version == 4 else None
+
+
+def cidr_range(cidr):
+    """(primeiro, último) endereço de um CIDR IPv4 como inteiros."""
+    network = ipaddress.ip_network(cidr, strict=False)
+    if network.version != 4:
+        # Os limites de uma faixa IPv6 não cabem num INTEGER (64 bits) do SQLite
+        raise ValueError(f"{cidr}: só faixas IPv4 são indexadas por intervalo")
+    return int(network.network_address), int(network.broadcast_address)
+
+
+# --- CONSULTAS ---
+def connect(path):
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    db.row_factory = sqlite3.Row
+    return db
+
+
+def _rows(cursor):
+    return [dict(row) for row in cursor]
+
+
+def find_ip(db, ip):
+    """Quem usa este IP: ENI, recurso dono e subnet."""
+    ip_int = ip_to_int(ip)
+    where, value = ("ip.ip_int = ?", ip_int) if ip_int is not None else ("ip.ip = ?", str(ipaddress.ip_address(ip)))
+    return _rows(db.execute(f"""
+        SELECT ip.account, ip.region, ip.ip, ip.scope, ip.eni_id, ni.resource_type, ni.resource_id,
+               ni.vpc_id, ni.subnet_id, ni.description
+        FROM ip_addresses ip
+        LEFT JOIN network_interfaces ni ON ni.eni_id = ip.eni_id AND ni.account IS ip.account
+        WHERE {where}""", (value,)))
+
+
+def find_subnets_containing(db, ip):
+    """Subnets cujo CIDR contém o IP (da mais específica para a mais ampla)."""
+    ip_int = ip_to_int(ip)
+    if ip_int is None:
+        return []
+    # Uma subnet /n que contém o IP começa em ip & máscara(/n): no máximo 33 buscas
+    # exatas no índice de range_start, em vez de varrer todas as faixas que começam antes do IP
+    starts = sorted({ip_int & (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF for prefix in range(33)})
+    return _rows(db.execute(f"""
+        SELECT account, region, vpc_id, subnet_id, subnet_name, cidr_block, availability_zone
+        FROM subnets WHERE range_start IN ({', '.join('?' * len(starts))}) AND range_end >= ?
+        ORDER BY range_end - range_start""", (*starts, ip_int)))
+
+
+def find_ips_in_cidr(db, cidr, limit=1000):
+    """IPs (IPv4) dentro de uma faixa CIDR, com o recurso dono (ValueError para faixa IPv6)."""
+    start, end = cidr_range(cidr)
+    return _rows(db.execute("""
+        SELECT ip.account, ip.region, ip.ip, ip.scope, ip.eni_id, ni.resource_type, ni.resource_id
+        FROM ip_addresses ip
+        LEFT JOIN network_interfaces ni ON ni.eni_id = ip.eni_id AND ni.account IS ip.account
+        WHERE ip.ip_int BETWEEN ? AND ? ORDER BY ip.ip_int LIMIT ?""", (start, end, limit)))
+
+
+def find_resource(db, resource_id):
+    """ENIs, IPs e tags de um recurso (instância, ENI, subnet, VPC...)."""
+    return {
+        'network_interfaces': _rows(db.execute(
+            "SELECT * FROM network_interfaces WHERE resource_id = ? OR eni_id = ?", (resource_id, resource_id))),
+        'ip_addresses': _rows(db.execute(
+            "SELECT * FROM ip_addresses WHERE resource_id = ? OR eni_id = ?", (resource_id, resource_id))),
+        'tags': _rows(db.execute("SELECT * FROM tags WHERE resource_id = ?", (resource_id,))),
+    }
+
+
+def find_tag(db, key, value=None, limit=1000):
+    """Recursos com a tag (e, opcionalmente, o valor)."""
+    if value is None:
+        return _rows(db.execute("SELECT * FROM tags WHERE key = ? LIMIT ?", (key, limit)))
+    return _rows(db.execute("SELECT * FROM tags WHERE key = ? AND value = ? LIMIT ?", (key, value, limit)))
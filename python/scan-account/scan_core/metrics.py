@@ -0,0 +1,125 @@
+"""
+Métricas por operação de API (aba 'Scan Metrics' e dump JSON opcional).
+
+Hooks do botocore em cada cliente da fábrica: 'before-send' marca o início de
+cada tentativa HTTP (registrado por último, depois da espera do ApiScheduler,
+então o tempo medido é só o da rede/AWS) e 'response-received' fecha a
+medição com latência, bytes recebidos e erro. Chamadas lógicas, retries e
+throttles vêm dos contadores do próprio ApiScheduler.
+"""
+import bisect
+import json
+import threading
+import time
+from collections import defaultdict
+
+from .records import MetricRow
+
+METRICS_SHEET = 'Scan Metrics'
+METRICS_COLUMNS = list(MetricRow.COLUMNS)
+# Limites superiores (ms) das faixas do histograma de latência
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class OperationStats:
+    __slots__ = ('attempts', 'errors', 'seconds', 'max_seconds', 'bytes', 'histogram')
+
+    def __init__(self):
+        self.attempts = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, seconds, size, error):
+        self.attempts += 1
+        self.errors += error
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.bytes += size
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+
+    def percentile_ms(self, fraction):
+        """Percentil aproximado: limite superior da faixa do histograma que o contém."""
+        target = fraction * self.attempts
+        seen = 0
+        for i, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else round(self.max_seconds * 1000)
+        return 0
+
+    def histogram_labels(self):
+        labels = [f"<{b}ms" for b in LATENCY_BUCKETS_MS] + [f">={LATENCY_BUCKETS_MS[-1]}ms"]
+        return {label: n for label, n in zip(labels, self.histogram) if n}
+
+
+class ApiMetrics:
+    """Latência, bytes e erros por (serviço, região, operação), por tentativa HTTP."""
+
+    def __init__(self):
+        self.operations = defaultdict(OperationStats)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def attach(self, client):
+        service = client.meta.service_model.service_name
+        region = client.meta.region_name
+
+        def before_send(**kwargs):
+            self._local.start = time.perf_counter()
+
+        def response_received(response_dict=None, exception=None, event_name='', **kwargs):
+            start = getattr(self._local, 'start', None)
+            if start is None:
+                return
+            self._local.start = None
+            elapsed = time.perf_counter() - start
+            size = len(response_dict.get('body') or b'') if response_dict else 0
+            error = exception is not None or (response_dict or {}).get('status_code', 500) >= 400
+            key = (service, region, event_name.rsplit('.', 1)[-1])
+            with self._lock:
+                self.operations[key].add(elapsed, size, error)
+
+        client.meta.events.register_last('before-send', before_send)
+        client.meta.events.register('response-received', response_received)
+        return client
+
+    def _slowest_first(self):
+        with self._lock:
+            return sorted(self.operations.items(), key=lambda item: -item[1].seconds)
+
+    def rows(self, scheduler):
+        """Linhas da aba 'Scan Metrics', das operações mais demoradas para as mais rápidas."""
+        return [self._row(key, stats, scheduler) for key, stats in self._slowest_first()]
+
+    def _row(self, key, s, scheduler):
+        service, region, op = key
+        return MetricRow(
+            region=region or 'Global', service=service, operation=op,
+            calls=scheduler.calls.get(key, 0), attempts=s.attempts, errors=s.errors,
+            retries=scheduler.retries.get(key, 0), throttles=scheduler.throttles.get(key, 0),
+            total_seconds=round(s.seconds, 3), avg_ms=round(1000 * s.seconds / s.attempts, 1),
+            p95_ms=s.percentile_ms(0.95), max_ms=round(1000 * s.max_seconds, 1), bytes_received=s.bytes,
+            histogram=' '.join(f"{k}:{v}" for k, v in s.histogram_labels().items()))
+
+    def to_dict(self, scheduler):
+        operations = []
+        by_region = defaultdict(float)
+        for key, stats in self._slowest_first():
+            entry = self._row(key, stats, scheduler).as_dict()
+            entry['Histogram'] = stats.histogram_labels()
+            operations.append(entry)
+            by_region[entry['Region']] += stats.seconds
+        return {'latency_buckets_ms': list(LATENCY_BUCKETS_MS), 'operations': operations,
+                'seconds_by_region': {r: round(t, 3) for r, t in sorted(by_region.items(), key=lambda i: -i[1])}}
+
+    def dump(self, path, scheduler):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(scheduler), f, indent=2, ensure_ascii=False)
+
+    def summary(self, top=3):
+        slowest = self._slowest_first()[:top]
+        return ", ".join(f"{service}.{op} ({region or 'Global'}) {s.seconds:.2f}s"
+                         for (service, region, op), s in slowest) or "nenhuma chamada"
@@ -0,0 +1,187 @@
+"""
+Normalização vetorizada (pandas) das ENIs brutas nas abas de rede.
+
+Em regiões com dezenas de milhares de ENIs, o laço Python por ENI (classificar,
+juntar IPs, montar um registro por linha) domina o pós-processamento. Aqui a
+resposta de describe_network_interfaces vira colunas de uma vez:
+
+- campos aninhados (Attachment.InstanceId, Association.PublicIp) numa passada por coluna;
+- PrivateIpAddresses com explode (uma linha por IP) e junção por ENI;
+- tipo do recurso com np.select sobre InterfaceType, RequesterId e, por último,
+  a descrição (as mesmas tabelas de classify_eni), guardado como 'category';
+- VPC/subnet por índice (get_indexer) e ordem final com lexsort, a mesma do
+  laço (VPC, subnet, ENI), incluindo as linhas de VPC/subnet vazias.
+
+O resultado é um DataFrame com as colunas da aba; FrameRows o entrega aos sinks
+sem criar um registro por linha. Sem pandas, scan_core.reports usa o laço.
+"""
+# Abaixo disso o custo fixo do pandas não compensa
+VECTORIZE_MIN_ENIS = 2000
+
+# InterfaceType -> tipo do recurso (tipos genéricos como 'interface'/'trunk' ficam de fora)
+INTERFACE_TYPES = {
+    'natGateway': "NAT Gateway",
+    'nat_gateway': "NAT Gateway",
+    'load_balancer': "Load Balancer",
+    'network_load_balancer': "Load Balancer",
+    'gateway_load_balancer': "Load Balancer",
+    'lambda': "Lambda Interface",
+    'vpc_endpoint': "VPC Endpoint",
+    'gateway_load_balancer_endpoint': "VPC Endpoint",
+    'transit_gateway': "Transit Gateway",
+    'efs': "EFS Mount Target",
+    'api_gateway_managed': "API Gateway",
+    'global_accelerator_managed': "Global Accelerator",
+}
+# RequesterId (serviço gerenciado que criou a ENI) -> tipo do recurso
+REQUESTERS = {
+    'amazon-elb': "Load Balancer",
+    'amazon-rds': "RDS Database",
+    'amazon-elasticache': "ElastiCache",
+}
+# Último recurso: trechos da descrição (minúscula), na ordem de prioridade
+DESCRIPTION_PATTERNS = (
+    ('rds', "RDS Database"),
+    ('elb', "Load Balancer"),
+    ('nat gateway', "NAT Gateway"),
+    ('lambda', "Lambda Interface"),
+)
+INSTANCE = "EC2 Instance"
+UNKNOWN = "Unknown Interface"
+
+ENI_FIELDS = ['NetworkInterfaceId', 'SubnetId', 'Description', 'InterfaceType', 'RequesterId', 'Attachment',
+              'PrivateIpAddresses']
+
+
+def use_frames(enis):
+    """Caminho vetorizado? Só com pandas/numpy instalados e ENIs suficientes."""
+    if len(enis) < VECTORIZE_MIN_ENIS:
+        return False
+    try:
+        import numpy  # noqa: F401
+        import pandas  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def managed_type(interface_type, requester_id, description):
+    """Tipo do recurso de uma ENI sem instância (mesma regra de eni_frame, uma ENI por vez)."""
+    label = INTERFACE_TYPES.get(interface_type) or REQUESTERS.get(requester_id)
+    if label:
+        return label
+    for pattern, label in DESCRIPTION_PATTERNS:
+        if pattern in description:
+            return label
+    return UNKNOWN
+
+
+def _join_by_eni(values, size):
+    """Junta (', ') os valores explodidos por ENI: uma concatenação vetorizada por posição (1º, 2º... IP)."""
+    import pandas as pd
+
+    values = values.dropna()
+    joined = pd.Series(None, index=pd.RangeIndex(size), dtype=object)
+    if values.empty:
+        return joined
+    rank = values.groupby(level=0, sort=False).cumcount().to_numpy()
+    first = values[rank == 0]
+    joined[first.index] = first.to_numpy(dtype=object)
+    for n in range(1, rank.max() + 1):
+        nth = values[rank == n]
+        joined[nth.index] = joined[nth.index].to_numpy() + ', ' + nth.to_numpy(dtype=object)
+    return joined
+
+
+def _field(values, key):
+    """Campo `key` de uma coluna de dicts aninhados (None onde não há dict)."""
+    return [value.get(key) if isinstance(value, dict) else None for value in values]
+
+
+def eni_frame(enis, with_ips=False):
+    """Uma linha por ENI, na ordem da API: subnet, tipo e id do recurso, detalhes (e IPs)."""
+    import numpy as np
+    import pandas as pd
+
+    raw = pd.DataFrame(enis, columns=ENI_FIELDS)
+    instance = pd.Series(_field(raw['Attachment'], 'InstanceId'), dtype=object)
+    has_instance = instance.notna().to_numpy()
+    interface_types = raw['InterfaceType'].map(INTERFACE_TYPES)
+    requesters = raw['RequesterId'].map(REQUESTERS)
+    # Descrições se repetem muito: minúsculas e padrões só sobre os valores distintos
+    codes, descriptions = pd.factorize(raw['Description'].fillna(''))
+    descriptions = descriptions.str.lower()
+    details = descriptions.to_numpy(dtype=object)[codes]
+
+    conditions = [has_instance, interface_types.notna().to_numpy(), requesters.notna().to_numpy()]
+    choices = [INSTANCE, interface_types.to_numpy(dtype=object), requesters.to_numpy(dtype=object)]
+    for pattern, label in DESCRIPTION_PATTERNS:
+        conditions.append(np.asarray(descriptions.str.contains(pattern, regex=False), dtype=bool)[codes])
+        choices.append(label)
+
+    frame = pd.DataFrame({
+        'subnet_id': raw['SubnetId'],
+        'resource_type': pd.Categorical(np.select(conditions, choices, UNKNOWN)),
+        'resource_id': np.where(has_instance, instance, raw['NetworkInterfaceId']),
+        'details': details,
+    })
+    if with_ips:
+        ips = raw['PrivateIpAddresses'].explode()
+        private = pd.Series(_field(ips, 'PrivateIpAddress'), index=ips.index, dtype=object)
+        public = pd.Series(_field(_field(ips, 'Association'), 'PublicIp'), index=ips.index, dtype=object)
+        frame['private_ip'] = _join_by_eni(private, len(raw)).fillna('')
+        frame['public_ip'] = _join_by_eni(public, len(raw)).fillna('-')
+    return frame
+
+
+def network_frame(region, vpcs, subnets, enis, with_ips=False):
+    """
+    Aba 'VPC Hierarchy' (ou 'VPC Network', com with_ips) da região como DataFrame.
+    `vpcs` = [(vpc_id, nome)], `subnets` = [(vpc_id, subnet_id, nome)]; mesmas linhas,
+    na mesma ordem, de scan_core.reports.vpc_hierarchy_rows.
+    """
+    import numpy as np
+    import pandas as pd
+
+    vpc_ids = pd.Index([vpc_id for vpc_id, _ in vpcs])
+    vpc_names = np.array([name for _, name in vpcs], dtype=object)
+    # Subnets agrupadas na ordem das VPCs (subnets de VPCs desconhecidas ficam de fora)
+    subnet_vpc = vpc_ids.get_indexer([vpc_id for vpc_id, _, _ in subnets])
+    order = np.argsort(subnet_vpc, kind='stable')
+    order = order[subnet_vpc[order] >= 0]
+    subnet_vpc = subnet_vpc[order]
+    subnet_ids = np.array([subnets[i][1] for i in order] + [None], dtype=object)
+    subnet_names = np.array([subnets[i][2] for i in order] + [None], dtype=object)
+
+    eni_rows = eni_frame(enis, with_ips)
+    eni_subnet = pd.Index(subnet_ids[:-1]).get_indexer(eni_rows['subnet_id'])
+    eni_rows = eni_rows[eni_subnet >= 0]
+    eni_subnet = eni_subnet[eni_subnet >= 0]
+
+    # Linhas de VPC/Subnet vazias: ids, nomes, tipo e detalhes (e '-' nos IPs); posição -1 = "sem"
+    empty_vpcs = np.flatnonzero(np.bincount(subnet_vpc, minlength=len(vpc_ids)) == 0)
+    empty_subnets = np.flatnonzero(np.bincount(eni_subnet, minlength=len(subnet_vpc)) == 0)
+    vpc_pos = np.concatenate([subnet_vpc[eni_subnet], empty_vpcs, subnet_vpc[empty_subnets]])
+    subnet_pos = np.concatenate([eni_subnet, np.full(len(empty_vpcs), -1), empty_subnets])
+    eni_pos = np.concatenate([np.arange(len(eni_rows)), np.full(len(empty_vpcs) + len(empty_subnets), -1)])
+    rows = np.lexsort((eni_pos, subnet_pos, vpc_pos))
+
+    def column(values, empty_vpc, empty_subnet):
+        """Valores das ENIs + valores fixos das linhas vazias, na ordem final."""
+        empty = np.array([empty_vpc] * len(empty_vpcs) + [empty_subnet] * len(empty_subnets), dtype=object)
+        return np.concatenate([np.asarray(values, dtype=object), empty])[rows]
+
+    frame = pd.DataFrame({
+        'Region': pd.Categorical([region] * len(rows)),
+        'VPC ID': vpc_ids.to_numpy(dtype=object)[vpc_pos[rows]],
+        'VPC Name': vpc_names[vpc_pos[rows]],
+        'Subnet ID': subnet_ids[subnet_pos[rows]],
+        'Subnet Name': subnet_names[subnet_pos[rows]],
+        'Resource Type': pd.Categorical(column(eni_rows['resource_type'], 'Empty VPC', 'Empty Subnet')),
+        'Resource ID': column(eni_rows['resource_id'], None, None),
+        'Details': column(eni_rows['details'], 'Sem Subnets', '-'),
+    })
+    if with_ips:
+        frame.insert(7, 'Private IP', column(eni_rows['private_ip'], '-', '-'))
+        frame.insert(8, 'Public IP', column(eni_rows['public_ip'], '-', '-'))
+    return frame
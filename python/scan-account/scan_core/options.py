@@ -0,0 +1,99 @@
+"""Opções de linha de comando comuns aos scripts de varredura."""
+import argparse
+
+from .cache import DEFAULT_CACHE_DIR, configure as configure_cache
+from .indexes import PAGE_SIZES
+from .scope import configure as configure_scope
+from .session import get_client
+from .sinks import FORMATS
+
+
+def build_parser(description, workers):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--workers', type=int, default=workers,
+                        help=f"regiões varridas em paralelo (padrão: {workers})")
+    parser.add_argument('--refresh', action='store_true',
+                        help="ignora o cache local e busca tudo novamente na API")
+    parser.add_argument('--no-cache', action='store_true', help="não lê nem grava o cache local")
+    parser.add_argument('--resume', action='store_true',
+                        help="retoma a última varredura: reaproveita as regiões/coletores já concluídos "
+                             "(mesmo fora do TTL) e busca só o que falta")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f"diretório do cache local (padrão: {DEFAULT_CACHE_DIR})")
+    scope = parser.add_argument_group('escopo (filtros enviados à API sempre que possível)')
+    scope.add_argument('--regions', help="só estas regiões, separadas por vírgula (ex.: us-east-1,sa-east-1)")
+    scope.add_argument('--vpc-id', action='append', default=[],
+                       help="só esta VPC (pode repetir); Lambdas fora de VPC ficam de fora")
+    scope.add_argument('--tag', action='append', default=[], metavar='CHAVE[=VALOR]',
+                       help="só as VPCs com esta tag, e o que está dentro delas, mais as Lambdas fora de VPC "
+                            "com a tag (pode repetir)")
+    scope.add_argument('--services', help="só estes serviços, separados por vírgula (ex.: ec2,lambda,rds)")
+    parser.add_argument('--format', choices=FORMATS, default='xlsx',
+                        help="formato de saída (padrão: xlsx; os demais geram um diretório com um arquivo por aba)")
+    parser.add_argument('--output', help="arquivo/diretório de saída (padrão: nome do relatório do script)")
+    parser.add_argument('--page-size', action='append', default=[], metavar='OPERAÇÃO=N',
+                        help="itens por página de uma operação (ex.: describe_network_interfaces=200; "
+                             f"0 = padrão da API). Atuais: {', '.join(f'{k}={v}' for k, v in PAGE_SIZES.items())}")
+    parser.add_argument('--db', nargs='?', const=True, metavar='ARQUIVO',
+                        help="gera também o banco SQLite indexado do inventário de rede "
+                             "(consultas com query_inventory.py; padrão: Inventario_AWS.db)")
+    parser.add_argument('--routing-graph', nargs='?', const=True, metavar='ARQUIVO',
+                        help="exporta também o grafo de roteamento (subnets, route tables, IGW/NAT/TGW...) "
+                             "em JSON node-link, ou Graphviz se o arquivo terminar em .dot "
+                             "(padrão: Grafo_Rotas_AWS.json)")
+    parser.add_argument('--s3', nargs='?', const=True, metavar='ARQUIVO',
+                        help="gera também o relatório dos buckets S3 (região, public access block, policy status, "
+                             "criptografia, versionamento e veredito de exposição; padrão: Relatorio_AWS_S3.xlsx)")
+    parser.add_argument('--iam', nargs='?', const=True, metavar='ARQUIVO',
+                        help="gera também o relatório do IAM (usuários com credenciais, roles, grupos e policies, "
+                             "em poucas chamadas em lote; padrão: Relatorio_AWS_IAM.xlsx)")
+    parser.add_argument('--metrics-json', help="grava também as métricas das chamadas de API neste arquivo JSON")
+    parser.add_argument('--events', metavar='FONTE',
+                        help="atualização incremental: aplica os eventos do CloudTrail (diretório de JSON ou "
+                             "s3://bucket/prefixo) ao snapshot da última varredura e só reconsulta o que mudou")
+    parser.add_argument('--list-regions', action='store_true',
+                        help="só lista as regiões ativas (respeitando --regions) e sai")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="mostra o que seria varrido e gerado, sem chamar a AWS")
+    return parser
+
+
+def get_account_id():
+    try:
+        return get_client('sts').get_caller_identity()['Account']
+    except Exception:
+        return 'default'
+
+
+def parse_page_sizes(parser, values):
+    """['describe_vpcs=500', ...] -> {'describe_vpcs': 500}."""
+    sizes = {}
+    for value in values:
+        operation, _, size = value.partition('=')
+        if not size.isdigit():
+            parser.error(f"--page-size espera OPERAÇÃO=N, recebido '{value}'")
+        sizes[operation.strip()] = int(size)
+    return sizes
+
+
+def _split(value):
+    return [v.strip() for v in (value or '').split(',') if v.strip()]
+
+
+def parse_scope(args):
+    """Opções de escopo -> kwargs de scope.configure (vai também para os processos do multi-conta)."""
+    tags = {}
+    for tag in args.tag:
+        key, sep, value = tag.partition('=')
+        tags[key.strip()] = value.strip() if sep else None
+    return {'regions': _split(args.regions), 'vpc_ids': [v for arg in args.vpc_id for v in _split(arg)],
+            'tags': tags, 'services': _split(args.services)}
+
+
+def setup_cache(args):
+    """Configura escopo e cache de inventário a partir das opções da linha de comando."""
+    scope = configure_scope(**args.scope)
+    if args.no_cache:
+        return configure_cache(enabled=False, account=get_account_id())
+    return configure_cache(root=args.cache_dir, account=get_account_id(), refresh=args.refresh,
+                           resume=args.resume, scope=scope.cache_key())
@@ -0,0 +1,237 @@
+"""
+Varredura de várias contas (AWS Organizations ou lista em arquivo).
+
+Cada conta roda num processo separado (ProcessPoolExecutor): o processo assume
+a role informada na conta, configura sua própria fábrica de clientes, cache e
+agendador de API (os limites de taxa da AWS são por conta) e varre as regiões
+em threads como no modo de conta única. Cada aba de cada região volta ao
+processo principal assim que fica pronta (uma fila limitada entre os processos)
+e é gravada no relatório consolidado com a coluna 'Account', na ordem de
+chegada: o processo principal nunca guarda uma conta inteira na memória.
+"""
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+
+from .cache import configure as configure_cache, get_cache
+from .incremental import apply_events
+from .indexes import paginate_all, set_page_sizes
+from .options import build_parser
+from .reports import REPORTS
+from .runner import iter_account_rows, open_report_sink, quick_mode, report_layout, report_outputs, select_reports
+from .scheduler import DEFAULT_MAX_WORKERS
+from .scope import configure as configure_scope
+from .session import configure as configure_clients, get_factory
+
+DEFAULT_ROLE_NAME = 'OrganizationAccountAccessRole'
+SESSION_NAME = 'scan-account'
+ROLE_DURATION = 3600
+# Lotes (uma aba de uma região) em trânsito por processo filho; cheia, o filho espera a escrita
+BATCHES_PER_PROCESS = 2
+
+
+class AccountRow:
+    """Linha de um relatório com a conta na frente (sem copiar o registro original)."""
+    __slots__ = ('account', 'row')
+
+    def __init__(self, account, row):
+        self.account = account
+        self.row = row
+
+    def get(self, column, default=None):
+        return self.account if column == 'Account' else self.row.get(column, default)
+
+
+def list_org_accounts(session=None):
+    """Contas ATIVAS da organização (requer acesso ao Organizations na conta management)."""
+    import boto3
+    client = (session or boto3.Session()).client('organizations')
+    return [(a['Id'], a['Name']) for a in paginate_all(client, 'list_accounts', 'Accounts') if a['Status'] == 'ACTIVE']
+
+
+def read_accounts_file(path):
+    """Uma conta por linha: '123456789012' ou '123456789012,Nome'. Linhas com # são ignoradas."""
+    accounts = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                account_id, _, name = line.partition(',')
+                accounts.append((account_id.strip(), name.strip() or account_id.strip()))
+    return accounts
+
+
+def assume_role_session(account_id, role_name, base_session=None):
+    """
+    Sessão boto3 com credenciais da role assumida na conta. As credenciais são
+    renovadas automaticamente antes de expirar (varreduras longas não quebram).
+    """
+    import boto3
+    from botocore.credentials import RefreshableCredentials
+
+    base_session = base_session or boto3.Session()
+    sts = base_session.client('sts')
+    role_arn = f"arn:aws:iam::{account_id}:role/{role_name}"
+
+    def refresh():
+        creds = sts.assume_role(RoleArn=role_arn, RoleSessionName=SESSION_NAME,
+                                DurationSeconds=ROLE_DURATION)['Credentials']
+        return {'access_key': creds['AccessKeyId'], 'secret_key': creds['SecretAccessKey'],
+                'token': creds['SessionToken'], 'expiry_time': creds['Expiration'].isoformat()}
+
+    credentials = RefreshableCredentials.create_from_metadata(
+        metadata=refresh(), refresh_using=refresh, method='sts-assume-role')
+    return refreshable_session(credentials, base_session.region_name)
+
+
+def refreshable_session(credentials, region_name=None):
+    """boto3.Session que usa (e renova) as RefreshableCredentials informadas."""
+    import boto3
+    import botocore.session
+
+    # O botocore não tem API pública para instalar credenciais renováveis numa
+    # sessão: o padrão usual (RefreshableCredentials + boto3.Session(botocore_session=...))
+    # atribui _credentials numa sessão botocore nova, antes de criar qualquer cliente.
+    # Este é o único ponto do código que toca atributos privados do botocore.
+    core_session = botocore.session.get_session()
+    core_session._credentials = credentials
+    return boto3.Session(botocore_session=core_session, region_name=region_name)
+
+
+def scan_account(account_id, role_name, report_names, options, batches):
+    """
+    Executado no processo filho: varre uma conta e envia cada lote
+    (conta, relatório, aba, linhas) pela fila `batches` assim que fica pronto.
+    O último item, mesmo com erro, é (conta, None, None, None).
+    """
+    try:
+        _scan_account(account_id, role_name, report_names, options, batches)
+    finally:
+        batches.put((account_id, None, None, None))
+
+
+def _scan_account(account_id, role_name, report_names, options, batches):
+    import boto3
+
+    print(f"\n=== Conta {account_id} ===")
+    base_session = boto3.Session()
+    current_account = base_session.client('sts').get_caller_identity()['Account']
+    # Na própria conta das credenciais não é preciso assumir role
+    session = base_session if account_id == current_account else assume_role_session(account_id, role_name, base_session)
+    configure_clients(session=session)
+    set_page_sizes(options['page_sizes'])
+    scope = configure_scope(**options['scope'])
+    if options['no_cache']:
+        configure_cache(enabled=False, account=account_id)
+    else:
+        configure_cache(root=options['cache_dir'], account=account_id, refresh=options['refresh'],
+                        resume=options['resume'], scope=scope.cache_key())
+        if options['events']:
+            apply_events(options['events'])  # Só os eventos desta conta (recipientAccountId)
+
+    reports = [REPORTS[n] for n in report_names]
+    for name, sheet, rows in iter_account_rows(reports, options['workers']):
+        batches.put((account_id, name, sheet, rows))
+    get_cache().finish()
+    if options['metrics_json']:
+        # Um arquivo por conta: métricas_123456789012.json
+        root, ext = os.path.splitext(options['metrics_json'])
+        factory = get_factory()
+        factory.metrics.dump(f"{root}_{account_id}{ext or '.json'}", factory.scheduler)
+
+
+def consolidate(futures, batches, sinks, failed):
+    """
+    Grava os lotes na ordem de chegada até todas as contas terminarem.
+    `futures` = {conta: future}; contas com erro vão para `failed`.
+    """
+    pending = set(futures)
+    done = 0
+    while pending:
+        try:
+            account_id, name, sheet, rows = batches.get(timeout=1)
+        except queue.Empty:
+            # Processo filho morto (ex.: sem memória) não envia o marcador de fim
+            if all(futures[a].done() for a in pending) and batches.empty():
+                for account_id in sorted(pending):
+                    failed.append((account_id, futures[account_id].exception() or 'processo encerrado'))
+                    print(f"    Conta {account_id}: ERRO {failed[-1][1]}")
+                return
+            continue
+        if name is not None:
+            sinks[name].write(sheet, (AccountRow(account_id, row) for row in rows))
+            continue
+        pending.discard(account_id)
+        done += 1
+        try:
+            futures[account_id].result()
+        except Exception as e:
+            failed.append((account_id, e))
+            print(f"    [{done}/{len(futures)}] Conta {account_id}: ERRO {e}")
+            continue
+        print(f"    [{done}/{len(futures)}] Conta {account_id} consolidada")
+
+
+def run_organization(names, description, banner):
+    parser = build_parser(description, DEFAULT_MAX_WORKERS)
+    parser.add_argument('--role-name', default=DEFAULT_ROLE_NAME,
+                        help=f"role assumida em cada conta (padrão: {DEFAULT_ROLE_NAME})")
+    parser.add_argument('--accounts-file', help="arquivo com as contas (uma por linha); padrão: AWS Organizations")
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                        help="contas varridas em paralelo, um processo por conta (padrão: nº de CPUs)")
+    args, reports = select_reports(parser, names)
+    print(banner)
+    if args.dry_run:
+        print(f"    Contas: {args.accounts_file or 'AWS Organizations'} "
+              f"(role '{args.role_name}', {args.processes} processos)")
+    if quick_mode(args, *report_outputs(args, reports, prefix="Org_")):
+        return
+
+    accounts = read_accounts_file(args.accounts_file) if args.accounts_file else list_org_accounts()
+    print(f"    -> {len(accounts)} conta(s) para varrer com a role '{args.role_name}' ({args.processes} processos)")
+    if not accounts:
+        return
+
+    reports, outputs = report_outputs(args, reports, prefix="Org_")
+    # Tabelas que já têm a coluna 'Account' (banco do inventário) não a repetem
+    layouts = [{sheet: ['Account'] + [c for c in columns if c != 'Account']
+                for sheet, columns in report_layout(r).items()} for r in reports]
+    options = {'workers': args.workers, 'refresh': args.refresh, 'no_cache': args.no_cache, 'resume': args.resume,
+               'cache_dir': args.cache_dir, 'metrics_json': args.metrics_json,
+               'page_sizes': args.page_size, 'scope': args.scope, 'events': args.events}
+    failed = []
+
+    try:
+        with ExitStack() as stack:
+            sinks = {report.name: stack.enter_context(open_report_sink(report, args.format, path, layout))
+                     for report, path, layout in zip(reports, outputs, layouts)}
+            # 'spawn': cada processo começa limpo (sem clientes/locks herdados do pai)
+            context = multiprocessing.get_context('spawn')
+            processes = max(1, args.processes)
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=processes, mp_context=context))
+            # O Manager fecha antes do pool: num erro do pai, workers presos no put() da fila cheia
+            # falham em vez de travar a espera do pool
+            batches = stack.enter_context(context.Manager()).Queue(maxsize=BATCHES_PER_PROCESS * processes)
+            futures = {account_id: pool.submit(scan_account, account_id, args.role_name,
+                                               [r.name for r in reports], options, batches)
+                       for account_id, _ in accounts}
+            try:
+                # Lote a lote, na ordem de chegada; a falha de uma conta não derruba as demais
+                consolidate(futures, batches, sinks, failed)
+            except BaseException:
+                # Falha na gravação (ou Ctrl+C): contas que ainda não começaram não rodam mais
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+            print(f"\n--- Finalizando {args.format} ---")
+
+        if failed:
+            print(f"\n    [!] {len(failed)} conta(s) com falha:")
+            for account_id, e in failed:
+                print(f"        - {account_id}: {e}")
+        for path in outputs:
+            print(f"SUCESSO! Relatório consolidado salvo em: {path}")
+    except PermissionError:
+        print(f"[ERRO] Não foi possível salvar o arquivo. Feche o Excel ({', '.join(outputs)}) e tente novamente.")
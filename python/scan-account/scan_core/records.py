@@ -0,0 +1,267 @@
+"""
+Registros compactos das linhas dos relatórios.
+
+Cada linha é um objeto com __slots__ (sem o dict por instância e sem repetir as
+chaves 'Region', 'VPC ID'... em cada linha). Valores que se repetem muito
+(região, VPC, subnet, tipo de recurso...) passam por sys.intern, então milhares
+de linhas compartilham a mesma string. Os registros respondem a .get(coluna)
+como um dict, por isso os sinks (scan_core.sinks) os aceitam diretamente.
+"""
+import sys
+
+
+class Record:
+    __slots__ = ()
+    COLUMNS = {}    # cabeçalho da aba -> atributo
+    INTERNED = ()   # atributos com valores muito repetidos
+
+    def __init__(self, **values):
+        for attr in self.__slots__:
+            value = values.pop(attr, None)
+            if attr in self.INTERNED and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, attr, value)
+        if values:
+            raise TypeError(f"{type(self).__name__}: campos desconhecidos {sorted(values)}")
+
+    def get(self, column, default=None):
+        attr = self.COLUMNS.get(column)
+        return getattr(self, attr) if attr else default
+
+    def as_dict(self):
+        return {column: getattr(self, attr) for column, attr in self.COLUMNS.items()}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+
+class ServiceRow(Record):
+    """Recursos globais e serviços regionais ('Global Resources', 'Regional Services'...)."""
+    __slots__ = ('region', 'category', 'service', 'name', 'details')
+    COLUMNS = {'Region': 'region', 'Category': 'category', 'Service': 'service',
+               'Name/ID': 'name', 'Details': 'details'}
+    INTERNED = ('region', 'category', 'service')
+
+
+class VpcRow(Record):
+    """Uma ENI (ou VPC/subnet vazia) na hierarquia de rede ('VPC Hierarchy', 'VPC Network')."""
+    __slots__ = ('region', 'vpc_id', 'vpc_name', 'subnet_id', 'subnet_name', 'resource_type',
+                 'resource_id', 'private_ip', 'public_ip', 'details')
+    COLUMNS = {'Region': 'region', 'VPC ID': 'vpc_id', 'VPC Name': 'vpc_name', 'Subnet ID': 'subnet_id',
+               'Subnet Name': 'subnet_name', 'Resource Type': 'resource_type', 'Resource ID': 'resource_id',
+               'Private IP': 'private_ip', 'Public IP': 'public_ip', 'Details': 'details'}
+    INTERNED = ('region', 'vpc_id', 'vpc_name', 'subnet_id', 'subnet_name', 'resource_type', 'details')
+
+
+class SubnetRow(Record):
+    """Subnet classificada na auditoria de arquitetura ('VPC Network Architecture')."""
+    __slots__ = ('region', 'vpc_id', 'vpc_name', 'subnet_id', 'cidr_block', 'availability_zone', 'subnet_type',
+                 'route_table', 'default_route')
+    COLUMNS = {'Region': 'region', 'VPC ID': 'vpc_id', 'VPC Name': 'vpc_name', 'Subnet ID': 'subnet_id',
+               'CIDR Block': 'cidr_block', 'Availability Zone': 'availability_zone', 'Subnet Type': 'subnet_type',
+               'Route Table': 'route_table', 'Default Route': 'default_route'}
+    INTERNED = ('region', 'vpc_id', 'vpc_name', 'availability_zone', 'subnet_type', 'route_table', 'default_route')
+
+
+class ComputeRow(Record):
+    """Instância EC2 ('EC2 Inventory')."""
+    __slots__ = ('region', 'vpc_id', 'subnet_id', 'instance_id', 'instance_type', 'ebs_volumes')
+    COLUMNS = {'Region': 'region', 'VPC ID': 'vpc_id', 'Subnet ID': 'subnet_id',
+               'EC2 Instance ID': 'instance_id', 'Instance Type': 'instance_type', 'EBS Volumes': 'ebs_volumes'}
+    INTERNED = ('region', 'vpc_id', 'subnet_id', 'instance_type')
+
+
+class VolumeRow(Record):
+    """Volume EBS anexado a uma instância ('EBS Volumes')."""
+    __slots__ = ('region', 'vpc_id', 'subnet_id', 'instance_id', 'device', 'volume_id', 'size', 'volume_type',
+                 'iops', 'throughput', 'encrypted', 'state', 'delete_on_termination')
+    COLUMNS = {'Region': 'region', 'VPC ID': 'vpc_id', 'Subnet ID': 'subnet_id', 'EC2 Instance ID': 'instance_id',
+               'Device Name': 'device', 'Volume ID': 'volume_id', 'Size (GiB)': 'size', 'Volume Type': 'volume_type',
+               'IOPS': 'iops', 'Throughput (MiB/s)': 'throughput', 'Encrypted': 'encrypted', 'State': 'state',
+               'Delete On Termination': 'delete_on_termination'}
+    INTERNED = ('region', 'vpc_id', 'subnet_id', 'device', 'volume_type', 'state')
+
+
+class LambdaRow(Record):
+    """Função Lambda ligada a uma subnet ('Lambda Inventory')."""
+    __slots__ = ('region', 'vpc_id', 'subnet_id', 'function_name', 'function_arn')
+    COLUMNS = {'Region': 'region', 'VPC ID': 'vpc_id', 'Subnet ID': 'subnet_id',
+               'Lambda Function Name': 'function_name', 'Lambda Function ARN': 'function_arn'}
+    INTERNED = ('region', 'vpc_id', 'subnet_id')
+
+
+class RouteNodeRow(Record):
+    """Nó do grafo de roteamento: subnet, route table, IGW, NAT, TGW, peering... ('Nodes')."""
+    __slots__ = ('region', 'node_id', 'node_type', 'vpc_id', 'label')
+    COLUMNS = {'Region': 'region', 'Node ID': 'node_id', 'Node Type': 'node_type', 'VPC ID': 'vpc_id',
+               'Label': 'label'}
+    INTERNED = ('region', 'node_type', 'vpc_id')
+
+
+class RouteEdgeRow(Record):
+    """Aresta do grafo de roteamento: associação subnet -> route table ou rota -> alvo ('Edges')."""
+    __slots__ = ('region', 'source', 'target', 'relation', 'destination', 'state')
+    COLUMNS = {'Region': 'region', 'Source': 'source', 'Target': 'target', 'Relation': 'relation',
+               'Destination': 'destination', 'State': 'state'}
+    INTERNED = ('region', 'relation', 'state')
+
+
+class MetricRow(Record):
+    """Estatísticas de uma operação de API numa região ('Scan Metrics')."""
+    __slots__ = ('region', 'service', 'operation', 'calls', 'attempts', 'errors', 'retries', 'throttles',
+                 'total_seconds', 'avg_ms', 'p95_ms', 'max_ms', 'bytes_received', 'histogram')
+    COLUMNS = {'Region': 'region', 'Service': 'service', 'Operation': 'operation', 'Calls': 'calls',
+               'HTTP Attempts': 'attempts', 'Errors': 'errors', 'Retries': 'retries', 'Throttles': 'throttles',
+               'Total Seconds': 'total_seconds', 'Avg ms': 'avg_ms', 'P95 ms': 'p95_ms', 'Max ms': 'max_ms',
+               'Bytes Received': 'bytes_received', 'Latency Histogram': 'histogram'}
+    INTERNED = ('region', 'service', 'operation')
+
+
+class S3BucketRow(Record):
+    """Bucket S3 com o veredito de exposição pública ('S3 Buckets')."""
+    __slots__ = ('name', 'region', 'created', 'public_access_block', 'policy_public', 'encryption', 'versioning',
+                 'exposure', 'errors')
+    COLUMNS = {'Bucket Name': 'name', 'Bucket Region': 'region', 'Creation Date': 'created',
+               'Public Access Block': 'public_access_block', 'Policy Public': 'policy_public',
+               'Encryption': 'encryption', 'Versioning': 'versioning', 'Exposure': 'exposure', 'Errors': 'errors'}
+    INTERNED = ('region', 'public_access_block', 'policy_public', 'encryption', 'versioning', 'exposure')
+
+
+# --- IAM em lote (relatório de credenciais + GetAccountAuthorizationDetails) ---
+class IamUserRow(Record):
+    """Usuário IAM com as credenciais do relatório de credenciais ('IAM Users')."""
+    __slots__ = ('name', 'arn', 'created', 'password_enabled', 'password_last_used', 'mfa_active',
+                 'key1_active', 'key1_last_rotated', 'key1_last_used', 'key2_active', 'key2_last_rotated',
+                 'key2_last_used', 'groups', 'attached_policies', 'inline_policies')
+    COLUMNS = {'User Name': 'name', 'ARN': 'arn', 'Created': 'created', 'Password Enabled': 'password_enabled',
+               'Password Last Used': 'password_last_used', 'MFA Active': 'mfa_active',
+               'Access Key 1 Active': 'key1_active', 'Access Key 1 Last Rotated': 'key1_last_rotated',
+               'Access Key 1 Last Used': 'key1_last_used', 'Access Key 2 Active': 'key2_active',
+               'Access Key 2 Last Rotated': 'key2_last_rotated', 'Access Key 2 Last Used': 'key2_last_used',
+               'Groups': 'groups', 'Attached Policies': 'attached_policies', 'Inline Policies': 'inline_policies'}
+    INTERNED = ('password_enabled', 'mfa_active', 'key1_active', 'key2_active')
+
+
+class IamRoleRow(Record):
+    """Role IAM ('IAM Roles')."""
+    __slots__ = ('name', 'arn', 'created', 'trusted_entities', 'last_used', 'attached_policies', 'inline_policies',
+                 'permissions_boundary')
+    COLUMNS = {'Role Name': 'name', 'ARN': 'arn', 'Created': 'created', 'Trusted Entities': 'trusted_entities',
+               'Last Used': 'last_used', 'Attached Policies': 'attached_policies',
+               'Inline Policies': 'inline_policies', 'Permissions Boundary': 'permissions_boundary'}
+
+
+class IamGroupRow(Record):
+    """Grupo IAM ('IAM Groups')."""
+    __slots__ = ('name', 'arn', 'created', 'members', 'attached_policies', 'inline_policies')
+    COLUMNS = {'Group Name': 'name', 'ARN': 'arn', 'Created': 'created', 'Members': 'members',
+               'Attached Policies': 'attached_policies', 'Inline Policies': 'inline_policies'}
+
+
+class IamPolicyRow(Record):
+    """Policy gerenciada pelo cliente ('IAM Policies')."""
+    __slots__ = ('name', 'arn', 'created', 'updated', 'default_version', 'attachments', 'boundary_usage',
+                 'attachable')
+    COLUMNS = {'Policy Name': 'name', 'ARN': 'arn', 'Created': 'created', 'Updated': 'updated',
+               'Default Version': 'default_version', 'Attachments': 'attachments',
+               'Boundary Usage': 'boundary_usage', 'Attachable': 'attachable'}
+
+
+# --- Banco de inventário (scan_core.inventory_db) ---
+class SubnetRangeRow(Record):
+    """Subnet com o intervalo do CIDR em inteiros (consultas de 'qual subnet contém este IP')."""
+    __slots__ = ('account', 'region', 'vpc_id', 'subnet_id', 'subnet_name', 'cidr_block',
+                 'range_start', 'range_end', 'availability_zone')
+    COLUMNS = {'Account': 'account', 'Region': 'region', 'VPC ID': 'vpc_id', 'Subnet ID': 'subnet_id',
+               'Subnet Name': 'subnet_name', 'CIDR Block': 'cidr_block', 'Range Start': 'range_start',
+               'Range End': 'range_end', 'Availability Zone': 'availability_zone'}
+    INTERNED = ('account', 'region', 'vpc_id', 'availability_zone')
+
+
+class InterfaceRow(Record):
+    """Uma ENI e o recurso dono dela."""
+    __slots__ = ('account', 'region', 'vpc_id', 'subnet_id', 'eni_id', 'resource_type', 'resource_id',
+                 'interface_type', 'status', 'description')
+    COLUMNS = {'Account': 'account', 'Region': 'region', 'VPC ID': 'vpc_id', 'Subnet ID': 'subnet_id',
+               'ENI ID': 'eni_id', 'Resource Type': 'resource_type', 'Resource ID': 'resource_id',
+               'Interface Type': 'interface_type', 'Status': 'status', 'Description': 'description'}
+    INTERNED = ('account', 'region', 'vpc_id', 'subnet_id', 'resource_type', 'interface_type', 'status')
+
+
+class IpRow(Record):
+    """Um endereço IP de uma ENI (um por linha, em vez da lista separada por vírgulas)."""
+    __slots__ = ('account', 'region', 'ip', 'ip_int', 'version', 'scope', 'eni_id', 'resource_id', 'subnet_id')
+    COLUMNS = {'Account': 'account', 'Region': 'region', 'IP': 'ip', 'IP Int': 'ip_int', 'Version': 'version',
+               'Scope': 'scope', 'ENI ID': 'eni_id', 'Resource ID': 'resource_id', 'Subnet ID': 'subnet_id'}
+    INTERNED = ('account', 'region', 'scope', 'subnet_id')
+
+
+class TagRow(Record):
+    """Uma tag (chave/valor) de VPC, subnet, ENI ou instância."""
+    __slots__ = ('account', 'region', 'resource_id', 'key', 'value')
+    COLUMNS = {'Account': 'account', 'Region': 'region', 'Resource ID': 'resource_id', 'Key': 'key',
+               'Value': 'value'}
+    INTERNED = ('account', 'region', 'key')
+
+
+# --- Diferenças entre duas varreduras (scan_core.diff) ---
+class ChangeRow(Record):
+    """Linha adicionada, removida ou alterada entre duas execuções ('Changes')."""
+    __slots__ = ('change', 'sheet', 'key', 'changed_columns', 'old_values', 'new_values')
+    COLUMNS = {'Change': 'change', 'Sheet': 'sheet', 'Key': 'key', 'Changed Columns': 'changed_columns',
+               'Old Values': 'old_values', 'New Values': 'new_values'}
+    INTERNED = ('change', 'sheet')
+
+
+class ChangeSummaryRow(Record):
+    """Totais por aba da comparação ('Summary')."""
+    __slots__ = ('sheet', 'added', 'removed', 'changed', 'unchanged', 'columns')
+    COLUMNS = {'Sheet': 'sheet', 'Added': 'added', 'Removed': 'removed', 'Changed': 'changed',
+               'Unchanged': 'unchanged', 'Column Changes': 'columns'}
+
+
+def to_frame(records, columns):
+    """
+    Monta um DataFrame coluna a coluna direto dos registros (sem lista de dicts).
+    Colunas de valores repetidos viram 'category' no pandas.
+    """
+    import pandas as pd
+
+    records = list(records)
+    interned = set()
+    for record in records[:1]:
+        interned = {c for c in columns if record.COLUMNS.get(c) in record.INTERNED}
+    data = {}
+    for column in columns:
+        values = [record.get(column) for record in records]
+        data[column] = pd.Categorical(values) if column in interned else values
+    return pd.DataFrame(data, columns=columns)
+
+
+class FrameRows:
+    """
+    O inverso de to_frame: linhas de um DataFrame (colunas = cabeçalhos da aba)
+    no lugar de uma lista de registros. Os sinks leem coluna a coluna
+    (iter_values); quem itera recebe um dict por linha. NaN vira None.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _values(self, column):
+        if column not in self.frame:
+            return [None] * len(self.frame)
+        series = self.frame[column].astype(object)
+        return series.where(series.notna(), None).tolist()
+
+    def iter_values(self, columns):
+        """[valor de cada coluna] por linha, na ordem de `columns`."""
+        return map(list, zip(*[self._values(c) for c in columns]))
+
+    def __iter__(self):
+        columns = list(self.frame.columns)
+        for values in self.iter_values(columns):
+            yield dict(zip(columns, values))
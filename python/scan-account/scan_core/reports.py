@@ -0,0 +1,572 @@
+"""
+Relatórios como projeções sobre os dados brutos coletados (scan_core.collectors).
+
+Cada relatório declara o arquivo padrão, o layout das abas e uma função que
+recebe o Dataset de uma região e devolve {aba: [linhas]}. Nenhuma projeção
+chama a API diretamente. `sink` fixa a saída do relatório (ex.: o banco SQLite
+do inventário), independente de --format. `global_project` faz o mesmo sobre o
+Dataset global (abas que não dependem de região, ex.: 'S3 Buckets').
+"""
+from collections import namedtuple
+
+from botocore.exceptions import ClientError
+
+from .cache import get_cache
+from .collectors import BUCKET_WORKERS
+from .indexes import build_eni_index, build_instance_index, build_lambda_index, group_by
+from .inventory_db import DB_TABLES, DEFAULT_DB_FILE, InventoryDbSink, cidr_range, ip_to_int
+from .normalize import INSTANCE, managed_type, network_frame, use_frames
+from .records import (ComputeRow, FrameRows, IamGroupRow, IamPolicyRow, IamRoleRow, IamUserRow, InterfaceRow, IpRow, LambdaRow, RouteEdgeRow, RouteNodeRow, ServiceRow,
+                      S3BucketRow, SubnetRangeRow, SubnetRow, TagRow, VolumeRow, VpcRow)
+from .routing import RoutingGraph, RoutingGraphSink
+
+SERVICE_COLUMNS = ['Region', 'Category', 'Service', 'Name/ID', 'Details']
+
+Report = namedtuple('Report', ['name', 'output_file', 'global_sheet', 'sheets', 'project', 'sink',
+                               'global_project'], defaults=[None, None])
+
+
+def get_tag_value(tags, key):
+    if not tags: return None
+    for tag in tags:
+        if tag['Key'] == key: return tag['Value']
+    return None
+
+
+# --- GLOBAIS (Executa 1 vez, compartilhado por todos os relatórios) ---
+def scan_global_resources(dataset):
+    print("\n--- [1/3] Varrendo Recursos GLOBAIS (IAM, S3, CloudFront, Route53) ---")
+    data = []
+
+    def add(cat, svc, name, loc, det):
+        data.append(ServiceRow(region=loc, category=cat, service=svc, name=name, details=det))
+
+    # IAM
+    try:
+        for user in dataset['iam.users']:
+            add('Security', 'IAM User', user['UserName'], 'Global', f"ID: {user['UserId']}")
+    except Exception as e: print(f"   [Erro IAM]: {e}")
+
+    # S3
+    try:
+        for bucket in dataset['s3.buckets']:
+            add('Storage', 'S3 Bucket', bucket['Name'], 'Global', f"Created: {bucket['CreationDate']}")
+    except Exception as e: print(f"   [Erro S3]: {e}")
+
+    # CloudFront
+    try:
+        for item in dataset['cloudfront.distributions']:
+            add('CDN', 'CloudFront', item['Id'], 'Global', f"Domain: {item['DomainName']}")
+    except Exception as e: print(f"   [Erro CloudFront]: {e}")
+
+    # Route53
+    try:
+        for zone in dataset['route53.hosted_zones']:
+            add('DNS', 'Hosted Zone', zone['Name'], 'Global', f"Private: {zone['Config']['PrivateZone']}")
+    except Exception as e: print(f"   [Erro Route53]: {e}")
+
+    return data
+
+
+# --- S3: detalhes e exposição pública por bucket ---
+PUBLIC_ACCESS_BLOCK = ('BlockPublicAcls', 'IgnorePublicAcls', 'BlockPublicPolicy', 'RestrictPublicBuckets')
+
+
+def s3_exposure(detail):
+    """
+    Veredito de exposição: a regra do bash/aws/bucket/check-public-bucket.sh
+    (sem Public Access Block, ou com as quatro opções em false) mais o policy status.
+    """
+    errors = detail.get('Errors') or {}
+    block = detail.get('PublicAccessBlock')
+    if detail.get('PolicyIsPublic') and not (block or {}).get('RestrictPublicBuckets'):
+        return 'Public (policy)'  # RestrictPublicBuckets anula o acesso público pela policy
+    if 'PublicAccessBlock' in errors:
+        return f"Unknown ({errors['PublicAccessBlock']})"
+    if not block or not any(block.get(k) for k in PUBLIC_ACCESS_BLOCK):
+        return 'Potentially public'
+    if all(block.get(k) for k in PUBLIC_ACCESS_BLOCK):
+        return 'Blocked'
+    return 'Partially blocked'
+
+
+def _bucket_field(detail, field, show):
+    if field in (detail.get('Errors') or {}):
+        return detail['Errors'][field]
+    return show(detail.get(field))
+
+
+def s3_bucket_rows(dataset):
+    print(f"\n--- Detalhando buckets S3 (até {BUCKET_WORKERS} em paralelo) ---")
+    rows = []
+    try:
+        for detail in dataset['s3.bucket_details']:
+            rows.append(S3BucketRow(
+                name=detail['Name'], region=detail.get('Region') or '-', created=str(detail.get('CreationDate')),
+                public_access_block=_bucket_field(detail, 'PublicAccessBlock', lambda block: (
+                    'None' if not block else 'All' if all(block.get(k) for k in PUBLIC_ACCESS_BLOCK)
+                    else ', '.join(k for k in PUBLIC_ACCESS_BLOCK if block.get(k)) or 'All false')),
+                policy_public=_bucket_field(detail, 'PolicyIsPublic', lambda public: (
+                    'No policy' if public is None else str(public))),
+                encryption=_bucket_field(detail, 'Encryption', lambda algorithm: algorithm or 'None'),
+                versioning=_bucket_field(detail, 'Versioning', lambda status: status or '-'),
+                exposure=s3_exposure(detail),
+                errors=', '.join(f"{field}: {code}" for field, code in detail['Errors'].items()) or '-'
+            ))
+    except Exception as e: print(f"   [Erro S3]: {e}")
+    return {'S3 Buckets': rows}
+
+
+# --- IAM: usuários, roles, grupos e policies a partir de duas listagens em lote ---
+def _names(items, key):
+    return ', '.join(item[key] for item in items or []) or '-'
+
+
+def _credential(value):
+    """Campo do relatório de credenciais ('N/A', 'no_information'... viram '-')."""
+    return '-' if value in (None, '', 'N/A', 'not_supported', 'no_information') else value
+
+
+def trusted_entities(document):
+    """Principals da trust policy de uma role (serviços, contas, provedores federados)."""
+    principals = set()
+    for statement in (document or {}).get('Statement', []):
+        principal = statement.get('Principal', {})
+        for values in ([principal] if isinstance(principal, str) else principal.values()):
+            principals.update([values] if isinstance(values, str) else values)
+    return ', '.join(sorted(principals)) or '-'
+
+
+def iam_rows(dataset):
+    print("\n--- Varrendo IAM em lote (relatório de credenciais + GetAccountAuthorizationDetails) ---")
+    details = {'User': [], 'Group': [], 'Role': [], 'Policy': []}
+    try:
+        for item in dataset['iam.authorization_details']:
+            details[item['Type']].append(item)
+    except Exception as e: print(f"   [Erro IAM]: {e}")
+    credentials = {}
+    try:
+        credentials = {row['user']: row for row in dataset['iam.credential_report']}
+    except Exception as e: print(f"   [Erro Relatório de Credenciais]: {e}")
+
+    # Usuários: os do relatório (inclui <root_account>) e os criados depois dele
+    users = {user['UserName']: user for user in details['User']}
+    members = {}
+    user_rows = []
+    for name in list(credentials) + [name for name in users if name not in credentials]:
+        cred, user = credentials.get(name, {}), users.get(name, {})
+        for group in user.get('GroupList', []):
+            members[group] = members.get(group, 0) + 1
+        user_rows.append(IamUserRow(
+            name=name, arn=cred.get('arn') or user.get('Arn'),
+            created=_credential(cred.get('user_creation_time') or str(user.get('CreateDate', ''))),
+            password_enabled=_credential(cred.get('password_enabled')),
+            password_last_used=_credential(cred.get('password_last_used')),
+            mfa_active=_credential(cred.get('mfa_active')),
+            key1_active=_credential(cred.get('access_key_1_active')),
+            key1_last_rotated=_credential(cred.get('access_key_1_last_rotated')),
+            key1_last_used=_credential(cred.get('access_key_1_last_used_date')),
+            key2_active=_credential(cred.get('access_key_2_active')),
+            key2_last_rotated=_credential(cred.get('access_key_2_last_rotated')),
+            key2_last_used=_credential(cred.get('access_key_2_last_used_date')),
+            groups=', '.join(user.get('GroupList', [])) or '-',
+            attached_policies=_names(user.get('AttachedManagedPolicies'), 'PolicyName'),
+            inline_policies=_names(user.get('UserPolicyList'), 'PolicyName')
+        ))
+
+    role_rows = []
+    for role in details['Role']:
+        last_used = role.get('RoleLastUsed') or {}
+        role_rows.append(IamRoleRow(
+            name=role['RoleName'], arn=role['Arn'], created=str(role.get('CreateDate')),
+            trusted_entities=trusted_entities(role.get('AssumeRolePolicyDocument')),
+            last_used=f"{last_used['LastUsedDate']} ({last_used.get('Region', '-')})"
+            if last_used.get('LastUsedDate') else '-',
+            attached_policies=_names(role.get('AttachedManagedPolicies'), 'PolicyName'),
+            inline_policies=_names(role.get('RolePolicyList'), 'PolicyName'),
+            permissions_boundary=(role.get('PermissionsBoundary') or {}).get('PermissionsBoundaryArn', '-')
+        ))
+
+    group_rows = [IamGroupRow(
+        name=group['GroupName'], arn=group['Arn'], created=str(group.get('CreateDate')),
+        members=members.get(group['GroupName'], 0),
+        attached_policies=_names(group.get('AttachedManagedPolicies'), 'PolicyName'),
+        inline_policies=_names(group.get('GroupPolicyList'), 'PolicyName')
+    ) for group in details['Group']]
+
+    policy_rows = [IamPolicyRow(
+        name=policy.get('PolicyName') or policy['Arn'].rsplit('/', 1)[-1], arn=policy['Arn'], created=str(policy.get('CreateDate')),
+        updated=str(policy.get('UpdateDate')), default_version=policy.get('DefaultVersionId', '-'),
+        attachments=policy.get('AttachmentCount', 0), boundary_usage=policy.get('PermissionsBoundaryUsageCount', 0),
+        attachable=policy.get('IsAttachable', '-')
+    ) for policy in details['Policy']]
+
+    return {'IAM Users': user_rows, 'IAM Roles': role_rows, 'IAM Groups': group_rows, 'IAM Policies': policy_rows}
+
+
+# --- REDE: hierarquia VPC -> Subnet -> ENI (inventário e relatório de IPs) ---
+def classify_eni(eni):
+    """Identifica o recurso dono da ENI: (tipo, id). InterfaceType e RequesterId antes da descrição."""
+    if eni.get('Attachment') and eni['Attachment'].get('InstanceId'):
+        return INSTANCE, eni['Attachment']['InstanceId']
+    res_type = managed_type(eni.get('InterfaceType'), eni.get('RequesterId'), eni.get('Description', '').lower())
+    return res_type, eni['NetworkInterfaceId']
+
+
+def eni_ips(eni):
+    """IPs privados e públicos da ENI, separados por vírgula ('-' se não houver público)."""
+    private_ips_list = []
+    public_ips_list = []
+    for ip_info in eni.get('PrivateIpAddresses', []):
+        private_ips_list.append(ip_info.get('PrivateIpAddress'))
+        # IP Público só existe se houver Associação
+        if 'Association' in ip_info and 'PublicIp' in ip_info['Association']:
+            public_ips_list.append(ip_info['Association']['PublicIp'])
+    return ", ".join(private_ips_list), (", ".join(public_ips_list) if public_ips_list else "-")
+
+
+def vpc_hierarchy_rows(dataset, with_ips=False):
+    """Linhas da hierarquia de rede da região, a partir dos índices em lote."""
+    region = dataset.region
+    vpc_data = []
+    # Linhas de VPC/Subnet vazias levam '-' nas colunas de IP
+    empty_ips = {'private_ip': '-', 'public_ip': '-'} if with_ips else {}
+    try:
+        # Muitas ENIs: normalização vetorizada (scan_core.normalize), mesmas linhas
+        all_enis = dataset['ec2.network_interfaces']
+        if use_frames(all_enis):
+            vpcs = [(vpc['VpcId'], get_tag_value(vpc.get('Tags'), 'Name') or vpc['VpcId'])
+                    for vpc in dataset['ec2.vpcs']]
+            subnets = [(subnet['VpcId'], subnet['SubnetId'],
+                        get_tag_value(subnet.get('Tags'), 'Name') or subnet['SubnetId'])
+                       for subnet in dataset['ec2.subnets']]
+            return FrameRows(network_frame(region, vpcs, subnets, all_enis, with_ips))
+
+        # ENIs e subnets da região inteira em lote, indexadas por subnet/VPC
+        eni_index = build_eni_index(all_enis)
+        subnet_index = group_by(dataset['ec2.subnets'], 'VpcId')
+
+        for vpc in dataset['ec2.vpcs']:
+            vpc_id = vpc['VpcId']
+            vpc_name = get_tag_value(vpc.get('Tags'), 'Name') or vpc_id
+            subnets = subnet_index.get(vpc_id, [])
+
+            if not subnets:
+                vpc_data.append(VpcRow(region=region, vpc_id=vpc_id, vpc_name=vpc_name, resource_type='Empty VPC',
+                                       details='Sem Subnets', **empty_ips))
+                continue
+
+            for subnet in subnets:
+                subnet_id = subnet['SubnetId']
+                subnet_name = get_tag_value(subnet.get('Tags'), 'Name') or subnet_id
+                enis = eni_index.get(subnet_id, [])
+
+                if not enis:
+                    vpc_data.append(VpcRow(region=region, vpc_id=vpc_id, vpc_name=vpc_name,
+                                           subnet_id=subnet_id, subnet_name=subnet_name,
+                                           resource_type='Empty Subnet', details='-', **empty_ips))
+                    continue
+
+                for eni in enis:
+                    res_type, res_id = classify_eni(eni)
+                    ips = dict(zip(('private_ip', 'public_ip'), eni_ips(eni))) if with_ips else {}
+                    vpc_data.append(VpcRow(
+                        region=region,
+                        vpc_id=vpc_id, vpc_name=vpc_name,
+                        subnet_id=subnet_id, subnet_name=subnet_name,
+                        resource_type=res_type, resource_id=res_id,
+                        details=eni.get('Description', '').lower(), **ips
+                    ))
+    except ClientError as e: print(f"      [Erro VPC {region}]: {e}")
+    return vpc_data
+
+
+def regional_service_rows(dataset, services):
+    """Outros serviços regionais (fora da VPC ou complementares)."""
+    region = dataset.region
+    service_data = []
+
+    def add(cat, svc, name, det):
+        service_data.append(ServiceRow(region=region, category=cat, service=svc, name=name, details=det))
+
+    if 'lambda' in services:
+        try:
+            for func in dataset['lambda.functions']:
+                add('Compute', 'Lambda', func['FunctionName'], func['Runtime'])
+        except Exception as e: print(f"      [Erro Lambda {region}]: {e}")
+
+    if 'dynamodb' in services:
+        try:
+            for table in dataset['dynamodb.tables']:
+                add('Database', 'DynamoDB', table, 'Table')
+        except Exception as e: print(f"      [Erro DynamoDB {region}]: {e}")
+
+    if 'eks' in services:
+        try:
+            for cluster in dataset['eks.clusters']:
+                add('Compute', 'EKS Cluster', cluster, 'K8s Cluster')
+        except Exception as e: print(f"      [Erro EKS {region}]: {e}")
+
+    # RDS (Instâncias para pegar detalhes extras que a ENI não dá)
+    if 'rds' in services:
+        try:
+            for db in dataset['rds.db_instances']:
+                add('Database', 'RDS Instance', db['DBInstanceIdentifier'], db['Engine'])
+        except Exception as e: print(f"      [Erro RDS {region}]: {e}")
+
+    return service_data
+
+
+def inventory_rows(dataset):
+    return {
+        'VPC Hierarchy': vpc_hierarchy_rows(dataset),
+        'Regional Services': regional_service_rows(dataset, ('lambda', 'dynamodb', 'eks', 'rds')),
+    }
+
+
+def ip_rows(dataset):
+    return {
+        'VPC Network': vpc_hierarchy_rows(dataset, with_ips=True),
+        'Services': regional_service_rows(dataset, ('lambda', 'dynamodb')),
+    }
+
+
+# --- ARQUITETURA: subnets classificadas, EC2 e Lambdas por subnet ---
+def optional_items(dataset, key, label):
+    """Itens de um coletor complementar: na falha (ex.: sem permissão), segue sem eles."""
+    try:
+        return dataset[key]
+    except ClientError as e:
+        print(f"      [Erro {label} {dataset.region}]: {e}")
+        return []
+
+
+def routing_graph(dataset):
+    """Grafo de roteamento da região, montado uma vez e compartilhado pelos relatórios."""
+    return dataset.derived('routing', lambda ds: RoutingGraph(
+        ds.region, ds['ec2.route_tables'], optional_items(ds, 'ec2.nat_gateways', 'NAT'),
+        optional_items(ds, 'ec2.transit_gateway_attachments', 'TGW')))
+
+
+def volume_map(dataset):
+    """{VolumeId: volume} da região (DescribeVolumes em lote sobre os IDs das instâncias), uma vez por região."""
+    return dataset.derived('volumes', lambda ds: {
+        v['VolumeId']: v for v in optional_items(ds, 'ec2.volumes', 'EBS')})
+
+
+def volume_rows(region_name, vpc_id, snet_id, ec2, volumes):
+    """Uma linha por volume EBS da instância, com os detalhes do mapa da região ('-' se não veio)."""
+    rows = []
+    for mapping in ec2.get('BlockDeviceMappings', []):
+        if 'Ebs' not in mapping:
+            continue
+        volume = volumes.get(mapping['Ebs']['VolumeId'], {})
+        rows.append(VolumeRow(
+            region=region_name, vpc_id=vpc_id, subnet_id=snet_id, instance_id=ec2['InstanceId'],
+            device=mapping.get('DeviceName', '-'), volume_id=mapping['Ebs']['VolumeId'],
+            size=volume.get('Size', '-'), volume_type=volume.get('VolumeType', '-'),
+            iops=volume.get('Iops', '-'), throughput=volume.get('Throughput', '-'),
+            encrypted=volume.get('Encrypted', '-'), state=volume.get('State', '-'),
+            delete_on_termination=mapping['Ebs'].get('DeleteOnTermination', '-')
+        ))
+    return rows
+
+
+def prefetch_region(dataset, region_lambdas):
+    """
+    Índices da região usados pela análise por VPC. Cada um vem de uma única
+    chamada paginada (ou do cache local), então o custo por região é constante.
+    """
+    return {
+        'subnets': group_by(dataset['ec2.subnets'], 'VpcId'),
+        'routing': routing_graph(dataset),
+        'instances': build_instance_index(dataset['ec2.instances']),
+        'volumes': volume_map(dataset),
+        'lambdas': build_lambda_index(region_lambdas),
+    }
+
+
+def analyze_vpc_architecture(region_name, vpc, prefetched):
+    """
+    Analisa a arquitetura de rede de uma VPC especifica.
+    Lê apenas dos índices de prefetch_region (nenhuma chamada de API aqui).
+    """
+    vpc_id = vpc['VpcId']
+    vpc_name = get_tag_value(vpc.get('Tags'), 'Name') or vpc_id
+
+    architecture_details = []
+    compute_details = []
+    volume_details = []
+    lambda_details = []
+
+    # 1. Iterar sobre as sub-redes
+    for snet in prefetched['subnets'].get(vpc_id, []):
+        snet_id = snet['SubnetId']
+        # Public / Private (NAT) / Private / Isolated pela route table efetiva (explícita ou a principal)
+        snet_type, route_table, default_route = prefetched['routing'].classify(snet)
+
+        architecture_details.append(SubnetRow(
+            region=region_name, vpc_id=vpc_id, vpc_name=vpc_name, subnet_id=snet_id,
+            cidr_block=snet.get('CidrBlock'), availability_zone=snet['AvailabilityZone'], subnet_type=snet_type,
+            route_table=route_table, default_route=default_route
+        ))
+
+        # 2. EC2s na sub-rede (índice do DescribeInstances em lote)
+        for ec2 in prefetched['instances'].get(snet_id, []):
+            ebs_volumes = [m['Ebs']['VolumeId'] for m in ec2.get('BlockDeviceMappings', []) if 'Ebs' in m]
+            compute_details.append(ComputeRow(
+                region=region_name, vpc_id=vpc_id, subnet_id=snet_id,
+                instance_id=ec2['InstanceId'], instance_type=ec2['InstanceType'],
+                ebs_volumes=", ".join(ebs_volumes) if ebs_volumes else "-"
+            ))
+            volume_details.extend(volume_rows(region_name, vpc_id, snet_id, ec2, prefetched['volumes']))
+
+        # 3. Lambdas associadas a ESTA Subnet especifica (índice subnet -> Lambdas)
+        for function in prefetched['lambdas'].get(snet_id, []):
+            lambda_details.append(LambdaRow(
+                region=region_name, vpc_id=vpc_id, subnet_id=snet_id,
+                function_name=function['FunctionName'], function_arn=function['FunctionArn']
+            ))
+
+    return architecture_details, compute_details, volume_details, lambda_details
+
+
+def architecture_rows(dataset):
+    region = dataset.region
+    vpc_data, comp_data, vol_data, lmb_data = [], [], [], []
+
+    # Lambdas UMA vez por região
+    region_lambdas = []
+    try:
+        region_lambdas = dataset['lambda.functions']
+    except ClientError:
+        print(f"      [!] Erro ao listar Lambdas na região {region}. Pulando...")
+
+    try:
+        prefetched = prefetch_region(dataset, region_lambdas)
+        for vpc in dataset['ec2.vpcs']:
+            v, c, e, l = analyze_vpc_architecture(region, vpc, prefetched)
+            vpc_data.extend(v)
+            comp_data.extend(c)
+            vol_data.extend(e)
+            lmb_data.extend(l)
+    except ClientError as e:
+        print(f"      [!] Erro ao acessar VPCs: {e}")
+
+    return {'VPC Network Architecture': vpc_data, 'EC2 Inventory': comp_data, 'EBS Volumes': vol_data,
+            'Lambda Inventory': lmb_data}
+
+
+# --- BANCO DE INVENTÁRIO: ENIs, IPs (um por linha), faixas de CIDR e tags ---
+def database_rows(dataset):
+    region = dataset.region
+    account = get_cache().account
+    subnets, interfaces, ips, tags = [], [], [], []
+
+    def add_tags(resource_id, resource_tags):
+        for tag in resource_tags or []:
+            tags.append(TagRow(account=account, region=region, resource_id=resource_id,
+                               key=tag['Key'], value=tag['Value']))
+
+    try:
+        for vpc in dataset['ec2.vpcs']:
+            add_tags(vpc['VpcId'], vpc.get('Tags'))
+
+        for subnet in dataset['ec2.subnets']:
+            add_tags(subnet['SubnetId'], subnet.get('Tags'))
+            # Subnets só IPv6 ficam fora da tabela de faixas (indexada só para IPv4)
+            if not subnet.get('CidrBlock'):
+                continue
+            start, end = cidr_range(subnet['CidrBlock'])
+            subnets.append(SubnetRangeRow(
+                account=account, region=region, vpc_id=subnet['VpcId'], subnet_id=subnet['SubnetId'],
+                subnet_name=get_tag_value(subnet.get('Tags'), 'Name') or subnet['SubnetId'],
+                cidr_block=subnet['CidrBlock'], range_start=start, range_end=end,
+                availability_zone=subnet['AvailabilityZone']))
+
+        for eni in dataset['ec2.network_interfaces']:
+            eni_id = eni['NetworkInterfaceId']
+            res_type, res_id = classify_eni(eni)
+            interfaces.append(InterfaceRow(
+                account=account, region=region, vpc_id=eni.get('VpcId'), subnet_id=eni.get('SubnetId'),
+                eni_id=eni_id, resource_type=res_type, resource_id=res_id,
+                interface_type=eni.get('InterfaceType'), status=eni.get('Status'),
+                description=eni.get('Description', '')))
+            add_tags(eni_id, eni.get('TagSet'))
+
+            def add_ip(ip, scope):
+                ips.append(IpRow(account=account, region=region, ip=ip, ip_int=ip_to_int(ip),
+                                 version=4 if ':' not in ip else 6, scope=scope, eni_id=eni_id,
+                                 resource_id=res_id, subnet_id=eni.get('SubnetId')))
+
+            for ip_info in eni.get('PrivateIpAddresses', []):
+                add_ip(ip_info['PrivateIpAddress'], 'private')
+                if 'Association' in ip_info and 'PublicIp' in ip_info['Association']:
+                    add_ip(ip_info['Association']['PublicIp'], 'public')
+            for ip_info in eni.get('Ipv6Addresses', []):
+                add_ip(ip_info['Ipv6Address'], 'ipv6')
+    except ClientError as e: print(f"      [Erro Banco {region}]: {e}")
+
+    try:
+        for instance in dataset['ec2.instances']:
+            add_tags(instance['InstanceId'], instance.get('Tags'))
+    except ClientError as e: print(f"      [Erro Tags EC2 {region}]: {e}")
+
+    return {'Subnets': subnets, 'Network Interfaces': interfaces, 'IP Addresses': ips, 'Tags': tags}
+
+
+# --- GRAFO DE ROTEAMENTO (--routing-graph) ---
+def routing_rows(dataset):
+    try:
+        graph = routing_graph(dataset)
+        subnets = dataset['ec2.subnets']
+        return {'Nodes': graph.nodes(subnets), 'Edges': graph.edges(subnets)}
+    except ClientError as e:
+        print(f"      [Erro Rotas {dataset.region}]: {e}")
+        return {'Nodes': [], 'Edges': []}
+
+
+# --- DEFINIÇÃO DOS RELATÓRIOS ---
+REPORTS = {
+    # Inventário multi-região (Infraestructure_scan_aws_account.py)
+    'inventory': Report('inventory', "Relatorio_AWS_MultiRegion.xlsx", 'Global Resources', {
+        'Global Resources': SERVICE_COLUMNS,
+        'VPC Hierarchy': ['Region', 'VPC ID', 'VPC Name', 'Subnet ID', 'Subnet Name', 'Resource Type',
+                          'Resource ID', 'Details'],
+        'Regional Services': SERVICE_COLUMNS,
+    }, inventory_rows),
+    # IPs detalhados por ENI (aws_architec_audit.py)
+    'ips': Report('ips', "Relatorio_AWS_IPs_Detalhados.xlsx", 'Global', {
+        'Global': SERVICE_COLUMNS,
+        'VPC Network': ['Region', 'VPC Name', 'Subnet Name', 'Resource Type', 'Resource ID',
+                        'Private IP', 'Public IP', 'Details', 'VPC ID', 'Subnet ID'],
+        'Services': SERVICE_COLUMNS,
+    }, ip_rows),
+    # Auditoria de arquitetura (aws_architec_audit_v2.py)
+    'architecture': Report('architecture', "Relatorio_AWS_Arquitetura_v2.xlsx", 'Global Resources', {
+        'Global Resources': SERVICE_COLUMNS,
+        'VPC Network Architecture': ['Region', 'VPC ID', 'VPC Name', 'Subnet ID', 'CIDR Block',
+                                     'Availability Zone', 'Subnet Type', 'Route Table', 'Default Route'],
+        'EC2 Inventory': ['Region', 'VPC ID', 'Subnet ID', 'EC2 Instance ID', 'Instance Type', 'EBS Volumes'],
+        'EBS Volumes': list(VolumeRow.COLUMNS),
+        'Lambda Inventory': ['Region', 'VPC ID', 'Subnet ID', 'Lambda Function Name', 'Lambda Function ARN'],
+    }, architecture_rows),
+    # Banco SQLite indexado para consultas por IP/CIDR/tag (--db; query_inventory.py)
+    'database': Report('database', DEFAULT_DB_FILE, None, DB_TABLES, database_rows, sink=InventoryDbSink),
+    # Detalhes e exposição pública dos buckets S3 (scan.py s3 / --s3)
+    's3': Report('s3', "Relatorio_AWS_S3.xlsx", None, {
+        'S3 Buckets': list(S3BucketRow.COLUMNS),
+    }, None, global_project=s3_bucket_rows),
+    # Usuários, roles, grupos e policies do IAM em lote (scan.py iam / --iam)
+    'iam': Report('iam', "Relatorio_AWS_IAM.xlsx", None, {
+        'IAM Users': list(IamUserRow.COLUMNS),
+        'IAM Roles': list(IamRoleRow.COLUMNS),
+        'IAM Groups': list(IamGroupRow.COLUMNS),
+        'IAM Policies': list(IamPolicyRow.COLUMNS),
+    }, None, global_project=iam_rows),
+    # Grafo de roteamento (subnets, route tables e alvos) em JSON node-link ou DOT (--routing-graph)
+    'routing': Report('routing', "Grafo_Rotas_AWS.json", None, {
+        'Nodes': list(RouteNodeRow.COLUMNS),
+        'Edges': list(RouteEdgeRow.COLUMNS),
+    }, routing_rows, sink=RoutingGraphSink),
+}
@@ -0,0 +1,220 @@
+"""
+Grafo de roteamento de uma região (classificação de subnets e exportação).
+
+Montado uma vez por região a partir de três listagens em lote (DescribeRouteTables,
+DescribeNatGateways e DescribeTransitGatewayAttachments, todas via Dataset/cache):
+
+    subnet --association/main--> route table --route (destino)--> IGW | NAT | TGW | peering | VGW | ...
+    NAT --located-in--> subnet  (o NAT só sai para a internet se a subnet dele for pública)
+
+Cada route table é classificada uma única vez (memorizado); a subnet herda a
+classe da tabela associada ou, sem associação explícita, da tabela principal
+da VPC. O custo por subnet é constante, qualquer que seja o número de VPCs.
+
+Classes: Public (rota padrão ativa para um IGW), Private (NAT) (rota padrão para
+NAT gateway público em subnet pública, NAT instance, ENI ou egress-only IGW),
+Private (demais rotas: TGW/peering/VGW/endpoints, ou prefixos internos via
+IGW/NAT/ENI, sem internet) e Isolated (só a rota local). Rotas em blackhole
+(alvo apagado) não contam.
+
+O relatório 'routing' (--routing-graph) exporta nós e arestas como um arquivo
+de grafo: JSON node-link (networkx/d3) ou Graphviz DOT, pela extensão.
+"""
+import json
+import os
+
+from .records import RouteEdgeRow, RouteNodeRow
+from .sinks import BaseSink
+
+PUBLIC = 'Public'
+PRIVATE_NAT = 'Private (NAT)'
+PRIVATE = 'Private'
+ISOLATED = 'Isolated'
+UNKNOWN = 'Unknown'
+DEFAULT_DESTINATIONS = ('0.0.0.0/0', '::/0')
+# Alvos que dão saída para a internet quando (e só quando) recebem a rota padrão
+INTERNET_KINDS = ('igw', 'nat', 'nat-private', 'instance', 'eni', 'eigw')
+
+# Campo da rota -> tipo do alvo ('GatewayId' é resolvido pelo prefixo)
+TARGET_FIELDS = (('NatGatewayId', 'nat'), ('TransitGatewayId', 'tgw'), ('VpcPeeringConnectionId', 'pcx'),
+                 ('EgressOnlyInternetGatewayId', 'eigw'), ('InstanceId', 'instance'), ('NetworkInterfaceId', 'eni'),
+                 ('CarrierGatewayId', 'cagw'), ('LocalGatewayId', 'lgw'), ('CoreNetworkArn', 'core-network'))
+GATEWAY_PREFIXES = {'igw': 'igw', 'vgw': 'vgw', 'vpce': 'vpce'}
+
+
+def route_target(route):
+    """(ID do alvo, tipo) de uma rota; ('local', 'local') para a rota da própria VPC."""
+    for field, kind in TARGET_FIELDS:
+        if route.get(field):
+            return route[field], kind
+    gateway = route.get('GatewayId', '')
+    if gateway == 'local':
+        return 'local', 'local'
+    return gateway, GATEWAY_PREFIXES.get(gateway.split('-', 1)[0], 'gateway')
+
+
+def subnet_cidr(subnet):
+    """CIDR IPv4 da subnet ou, em subnets só IPv6, o primeiro bloco IPv6 associado."""
+    if subnet.get('CidrBlock'):
+        return subnet['CidrBlock']
+    for association in subnet.get('Ipv6CidrBlockAssociationSet', []):
+        if association.get('Ipv6CidrBlock'):
+            return association['Ipv6CidrBlock']
+    return '-'
+
+
+def route_destination(route):
+    return (route.get('DestinationCidrBlock') or route.get('DestinationIpv6CidrBlock')
+            or route.get('DestinationPrefixListId') or '-')
+
+
+class RoutingGraph:
+    """Tabelas de rotas, associações, NATs e attachments de TGW de uma região, indexados."""
+
+    def __init__(self, region, route_tables, nat_gateways=(), tgw_attachments=()):
+        self.region = region
+        self.tables = {t['RouteTableId']: t for t in route_tables}
+        self.nat_gateways = {n['NatGatewayId']: n for n in nat_gateways}
+        self.tgw_attachments = {(a.get('ResourceId'), a.get('TransitGatewayId')): a for a in tgw_attachments}
+        self.main = {}      # VPC -> route table principal
+        self.explicit = {}  # subnet -> route table associada
+        for table in route_tables:
+            for association in table.get('Associations', []):
+                if (association.get('AssociationState') or {}).get('State', 'associated') != 'associated':
+                    continue
+                if association.get('Main'):
+                    self.main[table['VpcId']] = table['RouteTableId']
+                elif association.get('SubnetId'):
+                    self.explicit[association['SubnetId']] = table['RouteTableId']
+        self._classes = {}
+
+    def route_table(self, subnet):
+        """(route table, implícita?) que roteia a subnet."""
+        table_id = self.explicit.get(subnet['SubnetId'])
+        if table_id:
+            return table_id, False
+        return self.main.get(subnet['VpcId']), True
+
+    def classify(self, subnet):
+        """(classe, route table, rota padrão) da subnet."""
+        table_id, implicit = self.route_table(subnet)
+        if table_id not in self.tables:
+            return UNKNOWN, '-', '-'
+        subnet_type, default_route = self._classify_table(table_id)
+        return subnet_type, f"{table_id} (main)" if implicit else table_id, default_route
+
+    def _classify_table(self, table_id):
+        if table_id not in self._classes:
+            self._classes[table_id] = self._compute_class(self.tables[table_id])
+        return self._classes[table_id]
+
+    def _compute_class(self, table):
+        kinds = set()
+        default_route = '-'
+        for route in table.get('Routes', []):
+            if route.get('State') == 'blackhole':
+                continue
+            target, kind = route_target(route)
+            if kind == 'local':
+                continue
+            if kind == 'nat':
+                kind = 'nat' if self._nat_has_internet(target) else 'nat-private'
+            if kind == 'tgw' and (table['VpcId'], target) in self.tgw_attachments:
+                target = f"{target} via {self.tgw_attachments[(table['VpcId'], target)]['TransitGatewayAttachmentId']}"
+            # Só a rota padrão leva à internet: um prefixo interno via IGW/NAT/ENI
+            # (ex.: 10.0.0.0/8 -> appliance de firewall) é uma rota privada comum
+            if route_destination(route) in DEFAULT_DESTINATIONS:
+                if default_route == '-':
+                    default_route = target
+            elif kind in INTERNET_KINDS:
+                kind = 'internal'
+            kinds.add(kind)
+        if 'igw' in kinds:
+            return PUBLIC, default_route
+        if kinds & {'nat', 'instance', 'eni', 'eigw'}:
+            return PRIVATE_NAT, default_route
+        return (PRIVATE if kinds else ISOLATED), default_route
+
+    def _nat_has_internet(self, nat_id):
+        """NAT público, disponível e numa subnet pública (sem os dados do NAT, assume que sim)."""
+        nat = self.nat_gateways.get(nat_id)
+        if nat is None:
+            return True
+        if nat.get('ConnectivityType') == 'private' or nat.get('State') not in (None, 'available'):
+            return False
+        subnet_table = self.explicit.get(nat.get('SubnetId')) or self.main.get(nat.get('VpcId'))
+        return subnet_table in self.tables and any(
+            route_target(r)[1] == 'igw' and route_destination(r) in DEFAULT_DESTINATIONS
+            for r in self.tables[subnet_table].get('Routes', []) if r.get('State') != 'blackhole')
+
+    # --- EXPORTAÇÃO ---
+    def nodes(self, subnets):
+        nodes = {}
+        for subnet in subnets:
+            label = f"{subnet_cidr(subnet)} ({self.classify(subnet)[0]})"
+            nodes[subnet['SubnetId']] = ('subnet', subnet['VpcId'], label)
+        for table_id, table in self.tables.items():
+            nodes[table_id] = ('route-table', table['VpcId'], self._classify_table(table_id)[0])
+            for route in table.get('Routes', []):
+                target, kind = route_target(route)
+                if kind != 'local':
+                    nodes.setdefault(target, (kind, table['VpcId'], target))
+        return [RouteNodeRow(region=self.region, node_id=node_id, node_type=kind, vpc_id=vpc_id, label=label)
+                for node_id, (kind, vpc_id, label) in nodes.items()]
+
+    def edges(self, subnets):
+        edges = []
+        for subnet in subnets:
+            table_id, implicit = self.route_table(subnet)
+            if table_id:
+                edges.append(RouteEdgeRow(region=self.region, source=subnet['SubnetId'], target=table_id,
+                                          relation='main' if implicit else 'association', destination='-',
+                                          state='active'))
+        for table in self.tables.values():
+            for route in table.get('Routes', []):
+                target, kind = route_target(route)
+                if kind != 'local':
+                    edges.append(RouteEdgeRow(region=self.region, source=table['RouteTableId'], target=target,
+                                              relation='route', destination=route_destination(route),
+                                              state=route.get('State', 'active')))
+        for nat in self.nat_gateways.values():
+            if nat.get('SubnetId'):
+                edges.append(RouteEdgeRow(region=self.region, source=nat['NatGatewayId'], target=nat['SubnetId'],
+                                          relation='located-in', destination='-', state=nat.get('State', '-')))
+        return edges
+
+
+class RoutingGraphSink(BaseSink):
+    """
+    Junta as abas 'Nodes'/'Edges' e grava um arquivo de grafo ao fechar:
+    .dot = Graphviz; qualquer outra extensão = JSON node-link.
+    """
+
+    def __init__(self, path, layout):
+        super().__init__(path, layout)
+        self.rows = {'Nodes': [], 'Edges': []}
+
+    def _write_row(self, sheet, columns, values):
+        if sheet in self.rows:  # 'Scan Metrics' não entra no grafo
+            self.rows[sheet].append(dict(zip(columns, values)))
+
+    def close(self):
+        nodes, edges = self.rows['Nodes'], self.rows['Edges']
+        key = lambda row, column: f"{row['Region']}/{row[column]}"  # IDs só são únicos dentro da região
+        if os.path.splitext(self.path)[1].lower() == '.dot':
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write('digraph routing {\n  rankdir=LR;\n')
+                for n in nodes:
+                    shape = 'box' if n['Node Type'] == 'subnet' else 'ellipse'
+                    f.write(f'  "{key(n, "Node ID")}" [label="{n["Node ID"]}\\n{n["Label"]}", shape={shape}];\n')
+                for e in edges:
+                    label = e['Destination'] if e['Relation'] == 'route' else e['Relation']
+                    style = ', style=dashed' if e['State'] == 'blackhole' else ''
+                    f.write(f'  "{key(e, "Source")}" -> "{key(e, "Target")}" [label="{label}"{style}];\n')
+                f.write('}\n')
+            return
+        graph = {'directed': True, 'multigraph': True, 'graph': {},
+                 'nodes': [dict(n, id=key(n, 'Node ID')) for n in nodes],
+                 'links': [dict(e, source=key(e, 'Source'), target=key(e, 'Target')) for e in edges]}
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(graph, f, indent=1, ensure_ascii=False)
@@ -0,0 +1,277 @@
+"""
+Execução de um ou mais relatórios numa única passada pela conta.
+
+Fluxo: descobre as regiões, coleta os recursos globais, varre as regiões em
+paralelo (um Dataset por região, compartilhado por todos os relatórios pedidos)
+e escreve as linhas de cada relatório no seu sink, na ordem das regiões.
+
+Nada pesado é importado no topo dos módulos (boto3 só na criação da fábrica
+de clientes, openpyxl/pandas/pyarrow só nos sinks que os usam): --help,
+--list-regions e --dry-run respondem sem esse custo.
+"""
+from contextlib import ExitStack
+
+from botocore.exceptions import ClientError
+
+from .cache import get_cache
+from .collectors import COLLECTORS, GLOBAL, Dataset
+from .metrics import METRICS_COLUMNS, METRICS_SHEET
+from .incremental import apply_events
+from .indexes import set_page_sizes
+from .options import build_parser, parse_page_sizes, parse_scope, setup_cache
+from .reports import REPORTS, scan_global_resources
+from .scheduler import DEFAULT_MAX_WORKERS, print_failures, scan_regions
+from .scope import configure as configure_scope, get_scope
+from .session import get_factory
+from .sinks import open_sink, output_path
+
+
+# Modos do scan.py: relatórios gerados e banner
+MODES = {
+    'inventory': (['inventory'], "Iniciando Auditoria Multi-Region..."),
+    'ips': (['ips'], "Iniciando Scan v2.0 (Com IPs detalhados)..."),
+    'architecture': (['architecture'], "Iniciando Scan v2.1 (Architecture Audit)..."),
+    's3': (['s3'], "Iniciando Scan dos buckets S3 (exposição pública)..."),
+    'iam': (['iam'], "Iniciando Scan do IAM (usuários, roles, grupos e policies)..."),
+    'all': (['inventory', 'ips', 'architecture'], "Iniciando Scan completo (todos os relatórios)..."),
+}
+
+
+# Opções que acrescentam um relatório com saída própria: (atributo de args, relatório)
+EXTRA_REPORTS = (('db', 'database'), ('routing_graph', 'routing'), ('s3', 's3'), ('iam', 'iam'))
+
+
+def get_active_regions(dataset):
+    """Descobre todas as regiões ativas na conta AWS."""
+    print("--- [0/3] Descobrindo regiões ativas... ---")
+    try:
+        regions = [region['RegionName'] for region in dataset['ec2.regions']]
+        print(f"    -> Encontradas {len(regions)} regiões ativas.")
+        return regions
+    except ClientError as e:
+        print(f"    [!] Erro ao listar regiões ({e}). Usando fallback 'us-east-1'.")
+        return ['us-east-1'] # Fallback
+
+
+def scan_region(region, reports, empty_regions=None):
+    """Coleta a região uma vez e projeta todos os relatórios: {relatório: {aba: linhas}}."""
+    print(f"   -> Varrendo região: {region}...")
+    dataset = Dataset(region)
+    rows = {report.name: report.project(dataset) if report.project else {} for report in reports}
+    if dataset.skipped and empty_regions is not None:
+        empty_regions.append(region)  # Sem VPC: coletores de rede (e seus clientes) pulados
+    return rows
+
+
+def iter_account_rows(reports, workers):
+    """
+    Varre a conta das credenciais atuais e gera (relatório, aba, linhas):
+    primeiro os globais, depois cada região na ordem de descoberta e, por
+    último, a aba 'Scan Metrics'.
+    """
+    global_dataset = Dataset(GLOBAL)
+    if get_scope().active:
+        print(f"    Escopo: {get_scope().describe()}")
+    # Relatórios só de abas globais (ex.: 's3') não precisam das regiões
+    regions = get_active_regions(global_dataset) if any(report.project for report in reports) else []
+
+    # 1. Coleta Global (uma vez para todos os relatórios que têm a aba global)
+    if any(report.global_sheet for report in reports):
+        global_rows = scan_global_resources(global_dataset)
+        for report in reports:
+            if report.global_sheet:
+                yield report.name, report.global_sheet, global_rows
+    for report in reports:
+        if report.global_project:
+            for sheet, rows in report.global_project(global_dataset).items():
+                yield report.name, sheet, rows
+
+    # 2. Coleta Regional: cada região é liberada assim que termina
+    if regions:
+        print(f"\n--- [2/3] Varrendo Regiões ({workers} workers) ---")
+    failures = []  # Só as falhas: as linhas de cada região são descartadas depois de gravadas
+    empty_regions = []
+    for result in scan_regions(regions, lambda region: scan_region(region, reports, empty_regions), workers):
+        if result.error:
+            failures.append(result)
+            continue
+        for report in reports:
+            for sheet, rows in result.value[report.name].items():
+                yield report.name, sheet, rows
+    print_failures(failures)
+    if empty_regions:
+        print(f"    Regiões sem VPC: {len(empty_regions)} (coletores de rede pulados: {', '.join(empty_regions)})")
+    factory = get_factory()
+    print(f"    Clientes AWS: {factory.summary()}")
+    print(f"    Chamadas AWS: {factory.scheduler.summary()}")
+    print(f"    Mais lentas: {factory.metrics.summary()}")
+    print(f"    Cache local: {get_cache().summary()}")
+
+    # 3. Métricas da própria varredura (depois de todas as chamadas)
+    metric_rows = factory.metric_rows()
+    for report in reports:
+        yield report.name, METRICS_SHEET, metric_rows
+
+
+def report_layout(report):
+    """Abas do relatório mais a aba de métricas da varredura."""
+    return dict(report.sheets, **{METRICS_SHEET: METRICS_COLUMNS})
+
+
+def report_outputs(args, reports, output_files=None, prefix=""):
+    """
+    Caminho de saída de cada relatório. Com --db (banco SQLite indexado) ou
+    --routing-graph (grafo de roteamento), o relatório extra entra junto na
+    mesma varredura.
+    """
+    output_files = output_files or {}
+    # --output só faz sentido com um relatório; com vários, cada um usa o nome padrão
+    output = args.output if len(reports) == 1 else None
+    for option, name in EXTRA_REPORTS:
+        value = getattr(args, option)
+        if value and REPORTS[name] not in reports:
+            reports = reports + [REPORTS[name]]
+            if value is not True:
+                output_files = dict(output_files, **{name: value})
+    outputs = []
+    for r in reports:
+        default = output_files.get(r.name, prefix + r.output_file)
+        if r.sink:  # Saída própria (ex.: banco SQLite): não depende de --format
+            outputs.append(output if len(reports) == 1 and output else default)
+        else:
+            outputs.append(output_path(default, args.format, output))
+    return reports, outputs
+
+
+def open_report_sink(report, fmt, path, layout):
+    return report.sink(path, layout) if report.sink else open_sink(fmt, path, layout)
+
+
+def select_reports(parser, names):
+    """Adiciona --reports quando o script gera mais de um relatório e devolve os escolhidos."""
+    if len(names) > 1:
+        parser.add_argument('--reports', default=','.join(names),
+                            help=f"relatórios a gerar, separados por vírgula (padrão: {','.join(names)})")
+    args = parser.parse_args()
+    return args, check_args(parser, args, names)
+
+
+def check_args(parser, args, names):
+    """Valida as opções já lidas (encerra com parser.error) e devolve os relatórios escolhidos."""
+    args.page_size = parse_page_sizes(parser, args.page_size)
+    args.scope = parse_scope(args)
+    unknown = [s for s in args.scope['services'] if s not in {c.service for c in COLLECTORS.values()}]
+    if unknown:
+        parser.error(f"serviço(s) desconhecido(s): {', '.join(unknown)} "
+                     f"(opções: {', '.join(sorted({c.service for c in COLLECTORS.values()}))})")
+    if args.resume and args.no_cache:
+        parser.error("--resume usa os checkpoints do cache local; não combina com --no-cache")
+    if args.events:
+        if args.no_cache or args.refresh:
+            parser.error("--events atualiza o snapshot do cache local; não combina com --no-cache/--refresh")
+        args.resume = True  # O relatório sai do snapshot, mesmo fora do TTL
+    if getattr(args, 'reports', None):
+        names = [n.strip() for n in args.reports.split(',') if n.strip()]
+        unknown = [n for n in names if n not in REPORTS]
+        if unknown:
+            parser.error(f"relatório(s) desconhecido(s): {', '.join(unknown)} (opções: {', '.join(REPORTS)})")
+    return [REPORTS[n] for n in names]
+
+
+def list_regions():
+    """--list-regions: uma única chamada (DescribeRegions), sem cache nem relatórios."""
+    try:
+        regions = Dataset(GLOBAL)['ec2.regions']
+    except ClientError as e:
+        print(f"[ERRO] Não foi possível listar as regiões: {e}")
+        return
+    for region in regions:
+        print(f"    {region['RegionName']:<16} {region.get('OptInStatus', '')}")
+    print(f"    -> {len(regions)} regiões ativas")
+
+
+def print_plan(args, reports, outputs):
+    """--dry-run: o que seria varrido e gerado, sem nenhuma chamada à AWS."""
+    scope = get_scope()
+    print(f"    Escopo: {scope.describe()}")
+    print(f"    Serviços: {', '.join(sorted({c.service for c in COLLECTORS.values() if scope.allows(c.service)}))}")
+    if args.no_cache:
+        print("    Cache local: desativado")
+    else:
+        mode = "--refresh" if args.refresh else "--resume" if args.resume else "TTL por serviço"
+        print(f"    Cache local: {args.cache_dir} ({mode})")
+    if args.page_size:
+        print(f"    Páginas: {', '.join(f'{k}={v}' for k, v in args.page_size.items())}")
+    print(f"    Workers: {args.workers}")
+    if args.events:
+        print(f"    Eventos: {args.events} (atualização incremental do snapshot)")
+    for report, path in zip(reports, outputs):
+        print(f"    {report.name} -> {path} (abas: {', '.join(report_layout(report))})")
+    print("    [--dry-run] Nenhuma chamada à AWS foi feita.")
+
+
+def quick_mode(args, reports, outputs):
+    """Trata --list-regions/--dry-run (sem varrer a conta nem tocar no cache). True se tratou."""
+    if not (args.list_regions or args.dry_run):
+        return False
+    configure_scope(**args.scope)
+    if args.list_regions:
+        list_regions()
+    if args.dry_run:
+        print_plan(args, reports, outputs)
+    return True
+
+
+def run_reports(names, description, banner, output_files=None):
+    """
+    Ponto de entrada dos scripts. `names` são chaves de REPORTS; `output_files`
+    permite trocar o arquivo padrão de cada relatório ({nome: arquivo}).
+    """
+    parser = build_parser(description, DEFAULT_MAX_WORKERS)
+    args, reports = select_reports(parser, names)
+    execute(args, reports, banner, output_files)
+
+
+def run_cli(description):
+    """Ponto de entrada único (scan.py): o modo escolhe os relatórios e o banner."""
+    parser = build_parser(description, DEFAULT_MAX_WORKERS)
+    parser.add_argument('mode', choices=MODES, help="o que gerar: " + "; ".join(
+        f"{mode} = {', '.join(names)}" for mode, (names, _) in MODES.items()))
+    args = parser.parse_args()
+    names, banner = MODES[args.mode]
+    execute(args, check_args(parser, args, names), banner)
+
+
+def execute(args, reports, banner, output_files=None):
+    """Varre a conta e grava os relatórios (ou só responde --list-regions/--dry-run)."""
+    reports, outputs = report_outputs(args, reports, output_files)
+    print(banner)
+    if quick_mode(args, reports, outputs):
+        return
+    setup_cache(args)
+    set_page_sizes(args.page_size)
+    if args.events:
+        print("--- Atualização incremental (eventos do CloudTrail) ---")
+        apply_events(args.events)
+
+    try:
+        with ExitStack() as stack:
+            sinks = {report.name: stack.enter_context(open_report_sink(report, args.format, path,
+                                                                         report_layout(report)))
+                     for report, path in zip(reports, outputs)}
+            # As linhas vão direto para os arquivos de saída, região por região
+            for name, sheet, rows in iter_account_rows(reports, args.workers):
+                sinks[name].write(sheet, rows)
+
+            # 3. Consolidação
+            print(f"\n--- [3/3] Finalizando {args.format} ---")
+
+        print(f"    Escrita: {sum(s.write_seconds for s in sinks.values()):.2f}s")
+        get_cache().finish()
+        if args.metrics_json:
+            get_factory().metrics.dump(args.metrics_json, get_factory().scheduler)
+            print(f"    Métricas de API salvas em: {args.metrics_json}")
+        for path in outputs:
+            print(f"SUCESSO! Relatório salvo em: {path}")
+    except PermissionError:
+        print(f"[ERRO] Não foi possível salvar o arquivo. Feche o Excel ({', '.join(outputs)}) e tente novamente.")
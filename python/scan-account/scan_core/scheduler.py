@@ -0,0 +1,64 @@
+"""Agendador concorrente de varredura por região."""
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_WORKERS = 8
+
+# Resultado de uma região: `value` é o retorno da função de varredura e
+# `error` a exceção capturada (None quando a região terminou com sucesso).
+RegionResult = namedtuple('RegionResult', ['region', 'value', 'error', 'elapsed'])
+
+_print_lock = threading.Lock()
+
+
+def _run_one(scan_fn, region):
+    start = time.perf_counter()
+    try:
+        return RegionResult(region, scan_fn(region), None, time.perf_counter() - start)
+    except Exception as e:  # Isola a falha: uma região não derruba as demais
+        return RegionResult(region, None, e, time.perf_counter() - start)
+
+
+def scan_regions(regions, scan_fn, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Executa scan_fn(region) em paralelo num pool de threads.
+
+    Gera os RegionResult na mesma ordem de `regions` (merge determinístico),
+    liberando cada região assim que ela e todas as anteriores terminarem.
+    """
+    regions = list(regions)
+    total = len(regions)
+    if not total:
+        return
+    workers = max(1, min(max_workers or 1, total))
+    progress = {'done': 0}
+
+    def report(future):
+        # Progresso na ordem de conclusão (o merge continua ordenado)
+        result = future.result()
+        with _print_lock:
+            progress['done'] += 1
+            status = f"ERRO: {result.error}" if result.error else "ok"
+            print(f"      [{progress['done']}/{total}] {result.region} {status} ({result.elapsed:.1f}s)")
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scan') as pool:
+        futures = deque()
+        for region in regions:
+            future = pool.submit(_run_one, scan_fn, region)
+            future.add_done_callback(report)
+            futures.append(future)
+        while futures:
+            # A região entregue sai da fila: suas linhas não ficam na memória até o fim
+            yield futures.popleft().result()
+
+
+def print_failures(results):
+    """Resumo das regiões que falharam (não interrompe o relatório)."""
+    failed = [r for r in results if r.error]
+    if failed:
+        print(f"\n    [!] {len(failed)} região(ões) com falha:")
+        for r in failed:
+            print(f"        - {r.region}: {r.error}")
+    return failed
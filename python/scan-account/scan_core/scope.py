@@ -0,0 +1,100 @@
+"""
+Escopo da varredura: regiões, VPCs, tags e serviços.
+
+Os filtros vão para a própria API sempre que ela aceita (`Filters` do EC2:
+region-name, vpc-id, tag:<chave>), e senão são aplicados logo no coletor,
+antes de qualquer projeção. Com --tag, a varredura fica restrita às VPCs que
+têm a tag (e a tudo que está dentro delas), mais as funções Lambda fora de VPC
+que têm a tag. Com --vpc-id, funções fora de VPC não entram. Um escopo vazio (sem VPCs na
+região) não faz nenhuma chamada além do DescribeVpcs filtrado.
+"""
+import hashlib
+import threading
+
+# Máximo de valores por filtro nas APIs Describe* do EC2
+MAX_FILTER_VALUES = 200
+
+
+class Scope:
+    def __init__(self, regions=None, vpc_ids=None, tags=None, services=None):
+        self.regions = list(regions or [])
+        self.vpc_ids = list(vpc_ids or [])
+        self.tags = dict(tags or {})  # chave -> valor (None = só a chave)
+        self.services = set(services or [])
+        self._vpcs = {}
+        self._lock = threading.RLock()
+
+    @property
+    def network_scoped(self):
+        """True quando a varredura está restrita a algumas VPCs."""
+        return bool(self.vpc_ids or self.tags)
+
+    @property
+    def active(self):
+        return bool(self.regions or self.network_scoped or self.services)
+
+    def allows(self, service):
+        return not self.services or service in self.services
+
+    def region_filters(self):
+        return [{'Name': 'region-name', 'Values': self.regions}] if self.regions else []
+
+    def vpc_filters(self):
+        filters = [{'Name': 'vpc-id', 'Values': self.vpc_ids}] if self.vpc_ids else []
+        for key, value in self.tags.items():
+            if value is None:
+                filters.append({'Name': 'tag-key', 'Values': [key]})
+            else:
+                filters.append({'Name': f"tag:{key}", 'Values': [value]})
+        return filters
+
+    def tag_filters(self):
+        """TagFilters da Resource Groups Tagging API com as tags do escopo."""
+        return [{'Key': key} if value is None else {'Key': key, 'Values': [value]}
+                for key, value in self.tags.items()]
+
+    def vpcs(self, region, loader):
+        """
+        VPCs da região dentro do escopo. Com escopo de rede o resultado fica
+        memorizado: os demais coletores da região filtram por esses VPC IDs.
+        """
+        if not self.network_scoped:
+            return loader()
+        with self._lock:
+            if region not in self._vpcs:
+                self._vpcs[region] = list(loader())
+            return self._vpcs[region]
+
+    def cache_key(self):
+        """Sufixo do diretório de cache: varreduras com escopos diferentes não se misturam."""
+        if not self.active:
+            return None
+        text = repr((sorted(self.regions), sorted(self.vpc_ids), sorted(self.tags.items(), key=str),
+                     sorted(self.services)))
+        return "scope-" + hashlib.sha1(text.encode()).hexdigest()[:10]
+
+    def describe(self):
+        parts = []
+        if self.regions: parts.append(f"regiões={','.join(self.regions)}")
+        if self.vpc_ids: parts.append(f"VPCs={','.join(self.vpc_ids)} (Lambdas fora de VPC ficam de fora)")
+        if self.tags: parts.append("tags=" + ','.join(k if v is None else f"{k}={v}" for k, v in self.tags.items()))
+        if self.services: parts.append(f"serviços={','.join(sorted(self.services))}")
+        return "; ".join(parts) or "conta inteira"
+
+
+def chunks(values, size=MAX_FILTER_VALUES):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+_scope = Scope()
+
+
+def configure(**kwargs):
+    global _scope
+    _scope = Scope(**kwargs)
+    return _scope
+
+
+def get_scope():
+    return _scope
@@ -0,0 +1,92 @@
+"""
+Sessão boto3 compartilhada e cache de clientes por (serviço, região).
+
+O boto3 só é importado quando a primeira fábrica é criada: --help, --dry-run
+e afins não pagam o custo da importação.
+"""
+import threading
+import time
+
+from .metrics import ApiMetrics
+from .throttle import ApiScheduler
+
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+DEFAULT_TCP_KEEPALIVE = True
+
+
+class ClientFactory:
+    """
+    Cria cada cliente boto3 uma única vez por (serviço, região) sobre uma mesma
+    boto3.Session. Clientes são thread-safe depois de criados; a criação em si
+    (carga do service model) não é, por isso fica protegida por lock.
+
+    Todo cliente é registrado no ApiScheduler (taxa, concorrência e retries);
+    o retry nativo do botocore fica desligado para não repetir em dobro. O
+    ApiMetrics mede latência/bytes de cada tentativa (aba 'Scan Metrics').
+    """
+
+    def __init__(self, session=None, max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS,
+                 tcp_keepalive=DEFAULT_TCP_KEEPALIVE, scheduler=None, metrics=None):
+        import boto3
+        from botocore.config import Config
+        self.session = session or boto3.Session()
+        self.scheduler = scheduler or ApiScheduler()
+        self.metrics = metrics or ApiMetrics()
+        self.config = Config(max_pool_connections=max_pool_connections, tcp_keepalive=tcp_keepalive,
+                             retries={'mode': 'standard', 'total_max_attempts': 1})
+        self._clients = {}
+        self._lock = threading.Lock()
+        self.stats = {'clients_created': 0, 'cache_hits': 0, 'build_seconds': 0.0}
+
+    def client(self, service, region=None):
+        key = (service, region)
+        client = self._clients.get(key)
+        with self._lock:
+            # Contadores só mudam sob o lock: as threads das regiões chamam isto ao mesmo tempo
+            if client is None:
+                client = self._clients.get(key)
+            if client is not None:
+                self.stats['cache_hits'] += 1
+            else:
+                start = time.perf_counter()
+                client = self.session.client(service, region_name=region, config=self.config)
+                self.scheduler.attach(client)
+                self.metrics.attach(client)
+                self.stats['build_seconds'] += time.perf_counter() - start
+                self.stats['clients_created'] += 1
+                self._clients[key] = client
+        return client
+
+    def metric_rows(self):
+        return self.metrics.rows(self.scheduler)
+
+    def summary(self):
+        s = self.stats
+        return (f"{s['clients_created']} clientes criados ({s['build_seconds']:.2f}s), "
+                f"{s['cache_hits']} reutilizados")
+
+
+_factory = None
+_factory_lock = threading.Lock()
+
+
+def configure(**kwargs):
+    """Substitui a fábrica padrão (ex.: configure(max_pool_connections=100))."""
+    global _factory
+    with _factory_lock:
+        _factory = ClientFactory(**kwargs)
+    return _factory
+
+
+def get_factory():
+    global _factory
+    if _factory is None:
+        with _factory_lock:
+            if _factory is None:
+                _factory = ClientFactory()
+    return _factory
+
+
+def get_client(service, region=None):
+    """Atalho para o cliente em cache da fábrica padrão."""
+    return get_factory().client(service, region)
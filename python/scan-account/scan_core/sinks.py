@@ -0,0 +1,237 @@
+"""
+Saídas em streaming dos relatórios (memória constante).
+
+Os scripts declaram o layout (aba -> colunas) e vão escrevendo as linhas à
+medida que cada região termina; nada é acumulado até o fim da varredura.
+
+- xlsx:    openpyxl em modo write-only (as linhas vão para arquivos temporários)
+- csv:     um arquivo por aba dentro do diretório de saída
+- jsonl:   um arquivo por aba, uma linha JSON por registro
+- parquet: um arquivo por aba, gravado em lotes (requer pyarrow)
+- sqlite:  um banco com uma tabela por aba (nomes em snake_case), índices no fim
+"""
+import csv
+import json
+import os
+import re
+import sqlite3
+import time
+
+FORMATS = ('xlsx', 'csv', 'jsonl', 'parquet', 'sqlite')
+PARQUET_BATCH = 5000
+SQLITE_BATCH = 5000
+
+
+def _file_name(sheet, ext):
+    return re.sub(r'[^\w.-]+', '_', sheet).strip('_') + ext
+
+
+def sql_name(name):
+    """'VPC ID' -> 'vpc_id' (nome de tabela/coluna no SQLite)."""
+    return re.sub(r'\W+', '_', name).strip('_').lower()
+
+
+class BaseSink:
+    """Interface comum: write(aba, linhas) e close(). Abas vazias não são criadas."""
+
+    def __init__(self, path, layout):
+        self.path = path
+        self.layout = layout  # {aba: [colunas]} na ordem em que as abas devem aparecer
+        self.rows_written = {}
+        self.write_seconds = 0.0  # tempo gasto serializando/gravando (inclui o save final)
+
+    def write(self, sheet, rows):
+        start = time.perf_counter()
+        columns = self.layout[sheet]
+        count = 0
+        # Linhas em colunas (FrameRows): valores já na ordem do layout, sem .get por célula
+        iter_values = getattr(rows, 'iter_values', None)
+        values = iter_values(columns) if iter_values else ([row.get(c) for c in columns] for row in rows)
+        for row_values in values:
+            self._write_row(sheet, columns, row_values)
+            count += 1
+        if count:
+            self.rows_written[sheet] = self.rows_written.get(sheet, 0) + count
+        self.write_seconds += time.perf_counter() - start
+
+    def _write_row(self, sheet, columns, values):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        start = time.perf_counter()
+        self.close()
+        self.write_seconds += time.perf_counter() - start
+        return False
+
+
+class XlsxSink(BaseSink):
+    def __init__(self, path, layout):
+        super().__init__(path, layout)
+        from openpyxl import Workbook
+        self.workbook = Workbook(write_only=True)
+        self.sheets = {}
+
+    def _sheet(self, sheet, columns):
+        ws = self.sheets.get(sheet)
+        if ws is None:
+            ws = self.sheets[sheet] = self.workbook.create_sheet(sheet)
+            ws.append(columns)
+        return ws
+
+    def _write_row(self, sheet, columns, values):
+        self._sheet(sheet, columns).append(values)
+
+    def close(self):
+        if not self.sheets:
+            # O Excel exige ao menos uma aba: grava só o cabeçalho da primeira
+            first = next(iter(self.layout))
+            self._sheet(first, self.layout[first])
+        # Mantém a ordem do layout, independente de qual aba recebeu dados primeiro
+        order = [s for s in self.layout if s in self.sheets]
+        for position, sheet in enumerate(order):
+            ws = self.sheets[sheet]
+            self.workbook.move_sheet(sheet, position - self.workbook.worksheets.index(ws))
+        self.workbook.save(self.path)
+
+
+class CsvSink(BaseSink):
+    def __init__(self, path, layout):
+        super().__init__(path, layout)
+        os.makedirs(path, exist_ok=True)
+        self.files = {}
+
+    def _write_row(self, sheet, columns, values):
+        if sheet not in self.files:
+            f = open(os.path.join(self.path, _file_name(sheet, '.csv')), 'w', newline='', encoding='utf-8')
+            self.files[sheet] = (f, csv.writer(f))
+            self.files[sheet][1].writerow(columns)
+        self.files[sheet][1].writerow(values)
+
+    def close(self):
+        for f, _ in self.files.values():
+            f.close()
+
+
+class JsonlSink(BaseSink):
+    def __init__(self, path, layout):
+        super().__init__(path, layout)
+        os.makedirs(path, exist_ok=True)
+        self.files = {}
+
+    def _write_row(self, sheet, columns, values):
+        f = self.files.get(sheet)
+        if f is None:
+            f = self.files[sheet] = open(os.path.join(self.path, _file_name(sheet, '.jsonl')), 'w', encoding='utf-8')
+        f.write(json.dumps(dict(zip(columns, values)), default=str, ensure_ascii=False) + '\n')
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+
+class ParquetSink(BaseSink):
+    def __init__(self, path, layout):
+        super().__init__(path, layout)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("O formato parquet requer o pacote pyarrow (pip install pyarrow).")
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        os.makedirs(path, exist_ok=True)
+        self.writers = {}
+        self.buffers = {}
+
+    def _write_row(self, sheet, columns, values):
+        buffer = self.buffers.setdefault(sheet, [])
+        buffer.append(values)
+        if len(buffer) >= PARQUET_BATCH:
+            self._flush(sheet, columns)
+
+    def _flush(self, sheet, columns):
+        buffer = self.buffers.get(sheet)
+        if not buffer:
+            return
+        # Tudo como texto: as colunas misturam tipos entre linhas (ex.: '-' e datas)
+        schema = self.pa.schema([(c, self.pa.string()) for c in columns])
+        arrays = [self.pa.array([None if row[i] is None else str(row[i]) for row in buffer], self.pa.string())
+                  for i in range(len(columns))]
+        if sheet not in self.writers:
+            self.writers[sheet] = self.pq.ParquetWriter(os.path.join(self.path, _file_name(sheet, '.parquet')), schema)
+        self.writers[sheet].write_table(self.pa.Table.from_arrays(arrays, schema=schema))
+        buffer.clear()
+
+    def close(self):
+        for sheet in list(self.buffers):
+            self._flush(sheet, self.layout[sheet])
+        for writer in self.writers.values():
+            writer.close()
+
+
+class SqliteSink(BaseSink):
+    """
+    Uma tabela por aba, carregada numa única transação e em lotes (executemany).
+    Os índices de INDEXES ({tabela: [(colunas), ...]}) são criados só depois da
+    carga, que é bem mais rápido do que manter o índice linha a linha.
+    """
+    INDEXES = {}
+
+    def __init__(self, path, layout):
+        super().__init__(path, layout)
+        if os.path.exists(path):
+            os.remove(path)  # Cada varredura gera um banco novo
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode=OFF')
+        self.db.execute('PRAGMA synchronous=OFF')
+        self.inserts = {}
+        self.buffers = {}
+        # Todas as tabelas existem desde o início (consultas não quebram com tabela vazia)
+        for sheet, columns in layout.items():
+            names = ', '.join(f'"{sql_name(c)}"' for c in columns)
+            self.db.execute(f'CREATE TABLE "{sql_name(sheet)}" ({names})')
+            self.inserts[sheet] = f'INSERT INTO "{sql_name(sheet)}" VALUES ({", ".join("?" * len(columns))})'
+
+    def _write_row(self, sheet, columns, values):
+        buffer = self.buffers.setdefault(sheet, [])
+        buffer.append([v if v is None or isinstance(v, (str, int, float)) else str(v) for v in values])
+        if len(buffer) >= SQLITE_BATCH:
+            self._flush(sheet)
+
+    def _flush(self, sheet):
+        if self.buffers.get(sheet):
+            self.db.executemany(self.inserts[sheet], self.buffers[sheet])
+            self.buffers[sheet].clear()
+
+    def close(self):
+        for sheet in list(self.buffers):
+            self._flush(sheet)
+        for table, indexes in self.INDEXES.items():
+            for columns in indexes:
+                name = f"idx_{table}_{'_'.join(columns)}"
+                self.db.execute(f'CREATE INDEX "{name}" ON "{table}" ({", ".join(columns)})')
+        self.db.commit()
+        self.db.execute('ANALYZE')
+        self.db.close()
+
+
+SINKS = {'xlsx': XlsxSink, 'csv': CsvSink, 'jsonl': JsonlSink, 'parquet': ParquetSink, 'sqlite': SqliteSink}
+
+
+def output_path(default_file, fmt, output=None):
+    """Caminho de saída: o arquivo .xlsx padrão (ou .db), ou um diretório com o mesmo nome para os outros formatos."""
+    if output:
+        return output
+    if fmt == 'sqlite':
+        return os.path.splitext(default_file)[0] + '.db'
+    return default_file if fmt == 'xlsx' else os.path.splitext(default_file)[0]
+
+
+def open_sink(fmt, path, layout):
+    return SINKS[fmt](path, layout)
@@ -0,0 +1,164 @@
+"""
+Agendador de chamadas de API com orçamento de taxa por serviço/região.
+
+Cada cliente criado pela fábrica (scan_core.session) recebe hooks de eventos do
+botocore: antes de cada envio HTTP o pedido espera um token do balde
+(serviço, região) e uma vaga no limite global de concorrência; depois da
+resposta decidimos o retry (backoff exponencial com jitter) e ajustamos a taxa
+do balde (reduz em throttling, recupera aos poucos em sucesso). O retry nativo
+do botocore é desligado para que todas as tentativas passem por aqui e sejam
+contadas.
+"""
+import random
+import threading
+import time
+from collections import Counter
+
+# Requisições por segundo sustentadas por (serviço, região).
+DEFAULT_RATES = {
+    'ec2': 20.0,
+    'lambda': 10.0,
+    'iam': 5.0,
+    'route53': 4.0,
+    'cloudfront': 4.0,
+    's3': 50.0,
+}
+DEFAULT_RATE = 10.0
+DEFAULT_MAX_IN_FLIGHT = 32
+DEFAULT_MAX_ATTEMPTS = 8
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 20.0
+
+THROTTLE_CODES = {
+    'Throttling', 'ThrottlingException', 'ThrottledException', 'RequestThrottled',
+    'RequestThrottledException', 'TooManyRequestsException', 'RequestLimitExceeded',
+    'SlowDown', 'PriorRequestNotComplete', 'ProvisionedThroughputExceededException',
+    'BandwidthLimitExceeded', 'EC2ThrottledException',
+}
+TRANSIENT_CODES = {'RequestTimeout', 'RequestTimeoutException', 'InternalError', 'ServiceUnavailable'}
+
+
+def retryable_exception(exc):
+    """Falha de rede transitória (conexão, timeout de leitura, endpoint)? Só essas são repetidas."""
+    from botocore import exceptions
+    return isinstance(exc, (exceptions.ConnectionError, exceptions.ReadTimeoutError,
+                            exceptions.ConnectionClosedError)) and not isinstance(exc, exceptions.SSLError)
+
+
+class TokenBucket:
+    """Balde de tokens thread-safe com taxa adaptativa (AIMD)."""
+
+    def __init__(self, rate, burst=None):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self):
+        with self._lock:
+            self.rate = max(self.max_rate / 20, self.rate / 2)
+
+    def reward(self):
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 50)
+
+
+class ApiScheduler:
+    """Orçamentos de taxa, limite de concorrência e política de retry das chamadas AWS."""
+
+    def __init__(self, rates=None, default_rate=DEFAULT_RATE, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.rates = dict(DEFAULT_RATES, **(rates or {}))
+        self.default_rate = default_rate
+        self.max_attempts = max_attempts
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        # Contadores por (serviço, região, operação); `calls` conta chamadas lógicas
+        # (as tentativas extras ficam em `retries`)
+        self.calls = Counter()
+        self.retries = Counter()
+        self.throttles = Counter()
+        self.giveups = Counter()
+
+    def bucket(self, service, region):
+        key = (service, region)
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(self.rates.get(service, self.default_rate))
+            return self._buckets[key]
+
+    def _count(self, counter, key):
+        with self._stats_lock:
+            counter[key] += 1
+
+    def attach(self, client):
+        """Registra os hooks no cliente (chamado pela ClientFactory na criação)."""
+        service = client.meta.service_model.service_name
+        region = client.meta.region_name
+        bucket = self.bucket(service, region)
+
+        def before_send(**kwargs):
+            bucket.acquire()
+            self._slots.acquire()
+            self._local.holding = True
+
+        def needs_retry(response=None, operation=None, attempts=1, caught_exception=None, **kwargs):
+            if getattr(self._local, 'holding', False):
+                self._local.holding = False
+                self._slots.release()
+            key = (service, region, operation.name)
+            status = response[0].status_code if response is not None else None
+            code = response[1].get('Error', {}).get('Code') if response is not None else None
+
+            if caught_exception is not None:
+                if not retryable_exception(caught_exception):
+                    # Credenciais, parâmetros inválidos, SSL...: o botocore relança na hora
+                    self._count(self.calls, key)
+                    return None
+            elif code in THROTTLE_CODES or status == 429:
+                self._count(self.throttles, key)
+                bucket.penalize()
+            elif status < 500 and code not in TRANSIENT_CODES:
+                # Sucesso, ou erro definitivo (AccessDenied, NotFound...) que não adianta repetir
+                if code is None:
+                    bucket.reward()
+                self._count(self.calls, key)
+                return None
+
+            if attempts >= self.max_attempts:
+                self._count(self.calls, key)
+                self._count(self.giveups, key)
+                return None
+            self._count(self.retries, key)
+            # Backoff exponencial com "full jitter"
+            return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempts))
+
+        client.meta.events.register('before-send', before_send)
+        client.meta.events.register('needs-retry', needs_retry)
+        return client
+
+    def summary(self):
+        lines = [f"{sum(self.calls.values())} chamadas, {sum(self.retries.values())} retries, "
+                 f"{sum(self.throttles.values())} throttles, {sum(self.giveups.values())} desistências"]
+        for (service, region, op), n in sorted(self.giveups.items()):
+            lines.append(f"        [!] Dados incompletos: {service}.{op} em {region} "
+                         f"({n} chamada(s) esgotaram {self.max_attempts} tentativas)")
+        return "\n".join(lines)
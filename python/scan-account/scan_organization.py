@@ -0,0 +1,11 @@
+from scan_core.organization import run_organization
+
+# Varre todas as contas da organização (ou as listadas em --accounts-file),
+# assumindo --role-name em cada uma, com um processo por conta. Gera os mesmos
+# relatórios dos scripts de conta única, consolidados com a coluna 'Account'.
+
+# --- EXECUÇÃO ---
+if __name__ == "__main__":
+    run_organization(['inventory', 'ips', 'architecture'],
+                     "Varredura multi-conta (AWS Organizations + STS AssumeRole).",
+                     banner="Iniciando Scan multi-conta...")
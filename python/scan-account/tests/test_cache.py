@@ -0,0 +1,84 @@
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from scan_core.cache import InventoryCache
+
+
+def test_cached_datetimes_come_back_as_datetimes(tmp_path):
+    launched = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    items = [{'InstanceId': 'i-1', 'LaunchTime': launched, 'State': {'Name': 'running'}}]
+
+    fresh = InventoryCache(root=str(tmp_path)).fetch('us-east-1', 'ec2', 'instances', lambda: iter(items))
+    cached = InventoryCache(root=str(tmp_path)).fetch('us-east-1', 'ec2', 'instances', lambda: [])
+
+    assert cached == fresh == items
+    assert isinstance(cached[0]['LaunchTime'], datetime)
+
+
+class Loader:
+    """Conta as chamadas (cada uma seria uma ida à API)."""
+
+    def __init__(self, items, fail=False):
+        self.items = items
+        self.fail = fail
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("falha no meio da varredura")
+        return iter(self.items)
+
+
+def age(cache, region, service, name, seconds):
+    path = cache.path(region, service, name)
+    when = time.time() - seconds
+    os.utime(path, (when, when))
+
+
+def test_hit_within_ttl_and_miss_after_expiry(tmp_path):
+    loader = Loader([{'VpcId': 'vpc-1'}])
+    cache = InventoryCache(root=str(tmp_path), ttls={'ec2': 60})
+
+    assert cache.fetch('us-east-1', 'ec2', 'vpcs', loader) == [{'VpcId': 'vpc-1'}]
+    assert cache.fetch('us-east-1', 'ec2', 'vpcs', loader) == [{'VpcId': 'vpc-1'}]
+    assert (loader.calls, cache.stats['hits'], cache.stats['misses']) == (1, 1, 1)
+
+    age(cache, 'us-east-1', 'ec2', 'vpcs', 120)
+    cache.fetch('us-east-1', 'ec2', 'vpcs', loader)
+    assert (loader.calls, cache.stats['hits'], cache.stats['misses']) == (2, 1, 2)
+
+
+def test_refresh_ignores_a_valid_cache(tmp_path):
+    InventoryCache(root=str(tmp_path)).fetch('us-east-1', 'ec2', 'vpcs', Loader([{'VpcId': 'vpc-old'}]))
+    loader = Loader([{'VpcId': 'vpc-new'}])
+
+    data = InventoryCache(root=str(tmp_path), refresh=True).fetch('us-east-1', 'ec2', 'vpcs', loader)
+
+    assert (data, loader.calls) == ([{'VpcId': 'vpc-new'}], 1)
+
+
+def test_resume_fetches_only_units_missing_from_the_checkpoint(tmp_path):
+    first = InventoryCache(root=str(tmp_path), ttls={'ec2': 60})
+    first.fetch('us-east-1', 'ec2', 'vpcs', Loader([{'VpcId': 'vpc-1'}]))
+    with pytest.raises(RuntimeError):
+        first.fetch('us-east-1', 'ec2', 'subnets', Loader([], fail=True))
+    # Processo morto no meio de uma anotação: a linha cortada é ignorada
+    with open(first.checkpoint.path, 'a', encoding='utf-8') as f:
+        f.write('{"unit": "us-east-1/ec2.instan')
+    age(first, 'us-east-1', 'ec2', 'vpcs', 3600)  # Fora do TTL: só a retomada o aproveita
+
+    resumed = InventoryCache(root=str(tmp_path), ttls={'ec2': 60}, resume=True)
+    vpcs, subnets = Loader([{'VpcId': 'vpc-2'}]), Loader([{'SubnetId': 'subnet-1'}])
+
+    assert resumed.checkpoint.resumable == {'us-east-1/ec2.vpcs'}
+    assert not resumed.checkpoint.finished
+    assert resumed.fetch('us-east-1', 'ec2', 'vpcs', vpcs) == [{'VpcId': 'vpc-1'}]
+    assert resumed.fetch('us-east-1', 'ec2', 'subnets', subnets) == [{'SubnetId': 'subnet-1'}]
+    assert (vpcs.calls, subnets.calls, resumed.stats['resumed']) == (0, 1, 1)
+    resumed.finish()
+    assert InventoryCache(root=str(tmp_path), resume=True).checkpoint.resumable == {
+        'us-east-1/ec2.vpcs', 'us-east-1/ec2.subnets'}
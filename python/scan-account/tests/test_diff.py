@@ -0,0 +1,48 @@
+import pytest
+
+from scan_core import normalize
+from scan_core.diff import diff_reports
+from scan_core.reports import REPORTS, vpc_hierarchy_rows
+from scan_core.sinks import CsvSink
+
+
+class Dataset(dict):
+    region = 'us-east-1'
+
+
+class ListSink:
+    def __init__(self):
+        self.rows = {}
+
+    def write(self, sheet, rows):
+        self.rows.setdefault(sheet, []).extend(rows)
+
+
+def subnet(subnet_id, name):
+    return {'SubnetId': subnet_id, 'VpcId': 'vpc-1', 'Tags': [{'Key': 'Name', 'Value': name}]}
+
+
+def run(path, subnets):
+    dataset = Dataset({'ec2.vpcs': [{'VpcId': 'vpc-1'}, {'VpcId': 'vpc-2'}], 'ec2.subnets': subnets,
+                       'ec2.network_interfaces': []})
+    with CsvSink(path, REPORTS['inventory'].sheets) as sink:
+        sink.write('VPC Hierarchy', vpc_hierarchy_rows(dataset))
+    return path
+
+
+@pytest.mark.parametrize('vectorized', [False, True])
+def test_empty_subnets_are_matched_by_id(tmp_path, monkeypatch, vectorized):
+    if vectorized:
+        pytest.importorskip('pandas')
+    monkeypatch.setattr(normalize, 'VECTORIZE_MIN_ENIS', 0 if vectorized else float('inf'))
+    old = run(str(tmp_path / 'old'), [subnet('subnet-a', 'app-a'), subnet('subnet-b', 'app-b')])
+    # Mesmas subnets em outra ordem; só o nome da subnet-b muda
+    new = run(str(tmp_path / 'new'), [subnet('subnet-b', 'app-b2'), subnet('subnet-a', 'app-a')])
+
+    sink = ListSink()
+    summary = diff_reports(old, new, sink)
+
+    changes = [(row.get('Change'), row.get('Key'), row.get('Changed Columns')) for row in sink.rows['Changes']]
+    assert changes == [('Changed', 'Region=us-east-1 | VPC ID=vpc-1 | Subnet ID=subnet-b | '
+                                   'Resource Type=Empty Subnet | Resource ID=', 'Subnet Name')]
+    assert summary['VPC_Hierarchy'] == {'added': 0, 'removed': 0, 'changed': 1, 'unchanged': 2}
@@ -0,0 +1,86 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+moto = pytest.importorskip('moto')
+
+from scan_core import cache, incremental, scope, session  # noqa: E402
+from scan_core.collectors import Dataset  # noqa: E402
+
+REGION = 'us-east-1'
+
+
+@pytest.fixture
+def account(tmp_path, monkeypatch):
+    """Conta moto com uma subnet e uma ENI já no snapshot do cache."""
+    for name in ('AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_SESSION_TOKEN'):
+        monkeypatch.setenv(name, 'testing')
+    monkeypatch.setattr(session, '_factory', None)
+    monkeypatch.setattr(cache, '_cache', cache._cache)
+    monkeypatch.setattr(scope, '_scope', scope.Scope())
+    with moto.mock_aws():
+        ec2 = session.get_client('ec2', REGION)
+        vpc_id = ec2.create_vpc(CidrBlock='10.0.0.0/16')['Vpc']['VpcId']
+        subnet_id = ec2.create_subnet(VpcId=vpc_id, CidrBlock='10.0.1.0/24')['Subnet']['SubnetId']
+        old_eni = ec2.create_network_interface(SubnetId=subnet_id)['NetworkInterface']['NetworkInterfaceId']
+        cache.configure(root=str(tmp_path / 'cache'))
+        Dataset(REGION)['ec2.network_interfaces']  # Snapshot
+        yield ec2, subnet_id, old_eni
+
+
+def snapshot_enis():
+    items, _ = cache.get_cache().snapshot(REGION, 'ec2', 'network_interfaces')
+    return sorted(eni['NetworkInterfaceId'] for eni in items)
+
+
+def write_events(path, *records):
+    path.mkdir()
+    (path / 'trail.json').write_text(json.dumps({'Records': list(records)}))
+    return str(path)
+
+
+def event(name, when, **elements):
+    return {'eventSource': 'ec2.amazonaws.com', 'eventName': name, 'awsRegion': REGION,
+            'eventTime': when.strftime('%Y-%m-%dT%H:%M:%SZ'), 'requestParameters': {},
+            'responseElements': elements}
+
+
+def spy_describe(monkeypatch):
+    calls = []
+    describe = incremental._describe
+
+    def spy(region, key, filters):
+        calls.append((region, key, {name: set(ids) for name, ids in filters.items()}))
+        return describe(region, key, filters)
+    monkeypatch.setattr(incremental, '_describe', spy)
+    return calls
+
+
+def test_new_event_requeries_only_the_affected_resource(account, tmp_path, monkeypatch):
+    ec2, subnet_id, old_eni = account
+    new_eni = ec2.create_network_interface(SubnetId=subnet_id)['NetworkInterface']['NetworkInterfaceId']
+    ec2.create_network_interface(SubnetId=subnet_id)  # Sem evento: fica fora até a próxima varredura
+    source = write_events(tmp_path / 'events', event(
+        'CreateNetworkInterface', datetime.now(timezone.utc),
+        networkInterface={'networkInterfaceId': new_eni, 'subnetId': subnet_id}))
+    calls = spy_describe(monkeypatch)
+
+    stats = incremental.apply_events(source)
+
+    assert calls == [(REGION, 'ec2.network_interfaces', {'network-interface-id': {new_eni}})]
+    assert snapshot_enis() == sorted([old_eni, new_eni])
+    assert (stats['units'], stats['resources'], stats['full_units']) == (1, 1, 0)
+
+
+def test_events_already_in_the_snapshot_are_ignored(account, tmp_path, monkeypatch):
+    ec2, subnet_id, old_eni = account
+    source = write_events(tmp_path / 'events', event(
+        'DeleteNetworkInterface', datetime(2020, 1, 1, tzinfo=timezone.utc), networkInterfaceId=old_eni))
+    calls = spy_describe(monkeypatch)
+
+    stats = incremental.apply_events(source)
+
+    assert calls == []
+    assert snapshot_enis() == [old_eni]
+    assert (stats['events'], stats['already_applied'], stats.get('units', 0)) == (1, 1, 0)
@@ -0,0 +1,47 @@
+import pytest
+
+from scan_core.inventory_db import DB_TABLES, InventoryDbSink, cidr_range, connect, find_ips_in_cidr, find_subnets_containing
+from scan_core.records import SubnetRangeRow
+from scan_core.reports import database_rows
+
+
+def subnet(subnet_id, cidr):
+    start, end = cidr_range(cidr)
+    return SubnetRangeRow(account='1', region='us-east-1', vpc_id='vpc-1', subnet_id=subnet_id, subnet_name=subnet_id,
+                          cidr_block=cidr, range_start=start, range_end=end, availability_zone='us-east-1a')
+
+
+def test_subnets_containing_ip_most_specific_first(tmp_path):
+    path = str(tmp_path / 'inventory.db')
+    with InventoryDbSink(path, DB_TABLES) as sink:
+        sink.write('Subnets', [subnet('wide', '10.0.0.0/16'), subnet('narrow', '10.0.1.0/24'),
+                               subnet('other', '10.0.2.0/24'), subnet('edge', '10.0.1.255/32')])
+    db = connect(path)
+
+    assert [s['subnet_id'] for s in find_subnets_containing(db, '10.0.1.255')] == ['edge', 'narrow', 'wide']
+    assert [s['subnet_id'] for s in find_subnets_containing(db, '10.0.3.1')] == ['wide']
+    assert find_subnets_containing(db, '192.168.0.1') == []
+    with pytest.raises(ValueError):
+        find_ips_in_cidr(db, '2001:db8::/32')
+
+
+class Dataset(dict):
+    region = 'us-east-1'
+
+
+def test_ipv6_only_subnets_are_left_out_of_the_ranges():
+    dataset = Dataset({
+        'ec2.vpcs': [],
+        'ec2.subnets': [{'SubnetId': 'subnet-v4', 'VpcId': 'vpc-1', 'CidrBlock': '10.0.1.0/24',
+                         'AvailabilityZone': 'us-east-1a'},
+                        {'SubnetId': 'subnet-v6', 'VpcId': 'vpc-1', 'AvailabilityZone': 'us-east-1a',
+                         'Ipv6CidrBlockAssociationSet': [{'Ipv6CidrBlock': '2001:db8:1::/64'}],
+                         'Tags': [{'Key': 'Name', 'Value': 'v6'}]}],
+        'ec2.network_interfaces': [],
+        'ec2.instances': [],
+    })
+
+    rows = database_rows(dataset)
+
+    assert [row.subnet_id for row in rows['Subnets']] == ['subnet-v4']
+    assert [(row.resource_id, row.value) for row in rows['Tags']] == [('subnet-v6', 'v6')]
@@ -0,0 +1,36 @@
+from scan_core.routing import PRIVATE, PRIVATE_NAT, PUBLIC, RoutingGraph
+
+LOCAL = {'DestinationCidrBlock': '10.0.0.0/16', 'GatewayId': 'local', 'State': 'active'}
+
+
+def table(table_id, subnet_id, *routes):
+    return {'RouteTableId': table_id, 'VpcId': 'vpc-1', 'Routes': [LOCAL, *routes],
+            'Associations': [{'SubnetId': subnet_id, 'AssociationState': {'State': 'associated'}}]}
+
+
+def subnet(subnet_id):
+    return {'SubnetId': subnet_id, 'VpcId': 'vpc-1'}
+
+
+def test_internal_prefix_is_private_and_default_route_is_internet():
+    graph = RoutingGraph('us-east-1', [
+        table('rtb-appliance', 'subnet-a', {'DestinationCidrBlock': '10.0.0.0/8', 'NetworkInterfaceId': 'eni-1'}),
+        table('rtb-nat', 'subnet-b', {'DestinationCidrBlock': '0.0.0.0/0', 'NatGatewayId': 'nat-1'}),
+        table('rtb-igw-prefix', 'subnet-c', {'DestinationCidrBlock': '192.168.0.0/16', 'GatewayId': 'igw-1'}),
+        table('rtb-igw', 'subnet-d', {'DestinationCidrBlock': '0.0.0.0/0', 'GatewayId': 'igw-1'}),
+    ])
+
+    assert graph.classify(subnet('subnet-a')) == (PRIVATE, 'rtb-appliance', '-')
+    assert graph.classify(subnet('subnet-b')) == (PRIVATE_NAT, 'rtb-nat', 'nat-1')
+    assert graph.classify(subnet('subnet-c')) == (PRIVATE, 'rtb-igw-prefix', '-')
+    assert graph.classify(subnet('subnet-d')) == (PUBLIC, 'rtb-igw', 'igw-1')
+
+
+def test_ipv6_only_subnet_node_uses_ipv6_cidr():
+    graph = RoutingGraph('us-east-1', [table('rtb-v6', 'subnet-v6', {'DestinationIpv6CidrBlock': '::/0',
+                                                                      'EgressOnlyInternetGatewayId': 'eigw-1'})])
+    v6_only = {'SubnetId': 'subnet-v6', 'VpcId': 'vpc-1', 'Ipv6Native': True,
+               'Ipv6CidrBlockAssociationSet': [{'Ipv6CidrBlock': '2001:db8:1::/64'}]}
+
+    labels = {node.node_id: node.label for node in graph.nodes([v6_only])}
+    assert labels['subnet-v6'] == f"2001:db8:1::/64 ({PRIVATE_NAT})"
@@ -0,0 +1,12 @@
+from botocore.exceptions import (EndpointConnectionError, NoCredentialsError, ParamValidationError,
+                                 ReadTimeoutError, SSLError)
+
+from scan_core.throttle import retryable_exception
+
+
+def test_only_transient_network_errors_are_retried():
+    assert retryable_exception(EndpointConnectionError(endpoint_url='https://ec2.us-east-1.amazonaws.com'))
+    assert retryable_exception(ReadTimeoutError(endpoint_url='https://ec2.us-east-1.amazonaws.com'))
+    assert not retryable_exception(SSLError(endpoint_url='https://ec2.us-east-1.amazonaws.com', error='cert'))
+    assert not retryable_exception(NoCredentialsError())
+    assert not retryable_exception(ParamValidationError(report='VpcIds: tipo inválido'))